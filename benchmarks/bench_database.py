@@ -0,0 +1,416 @@
+"""Benchmarks for the database layer on synthetic databases.
+
+Usage::
+
+    PYTHONPATH=src python benchmarks/bench_database.py --scale small --output results.json
+    PYTHONPATH=src python benchmarks/bench_database.py --compare baseline.json
+
+Datasets are generated once per scale and kept in ``--data-dir`` so repeated
+runs (and runs against different versions of the code) measure the same
+files. Results are written as JSON; a summary goes to stderr.
+"""
+
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import shutil
+import sqlite3
+import sys
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from harness import (
+    DEFAULT_REGRESSION_THRESHOLD,
+    Measurement,
+    build_report,
+    compare_reports,
+    load_report,
+    measure,
+    print_summary,
+    write_report,
+)
+from sqliteviewer.database import DatabaseService, PreviewFilter, PreviewSort
+from sqliteviewer.export import export_query
+from sqliteviewer.search_index import SearchIndex
+from sqliteviewer.sql_lexer import first_keyword, strip_noise, tokenize, top_level_keywords
+
+
+DEFAULT_DATA_DIR = Path(tempfile.gettempdir()) / "sqliteview-bench"
+
+
+@dataclass(frozen=True)
+class Scale:
+    rows: int
+    wide_rows: int
+    wide_columns: int
+    blob_rows: int
+    blob_bytes: int
+    tables: int
+    repeat: int
+
+
+SCALES: Dict[str, Scale] = {
+    # Seconds; meant for CI and for checking that the suite still runs.
+    "smoke": Scale(
+        rows=10_000, wide_rows=1_000, wide_columns=50, blob_rows=50, blob_bytes=64 * 1024, tables=100, repeat=3
+    ),
+    "small": Scale(
+        rows=1_000_000, wide_rows=100_000, wide_columns=200, blob_rows=500, blob_bytes=1 << 20, tables=1_000, repeat=5
+    ),
+    "large": Scale(
+        rows=10_000_000, wide_rows=1_000_000, wide_columns=200, blob_rows=1_000, blob_bytes=1 << 20, tables=5_000, repeat=3
+    ),
+    "xlarge": Scale(
+        rows=50_000_000, wide_rows=5_000_000, wide_columns=200, blob_rows=2_000, blob_bytes=1 << 20, tables=10_000, repeat=3
+    ),
+}
+
+_SEQUENCE = "WITH RECURSIVE seq(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM seq WHERE i < {count}) "
+
+
+# -- dataset generation -------------------------------------------------------
+
+
+def _generate(path: Path, build: Callable[[sqlite3.Connection], None]) -> Path:
+    """Create ``path`` with ``build`` unless it already exists."""
+
+    if path.exists():
+        return path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_suffix(".partial")
+    partial.unlink(missing_ok=True)
+    print(f"generating {path.name}…", file=sys.stderr, flush=True)
+    connection = sqlite3.connect(partial, isolation_level=None)
+    try:
+        connection.execute("PRAGMA journal_mode = OFF")
+        connection.execute("PRAGMA synchronous = OFF")
+        connection.execute("BEGIN")
+        build(connection)
+        connection.execute("COMMIT")
+        connection.execute("ANALYZE")
+    finally:
+        connection.close()
+    partial.rename(path)
+    return path
+
+
+def rows_database(data_dir: Path, scale: Scale) -> Path:
+    """A narrow table of ``scale.rows`` rows, an index and a view over it."""
+
+    def build(connection: sqlite3.Connection) -> None:
+        connection.execute(
+            "CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT, category INTEGER, value REAL, created TEXT)"
+        )
+        connection.execute(
+            _SEQUENCE.format(count=scale.rows)
+            + "INSERT INTO items SELECT i, 'item-' || i, i % 100, (i * 7919 % 100000) / 100.0, "
+            "date('2020-01-01', '+' || (i % 1500) || ' days') FROM seq"
+        )
+        connection.execute("CREATE INDEX items_category ON items(category)")
+        connection.execute("CREATE VIEW items_view AS SELECT id, name, value FROM items")
+
+    return _generate(data_dir / f"rows-{scale.rows}.db", build)
+
+
+def wide_database(data_dir: Path, scale: Scale) -> Path:
+    """A table with ``scale.wide_columns`` mixed-type columns."""
+
+    columns = [f"c{index} {('INTEGER', 'TEXT', 'REAL')[index % 3]}" for index in range(scale.wide_columns)]
+    values = [
+        ("i + {n}", "'v' || (i + {n})", "(i + {n}) / 7.0")[index % 3].format(n=index)
+        for index in range(scale.wide_columns)
+    ]
+
+    def build(connection: sqlite3.Connection) -> None:
+        connection.execute(f"CREATE TABLE wide (id INTEGER PRIMARY KEY, {', '.join(columns)})")
+        connection.execute(
+            _SEQUENCE.format(count=scale.wide_rows) + f"INSERT INTO wide SELECT i, {', '.join(values)} FROM seq"
+        )
+
+    return _generate(data_dir / f"wide-{scale.wide_rows}x{scale.wide_columns}.db", build)
+
+
+def blob_database(data_dir: Path, scale: Scale) -> Path:
+    """Large BLOB and TEXT values, ``scale.blob_bytes`` each."""
+
+    def build(connection: sqlite3.Connection) -> None:
+        connection.execute("CREATE TABLE blobs (id INTEGER PRIMARY KEY, label TEXT, body TEXT, payload BLOB)")
+        connection.execute(
+            _SEQUENCE.format(count=scale.blob_rows)
+            + f"INSERT INTO blobs SELECT i, 'blob-' || i, printf('%.*c', {scale.blob_bytes}, 'x'), "
+            f"randomblob({scale.blob_bytes}) FROM seq"
+        )
+
+    return _generate(data_dir / f"blobs-{scale.blob_rows}x{scale.blob_bytes}.db", build)
+
+
+def tables_database(data_dir: Path, scale: Scale) -> Path:
+    """``scale.tables`` small tables, each with an index."""
+
+    def build(connection: sqlite3.Connection) -> None:
+        for index in range(scale.tables):
+            connection.execute(f"CREATE TABLE t{index:05d} (id INTEGER PRIMARY KEY, name TEXT, value REAL)")
+            connection.execute(f"CREATE INDEX t{index:05d}_name ON t{index:05d}(name)")
+
+    return _generate(data_dir / f"tables-{scale.tables}.db", build)
+
+
+# -- benchmark cases ----------------------------------------------------------
+
+
+def _open(path: Path) -> DatabaseService:
+    service = DatabaseService()
+    service.open(path)
+    return service
+
+
+def _noisy_script(statements: int) -> str:
+    statement = (
+        "-- fetch the expensive rows\n"
+        "SELECT id, name /* the label */, 'it''s -- not a comment' AS note\n"
+        "FROM items WHERE value > 10 AND name <> \"quoted; name\";\n"
+    )
+    return statement * statements
+
+
+def run_benchmarks(scale_name: str, data_dir: Path, repeat: Optional[int] = None, only: str = "*") -> List[Measurement]:
+    scale = SCALES[scale_name]
+    repeat = repeat or scale.repeat
+    results: List[Measurement] = []
+    selected = [pattern.strip() for pattern in only.split(",")]
+
+    def bench(name: str, dataset: str, run: Callable[[], Optional[int]], **kwargs) -> None:
+        if not any(fnmatch.fnmatch(name, pattern) for pattern in selected):
+            return
+        print(f"running {name}…", file=sys.stderr, flush=True)
+        kwargs.setdefault("repeat", repeat)
+        results.append(measure(name, dataset, run, **kwargs))
+
+    rows_path = rows_database(data_dir, scale)
+    service = _open(rows_path)
+    dataset = rows_path.name
+    try:
+        bench("preview.first_page", dataset, lambda: len(service.get_table_preview("items", exact_count=False).rows))
+        bench(
+            "preview.first_page_exact_count",
+            dataset,
+            lambda: len(service.get_table_preview("items").rows),
+            setup=service._row_counts.clear,
+        )
+        deep_key = (max(1, scale.rows - 1000),)
+        bench(
+            "preview.next_page_deep",
+            dataset,
+            lambda: len(service.get_table_preview("items", after=deep_key, exact_count=False).rows),
+        )
+        bench(
+            "preview.last_page",
+            dataset,
+            lambda: len(service.get_table_preview("items", last=True, exact_count=False).rows),
+        )
+        bench(
+            "preview.view_offset_middle",
+            dataset,
+            lambda: len(service.get_table_preview("items_view", offset=scale.rows // 2, exact_count=False).rows),
+        )
+        by_category, by_value = PreviewSort("category"), PreviewSort("value", descending=True)
+        bench(
+            "preview.sorted_indexed",
+            dataset,
+            lambda: len(service.get_table_preview("items", exact_count=False, sort=by_category).rows),
+        )
+        bench(
+            "preview.sorted_indexed_deep",
+            dataset,
+            lambda: len(
+                service.get_table_preview("items", after=(50, scale.rows // 2), exact_count=False, sort=by_category).rows
+            ),
+        )
+        bench(
+            "preview.sorted_unindexed",
+            dataset,
+            lambda: len(service.get_table_preview("items", exact_count=False, sort=by_value).rows),
+        )
+        bench("query.select_limited", dataset, lambda: len(service.execute_query("SELECT * FROM items").rows))
+        bench(
+            "query.select_spilled",
+            dataset,
+            lambda: len(service.execute_query("SELECT * FROM items", spill=True).rows),
+            repeat=3,
+            warmup=0,
+        )
+        bench(
+            "query.aggregate_scan",
+            dataset,
+            lambda: len(
+                service.execute_query("SELECT category, COUNT(*), AVG(value) FROM items GROUP BY category").rows
+            ),
+        )
+        bench(
+            "row_count.exact_cold",
+            dataset,
+            lambda: service._get_table_row_count("items"),
+            setup=service._row_counts.clear,
+        )
+        bench("row_count.estimate", dataset, lambda: service.estimate_row_count("items"))
+
+        export_dir = Path(tempfile.mkdtemp(prefix="sqliteview-bench-"))
+        export_repeat = 1 if scale.rows > 1_000_000 else min(repeat, 3)
+        for fmt in ("csv", "jsonl"):
+            target = export_dir / f"items.{fmt}"
+            bench(
+                f"export.{fmt}",
+                dataset,
+                lambda target=target, fmt=fmt: export_query(service, "SELECT * FROM items", target, fmt).rows_written,
+                repeat=export_repeat,
+                warmup=0,
+                setup=lambda target=target: target.unlink(missing_ok=True),
+            )
+            target.unlink(missing_ok=True)
+        export_dir.rmdir()
+
+        rare = PreviewFilter(f"item-{max(1, scale.rows - 7)}")
+        bench(
+            "preview.filter_like_rare",
+            dataset,
+            lambda: len(service.get_table_preview("items", exact_count=False, row_filter=rare).rows),
+        )
+        if SearchIndex.available():
+            index_dir = Path(tempfile.mkdtemp(prefix="sqliteview-bench-"))
+            service.search_index = SearchIndex(service, index_dir)
+            bench(
+                "search_index.build", dataset, lambda: service.search_index.build("items"), repeat=1, warmup=0, unit="rows"
+            )
+            bench(
+                "preview.filter_fts_rare",
+                dataset,
+                lambda: len(service.get_table_preview("items", exact_count=False, row_filter=rare).rows),
+            )
+            service.search_index = None
+            shutil.rmtree(index_dir, ignore_errors=True)
+
+        insert_script = "".join(f"INSERT INTO script_scratch VALUES ({n}, 'row {n}');\n" for n in range(1_000))
+        service.execute_query("CREATE TABLE IF NOT EXISTS script_scratch (id INTEGER, label TEXT)")
+        for mode, transaction in (("one_transaction", True), ("autocommit", False)):
+            bench(
+                f"script.insert_1000_{mode}",
+                dataset,
+                lambda transaction=transaction: len(
+                    service.execute_script(insert_script, transaction=transaction).statements
+                ),
+                repeat=min(repeat, 3),
+                unit="statements",
+                setup=lambda: service.execute_query("DELETE FROM script_scratch"),
+            )
+        service.execute_query("DROP TABLE script_scratch")
+
+        script = _noisy_script(10_000)
+        delete_script = "DELETE FROM items\n" + script
+
+        def clear_lexer_caches() -> None:
+            first_keyword.cache_clear()
+            top_level_keywords.cache_clear()
+
+        bench("sql.strip_noise", "synthetic", lambda: len(strip_noise(script)), unit="chars")
+        bench("sql.tokenize", "synthetic", lambda: sum(1 for _ in tokenize(script)), unit="tokens")
+        bench("sql.classify", "synthetic", lambda: service.classify_query(script) and None, setup=clear_lexer_caches)
+        bench(
+            "sql.is_destructive",
+            "synthetic",
+            lambda: service.is_destructive_query(delete_script) and None,
+            setup=clear_lexer_caches,
+        )
+    finally:
+        service.close()
+
+    wide_path = wide_database(data_dir, scale)
+    service = _open(wide_path)
+    try:
+        bench(
+            "preview.wide_first_page",
+            wide_path.name,
+            lambda: len(service.get_table_preview("wide", exact_count=False).rows),
+        )
+        bench("query.wide_select_limited", wide_path.name, lambda: len(service.execute_query("SELECT * FROM wide").rows))
+    finally:
+        service.close()
+
+    blob_path = blob_database(data_dir, scale)
+    service = _open(blob_path)
+    try:
+        bench(
+            "preview.blob_first_page",
+            blob_path.name,
+            lambda: len(service.get_table_preview("blobs", exact_count=False).rows),
+        )
+        bench(
+            "cell.read_blob",
+            blob_path.name,
+            lambda: len(service.read_value("blobs", "payload", (1,))),
+            unit="bytes",
+        )
+        bench("query.blob_select", blob_path.name, lambda: len(service.execute_query("SELECT * FROM blobs").rows))
+    finally:
+        service.close()
+
+    tables_path = tables_database(data_dir, scale)
+    service = _open(tables_path)
+    try:
+        bench(
+            "catalog.list_tables_cold",
+            tables_path.name,
+            lambda: len(service.list_tables()),
+            setup=service.catalog.invalidate,
+        )
+        bench("catalog.list_tables_warm", tables_path.name, lambda: len(service.list_tables()))
+        bench(
+            "catalog.table_schema_cold",
+            tables_path.name,
+            lambda: len(service.get_table_schema("t00000")),
+            setup=service.catalog.invalidate,
+        )
+    finally:
+        service.close()
+    return results
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Benchmark the SQLite View database layer")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small", help="Dataset size (default: small)")
+    parser.add_argument("--repeat", type=int, help="Timed repetitions per case (default depends on the scale)")
+    parser.add_argument("--only", default="*", help="Comma-separated glob patterns of case names to run")
+    parser.add_argument("--data-dir", type=Path, default=DEFAULT_DATA_DIR, help="Where generated databases are kept")
+    parser.add_argument("--output", type=Path, help="Write JSON results here instead of stdout")
+    parser.add_argument("--compare", type=Path, help="Baseline JSON results to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_REGRESSION_THRESHOLD,
+        help="Median latency increase that counts as a regression (default: 0.2 = 20%%)",
+    )
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    results = run_benchmarks(args.scale, args.data_dir, args.repeat, args.only)
+    report = build_report(
+        "database",
+        {"scale": args.scale, "repeat": args.repeat or SCALES[args.scale].repeat, "only": args.only},
+        results,
+    )
+    write_report(report, args.output)
+    print_summary(results)
+    if args.compare is not None:
+        regressions = compare_reports(load_report(args.compare), report, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s): {', '.join(regressions)}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
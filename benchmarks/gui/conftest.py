@@ -0,0 +1,91 @@
+"""pytest-qt fixtures for the offscreen GUI benchmarks.
+
+Run with ``python -m pytest benchmarks/gui`` (add ``--gui-scale smoke`` for a
+quick pass and ``--bench-output results.json`` to keep the numbers).
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import pytest  # noqa: E402
+from harness import Measurement, build_report, format_summary, write_report  # noqa: E402
+
+GUI_SCALES: Dict[str, Dict[str, object]] = {
+    "smoke": {"rows": (1_000,), "tables": 200, "script_bytes": 50_000, "frames": 20, "theme_toggles": 2},
+    "full": {
+        "rows": (10_000, 100_000),
+        "tables": 10_000,
+        "script_bytes": 5_000_000,
+        "frames": 200,
+        "theme_toggles": 10,
+    },
+}
+
+_RESULTS: List[Measurement] = []
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("gui benchmarks")
+    group.addoption("--gui-scale", choices=sorted(GUI_SCALES), default="full", help="Benchmark sizes")
+    group.addoption("--bench-output", type=Path, help="Write JSON results to this file")
+
+
+def pytest_generate_tests(metafunc: pytest.Metafunc) -> None:
+    if "row_count" in metafunc.fixturenames:
+        scale = GUI_SCALES[metafunc.config.getoption("--gui-scale")]
+        metafunc.parametrize("row_count", scale["rows"])
+
+
+@pytest.fixture(scope="session")
+def gui_scale(pytestconfig: pytest.Config) -> Dict[str, object]:
+    return GUI_SCALES[pytestconfig.getoption("--gui-scale")]
+
+
+@pytest.fixture(scope="session", autouse=True)
+def isolated_settings(tmp_path_factory: pytest.TempPathFactory) -> None:
+    """Keep settings, recent files and the performance log out of the user's real profile."""
+
+    from PyQt6.QtCore import QSettings, QStandardPaths
+
+    QStandardPaths.setTestModeEnabled(True)
+    path = str(tmp_path_factory.mktemp("settings"))
+    for fmt in (QSettings.Format.NativeFormat, QSettings.Format.IniFormat):
+        QSettings.setPath(fmt, QSettings.Scope.UserScope, path)
+
+
+@pytest.fixture
+def window(qtbot):
+    from sqliteviewer.mainwindow import MainWindow
+
+    main_window = MainWindow()
+    qtbot.addWidget(main_window)
+    main_window.show()
+    qtbot.waitExposed(main_window)
+    yield main_window
+    main_window.close()
+
+
+@pytest.fixture
+def record():
+    """Collect a ``Measurement`` for the session report."""
+
+    return _RESULTS.append
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus: int, config: pytest.Config) -> None:
+    if not _RESULTS:
+        return
+    terminalreporter.section("GUI benchmarks (frame times in ms)")
+    for line in format_summary(_RESULTS):
+        terminalreporter.write_line(line)
+    output = config.getoption("--bench-output")
+    if output is not None:
+        report = build_report("gui", {"scale": config.getoption("--gui-scale")}, _RESULTS)
+        write_report(report, output)
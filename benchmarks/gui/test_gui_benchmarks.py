@@ -0,0 +1,141 @@
+"""Offscreen GUI benchmarks: model population, scrolling, table listing, highlighting, theming.
+
+Each case records per-frame times, i.e. the time to apply one change and
+synchronously repaint the affected widget. 16.7 ms is one frame at 60 Hz.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import time
+from pathlib import Path
+from typing import Callable, List
+
+from PyQt6.QtWidgets import QApplication
+
+from harness import Measurement
+from sqliteviewer.database import QueryResult
+from sqliteviewer.theme import Theme
+
+FRAME_BUDGET_MS = 1000 / 60
+
+
+def _timed(action: Callable[[], None]) -> float:
+    started = time.perf_counter()
+    action()
+    return (time.perf_counter() - started) * 1000
+
+
+def _frames(
+    name: str, dataset: str, frame_ms: List[float], items: int | None = None, unit: str = "rows"
+) -> Measurement:
+    measurement = Measurement(name, dataset, frame_ms, items=items, unit=unit)
+    measurement.extra["frames"] = len(frame_ms)
+    measurement.extra["over_budget"] = sum(1 for value in frame_ms if value > FRAME_BUDGET_MS)
+    measurement.extra["max_ms"] = max(frame_ms)
+    return measurement
+
+
+def _synthetic_result(row_count: int) -> QueryResult:
+    rows = [
+        (index, f"name-{index}", index * 0.5, None if index % 7 == 0 else f"note {index}") for index in range(row_count)
+    ]
+    return QueryResult(columns=["id", "name", "value", "note"], rows=rows)
+
+
+def test_populate_and_scroll_table(window, qtbot, record, gui_scale, row_count) -> None:
+    result = _synthetic_result(row_count)
+    view = window.table_view
+
+    def populate() -> None:
+        window._populate_table(view, result)
+        view.viewport().repaint()
+
+    record(_frames("gui.populate_table", f"{row_count} rows", [_timed(populate) for _ in range(3)], row_count))
+
+    scrollbar = view.verticalScrollBar()
+    frame_ms = []
+    for _ in range(gui_scale["frames"]):
+        def step() -> None:
+            scrollbar.setValue(scrollbar.value() + scrollbar.pageStep())
+            view.viewport().repaint()
+
+        frame_ms.append(_timed(step))
+        if scrollbar.value() >= scrollbar.maximum() and not view.model().canFetchMore(view.rootIndex()):
+            scrollbar.setValue(0)
+    record(_frames("gui.scroll_table", f"{row_count} rows", frame_ms))
+
+
+def test_refresh_table_list(window, qtbot, record, gui_scale, tmp_path: Path) -> None:
+    table_count = gui_scale["tables"]
+    path = tmp_path / "tables.db"
+    connection = sqlite3.connect(path)
+    with connection:
+        for index in range(table_count):
+            connection.execute(f"CREATE TABLE t{index:05d} (id INTEGER PRIMARY KEY, name TEXT)")
+    connection.close()
+    window.open_database(str(path))
+    assert window.table_list.count() == table_count
+
+    def refresh() -> None:
+        window.database_service.catalog.invalidate()
+        window._refresh_tables()
+        window.table_list.viewport().repaint()
+
+    frame_ms = [_timed(refresh) for _ in range(3)]
+    record(_frames("gui.refresh_tables", f"{table_count} tables", frame_ms, table_count, "tables"))
+
+
+def test_highlight_large_script(window, qtbot, record, gui_scale) -> None:
+    statement = (
+        "-- monthly totals\n"
+        "SELECT category, COUNT(*) AS total, SUM(value) /* gross */ FROM items\n"
+        "WHERE created >= '2024-01-01' AND note IS NOT NULL GROUP BY category ORDER BY total DESC LIMIT 100;\n"
+    )
+    script = statement * max(1, gui_scale["script_bytes"] // len(statement))
+    window.right_tabs.setCurrentWidget(window.console_tab)
+    editor = window.query_editor
+    assert editor is not None
+
+    def load() -> None:
+        editor.setPlainText(script)
+        editor.viewport().repaint()
+
+    record(_frames("gui.highlight_load_script", f"{len(script)} chars", [_timed(load)], len(script), "chars"))
+
+    # Blocks beyond the per-pass budget are highlighted from the idle timer.
+    highlighter = window.highlighter
+    idle_ms = []
+    for _ in range(gui_scale["frames"]):
+        if not highlighter.has_pending:
+            break
+        idle_ms.append(_timed(QApplication.processEvents))
+    if idle_ms:
+        record(_frames("gui.highlight_idle_slice", f"{len(script)} chars", idle_ms))
+    record(
+        _frames("gui.highlight_remaining", f"{len(script)} chars", [_timed(highlighter.highlight_pending)])
+    )
+
+    cursor = editor.textCursor()
+    frame_ms = []
+    for _ in range(gui_scale["frames"]):
+        def keystroke() -> None:
+            cursor.insertText("x")
+            editor.viewport().repaint()
+
+        frame_ms.append(_timed(keystroke))
+    record(_frames("gui.highlight_keystroke", f"{len(script)} chars", frame_ms))
+
+
+def test_toggle_theme(window, qtbot, record, gui_scale) -> None:
+    window._populate_table(window.table_view, _synthetic_result(1_000))
+    frame_ms = []
+    for index in range(gui_scale["theme_toggles"] * 2):
+        theme = Theme.DARK if index % 2 == 0 else Theme.LIGHT
+
+        def toggle() -> None:
+            window._set_theme(theme)
+            window.repaint()
+
+        frame_ms.append(_timed(toggle))
+    record(_frames("gui.toggle_theme", "main window", frame_ms))
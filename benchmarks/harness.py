@@ -0,0 +1,199 @@
+"""Shared measurement, reporting and comparison helpers for the benchmark suites."""
+
+from __future__ import annotations
+
+import json
+import platform
+import sqlite3
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, TextIO
+
+RESULT_SCHEMA_VERSION = 1
+DEFAULT_REGRESSION_THRESHOLD = 0.20
+
+
+@dataclass(slots=True)
+class Measurement:
+    """Timings for one benchmark case.
+
+    ``latency_ms`` holds one entry per timed repetition. ``items`` is the
+    number of rows (or bytes, see ``unit``) processed per repetition and is
+    used to derive throughput. ``peak_memory_bytes`` is the peak of Python
+    allocations during one extra, separately traced run; memory allocated
+    inside SQLite itself is not included.
+    """
+
+    name: str
+    dataset: str
+    latency_ms: List[float]
+    items: Optional[int] = None
+    unit: str = "rows"
+    peak_memory_bytes: Optional[int] = None
+    extra: Dict[str, object] = field(default_factory=dict)
+
+    @property
+    def median_ms(self) -> float:
+        return statistics.median(self.latency_ms)
+
+    @property
+    def p95_ms(self) -> float:
+        ordered = sorted(self.latency_ms)
+        return ordered[min(len(ordered) - 1, round(0.95 * (len(ordered) - 1)))]
+
+    @property
+    def throughput(self) -> Optional[float]:
+        if not self.items or self.median_ms <= 0:
+            return None
+        return self.items / (self.median_ms / 1000)
+
+    def to_dict(self) -> Dict[str, object]:
+        data = asdict(self)
+        data.update(
+            min_ms=min(self.latency_ms),
+            median_ms=self.median_ms,
+            p95_ms=self.p95_ms,
+            mean_ms=statistics.fmean(self.latency_ms),
+            throughput_per_s=self.throughput,
+        )
+        return data
+
+
+def measure(
+    name: str,
+    dataset: str,
+    run: Callable[[], Optional[int]],
+    repeat: int,
+    setup: Optional[Callable[[], None]] = None,
+    warmup: int = 1,
+    unit: str = "rows",
+    trace_memory: bool = True,
+) -> Measurement:
+    """Time ``run`` ``repeat`` times (after ``warmup`` untimed calls).
+
+    ``setup`` runs before every call and is not timed. ``run`` may return the
+    number of items it processed.
+    """
+
+    def call() -> Optional[int]:
+        if setup is not None:
+            setup()
+        return run()
+
+    for _ in range(warmup):
+        call()
+
+    latencies: List[float] = []
+    items: Optional[int] = None
+    for _ in range(max(1, repeat)):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        items = run()
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    peak = None
+    if trace_memory:
+        if setup is not None:
+            setup()
+        tracemalloc.start()
+        try:
+            run()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return Measurement(name, dataset, latencies, items=items, unit=unit, peak_memory_bytes=peak)
+
+
+def environment() -> Dict[str, object]:
+    """Describe the machine and library versions the numbers were taken on."""
+
+    try:
+        from sqliteviewer import __version__ as app_version
+    except ImportError:  # pragma: no cover - running outside the source tree
+        app_version = None
+    return {
+        "sqliteview": app_version,
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+    }
+
+
+def build_report(suite: str, config: Dict[str, object], results: List[Measurement]) -> Dict[str, object]:
+    return {
+        "schema": RESULT_SCHEMA_VERSION,
+        "suite": suite,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "environment": environment(),
+        "config": config,
+        "results": [result.to_dict() for result in results],
+    }
+
+
+def write_report(report: Dict[str, object], output: Optional[Path]) -> None:
+    text = json.dumps(report, indent=2, sort_keys=True) + "\n"
+    if output is None:
+        sys.stdout.write(text)
+    else:
+        output.write_text(text, encoding="utf-8")
+
+
+def format_summary(results: List[Measurement]) -> List[str]:
+    labels = [f"{result.name} [{result.dataset}]" for result in results]
+    width = max((len(label) for label in labels), default=0)
+    lines = []
+    for label, result in zip(labels, results):
+        line = f"{label.ljust(width)}  median {result.median_ms:10.2f} ms  p95 {result.p95_ms:10.2f} ms"
+        if result.throughput is not None:
+            line += f"  {result.throughput:14,.0f} {result.unit}/s"
+        if result.peak_memory_bytes is not None:
+            line += f"  peak {result.peak_memory_bytes / 1048576:8.2f} MiB"
+        lines.append(line)
+    return lines
+
+
+def print_summary(results: List[Measurement], stream: TextIO = sys.stderr) -> None:
+    for line in format_summary(results):
+        print(line, file=stream)
+
+
+def compare_reports(
+    baseline: Dict[str, object],
+    current: Dict[str, object],
+    threshold: float = DEFAULT_REGRESSION_THRESHOLD,
+    stream: TextIO = sys.stderr,
+) -> List[str]:
+    """Print median latency changes against ``baseline`` and return regressed case names.
+
+    A case regresses when its median latency grew by more than ``threshold``
+    (a fraction, e.g. 0.2 for 20%).
+    """
+
+    previous = {(entry["name"], entry["dataset"]): entry for entry in baseline.get("results", [])}
+    regressions = []
+    for entry in current.get("results", []):
+        old = previous.get((entry["name"], entry["dataset"]))
+        if old is None or not old["median_ms"]:
+            continue
+        change = entry["median_ms"] / old["median_ms"] - 1
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions.append(entry["name"])
+        print(
+            f"{entry['name']}: {old['median_ms']:.2f} ms -> {entry['median_ms']:.2f} ms ({change:+.1%}){flag}",
+            file=stream,
+        )
+    return regressions
+
+
+def load_report(path: Path) -> Dict[str, object]:
+    return json.loads(path.read_text(encoding="utf-8"))
@@ -7,21 +7,37 @@ import sys
 from pathlib import Path
 
 from . import __version__
-from .app import run
+from .cli import COMMANDS, add_open_options, open_options_from_args
+from .cli import main as cli_main
+from .startup import StartupProfile
 
 
 def build_parser() -> argparse.ArgumentParser:
-    parser = argparse.ArgumentParser(description="SQLite View application")
+    parser = argparse.ArgumentParser(
+        description="SQLite View application",
+        epilog=f"Headless commands: {', '.join(COMMANDS)} (see 'sqliteview <command> --help').",
+    )
     parser.add_argument("database", nargs="?", help="Path to a SQLite database to open")
     parser.add_argument(
         "--version",
         action="version",
         version=f"SQLite View {__version__}",
     )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Print an import/initialisation timing breakdown once the window is shown",
+    )
+    add_open_options(parser)
     return parser
 
 
 def main(argv: list[str] | None = None) -> int:
+    profile = StartupProfile()
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in COMMANDS:
+        return cli_main(argv)
+
     parser = build_parser()
     args = parser.parse_args(argv)
 
@@ -29,7 +45,18 @@ def main(argv: list[str] | None = None) -> int:
     if args.database:
         initial_path = str(Path(args.database).expanduser())
 
-    return run(initial_path)
+    profile.mark("parse arguments")
+    if args.profile_startup:
+        # Import Qt on its own first so the breakdown separates it from our modules.
+        import PyQt6.QtWidgets  # noqa: F401
+
+        profile.mark("import PyQt6")
+
+    # Imported lazily so the headless commands above never load Qt.
+    from .app import run
+
+    profile.mark("import application modules")
+    return run(initial_path, open_options_from_args(args), profile if args.profile_startup else None)
 
 
 if __name__ == "__main__":
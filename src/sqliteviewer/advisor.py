@@ -0,0 +1,472 @@
+"""Workload-driven index advisor.
+
+Candidate indexes are derived from the columns a workload filters, joins and
+sorts on (plus the automatic indexes SQLite builds at run time), then
+validated one by one on an in-memory copy of the database: each workload
+statement that touches the candidate's table is timed and explained before
+and after creating the index there. The real database is never modified.
+"""
+
+from __future__ import annotations
+
+import re
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from .database import DatabaseError, DatabaseService, QueryCancelledError, quote_identifier
+from .instrumentation import QueryStats
+from .query_cache import normalize_sql
+from .query_plan import AUTOMATIC_INDEX, build_plan, table_aliases, unquote
+from .sql_lexer import QUOTED, WORD, first_keyword, tokenize
+
+
+ADVISOR_REPEAT = 3
+ADVISOR_MIN_SPEEDUP = 1.1
+MAX_INDEX_COLUMNS = 4
+_PROGRESS_STEPS = 10000
+
+_AUTOMATIC_COLUMNS_PATTERN = re.compile(r"AUTOMATIC (?:PARTIAL )?COVERING INDEX \((?P<terms>[^)]*)\)", re.IGNORECASE)
+_TERM_PATTERN = re.compile(r"(?P<column>\S+?)(?P<op>=|>|<|>=|<=)\?")
+_EQUALITY_OPERATORS = {"=", "==", "IN", "IS"}
+_RANGE_OPERATORS = {"<", ">", "<=", ">=", "BETWEEN"}
+_PREDICATE_CLAUSES = {"WHERE", "ON", "HAVING"}
+_CLAUSE_KEYWORDS = {
+    "SELECT", "FROM", "JOIN", "WHERE", "ON", "GROUP", "ORDER", "HAVING", "LIMIT", "OFFSET", "UNION",
+    "INTERSECT", "EXCEPT", "WINDOW", "VALUES", "SET", "RETURNING", "USING",
+}
+_ORDERING_MODIFIERS = {"ASC", "DESC", "NULLS", "FIRST", "LAST", "COLLATE"}
+
+
+@dataclass(slots=True)
+class WorkloadEntry:
+    """A distinct statement of the workload and how often it ran."""
+
+    sql: str
+    executions: int = 1
+    total_ms: float = 0.0
+
+
+@dataclass(slots=True)
+class IndexCandidate:
+    """A proposed index and the workload statements it was derived from."""
+
+    table: str
+    columns: Tuple[str, ...]
+    sources: List[str] = field(default_factory=list)
+
+    @property
+    def name(self) -> str:
+        parts = [self.table, *self.columns]
+        return "idx_" + "_".join(re.sub(r"\W+", "_", part).strip("_").lower() for part in parts)
+
+    @property
+    def create_sql(self) -> str:
+        columns = ", ".join(quote_identifier(column) for column in self.columns)
+        return f"CREATE INDEX {quote_identifier(self.name)} ON {quote_identifier(self.table)} ({columns})"
+
+
+@dataclass(slots=True)
+class IndexRecommendation:
+    """A validated candidate with its measured effect on the workload.
+
+    ``before_ms``/``after_ms`` are the workload time spent in the affected
+    statements, weighted by how often each statement ran.
+    """
+
+    candidate: IndexCandidate
+    statements: List[str]
+    before_ms: float
+    after_ms: float
+    plan_before: Dict[str, List[str]] = field(default_factory=dict)
+    plan_after: Dict[str, List[str]] = field(default_factory=dict)
+
+    @property
+    def create_sql(self) -> str:
+        return self.candidate.create_sql + ";"
+
+    @property
+    def saved_ms(self) -> float:
+        return self.before_ms - self.after_ms
+
+    @property
+    def speedup(self) -> float:
+        return self.before_ms / self.after_ms if self.after_ms > 0 else float("inf")
+
+
+@dataclass(slots=True)
+class AdvisorReport:
+    recommendations: List[IndexRecommendation]
+    statements: int
+    candidates: int
+    sampled: bool
+    skipped: List[Tuple[str, str]] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class AdvisorProgress:
+    step: int
+    total: int
+    message: str
+
+
+def collect_workload(stats: Iterable[QueryStats], database: Optional[str] = None) -> List[WorkloadEntry]:
+    """Group successful read statements by normalized text, most expensive first.
+
+    Only statements that can use an index (SELECT/WITH) are kept; cached
+    executions count towards the frequency but not the time.
+    """
+
+    entries: Dict[str, WorkloadEntry] = {}
+    for item in stats:
+        if item.status != "ok" or (database is not None and item.database != database):
+            continue
+        normalized = normalize_sql(item.sql)
+        if first_keyword(normalized) not in ("SELECT", "WITH"):
+            continue
+        entry = entries.get(normalized)
+        if entry is None:
+            entry = entries[normalized] = WorkloadEntry(normalized, executions=0)
+        entry.executions += 1
+        entry.total_ms += item.total_ms
+    return sorted(entries.values(), key=lambda entry: entry.total_ms, reverse=True)
+
+
+class IndexAdvisor:
+    """Propose and validate indexes for ``workload`` against ``service``'s database."""
+
+    def __init__(
+        self,
+        service: DatabaseService,
+        workload: Sequence[WorkloadEntry],
+        repeat: int = ADVISOR_REPEAT,
+        min_speedup: float = ADVISOR_MIN_SPEEDUP,
+    ) -> None:
+        self.service = service
+        self.workload = list(workload)
+        self.repeat = repeat
+        self.min_speedup = min_speedup
+
+    def candidates(self) -> List[IndexCandidate]:
+        """Return candidate indexes derived from the workload's predicates and sort keys."""
+
+        found: Dict[Tuple[str, Tuple[str, ...]], IndexCandidate] = {}
+        for entry in self.workload:
+            for table, columns in self._statement_candidates(entry.sql):
+                key = (table.lower(), tuple(column.lower() for column in columns))
+                candidate = found.get(key)
+                if candidate is None:
+                    candidate = found[key] = IndexCandidate(table, columns)
+                candidate.sources.append(entry.sql)
+        return [candidate for candidate in found.values() if not self._already_indexed(candidate)]
+
+    def run(
+        self,
+        progress: Optional[Callable[[AdvisorProgress], None]] = None,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+    ) -> AdvisorReport:
+        """Validate every candidate on a copy of the database and rank the useful ones."""
+
+        candidates = self.candidates()
+        copy, sampled = self.service.snapshot(is_cancelled=is_cancelled)
+        if is_cancelled is not None:
+            copy.set_progress_handler(lambda: 1 if is_cancelled() else 0, _PROGRESS_STEPS)
+        skipped: List[Tuple[str, str]] = []
+        baseline: Dict[str, Tuple[float, List[str]]] = {}
+        recommendations = []
+        try:
+            for entry in self.workload:
+                try:
+                    baseline[entry.sql] = (self._time(copy, entry.sql), self._plan(copy, entry.sql))
+                except sqlite3.OperationalError as exc:
+                    self._check_cancelled(exc)
+                    skipped.append((entry.sql, str(exc)))
+                except sqlite3.Error as exc:
+                    skipped.append((entry.sql, str(exc)))
+
+            for step, candidate in enumerate(candidates, start=1):
+                if progress is not None:
+                    progress(AdvisorProgress(step, len(candidates), f"Testing {candidate.create_sql}"))
+                recommendation = self._validate(copy, candidate, baseline)
+                if recommendation is not None:
+                    recommendations.append(recommendation)
+        except sqlite3.OperationalError as exc:
+            self._check_cancelled(exc)
+            raise
+        finally:
+            copy.close()
+
+        recommendations.sort(key=lambda item: item.saved_ms, reverse=True)
+        return AdvisorReport(_drop_redundant(recommendations), len(self.workload), len(candidates), sampled, skipped)
+
+    def _validate(
+        self,
+        copy: sqlite3.Connection,
+        candidate: IndexCandidate,
+        baseline: Dict[str, Tuple[float, List[str]]],
+    ) -> Optional[IndexRecommendation]:
+        affected = [
+            entry for entry in self.workload
+            if entry.sql in baseline and candidate.table.lower() in self._tables(entry.sql)
+        ]
+        if not affected:
+            return None
+        try:
+            copy.execute(candidate.create_sql)
+        except sqlite3.Error as exc:
+            # e.g. the name is taken or the sampled rows are not valid for it
+            if isinstance(exc, sqlite3.OperationalError):
+                self._check_cancelled(exc)
+            return None
+        try:
+            before_ms = after_ms = 0.0
+            used_by = []
+            plan_before: Dict[str, List[str]] = {}
+            plan_after: Dict[str, List[str]] = {}
+            for entry in affected:
+                old_ms, old_plan = baseline[entry.sql]
+                new_plan = self._plan(copy, entry.sql)
+                if not any(candidate.name in step for step in new_plan):
+                    continue
+                new_ms = self._time(copy, entry.sql)
+                before_ms += old_ms * entry.executions
+                after_ms += new_ms * entry.executions
+                used_by.append(entry.sql)
+                plan_before[entry.sql] = old_plan
+                plan_after[entry.sql] = new_plan
+        finally:
+            copy.execute(f"DROP INDEX {quote_identifier(candidate.name)}")
+        if not used_by:
+            return None
+        recommendation = IndexRecommendation(candidate, used_by, before_ms, after_ms, plan_before, plan_after)
+        return recommendation if recommendation.speedup >= self.min_speedup else None
+
+    def _time(self, connection: sqlite3.Connection, sql: str) -> float:
+        """Return the best of ``repeat`` runs of ``sql`` (reading every row), in ms."""
+
+        best = float("inf")
+        for _ in range(max(1, self.repeat)):
+            started = time.perf_counter()
+            cursor = connection.execute(sql)
+            while cursor.fetchmany(1000):
+                pass
+            best = min(best, (time.perf_counter() - started) * 1000)
+        return best
+
+    def _plan(self, connection: sqlite3.Connection, sql: str) -> List[str]:
+        roots = build_plan(connection.execute(f"EXPLAIN QUERY PLAN {sql}").fetchall())
+        return [node.detail for root in roots for node in root.walk()]
+
+    def _check_cancelled(self, exc: sqlite3.OperationalError) -> None:
+        if str(exc) == "interrupted":
+            raise QueryCancelledError("Index advisor cancelled.") from exc
+
+    def _tables(self, sql: str) -> Set[str]:
+        catalog = self.service.catalog
+        tables = set()
+        for table in table_aliases(sql).values():
+            obj = catalog.get(table)
+            if obj is not None and obj.type == "table":
+                tables.add(obj.name.lower())
+        return tables
+
+    def _already_indexed(self, candidate: IndexCandidate) -> bool:
+        """Whether an existing index covers the candidate's columns or already uses its name."""
+
+        if self.service.catalog.get(candidate.name) is not None:
+            return True
+        wanted = [column.lower() for column in candidate.columns]
+        for index in self.service.catalog.indexes(candidate.table):
+            existing = [(column or "").lower() for column in index.columns]
+            if existing[: len(wanted)] == wanted:
+                return True
+        return wanted[0] == self._rowid_column(candidate.table)
+
+    def _rowid_column(self, table: str) -> Optional[str]:
+        """Return the lower-cased INTEGER PRIMARY KEY column of ``table``, if it has one."""
+
+        primary_key = [column for column in self.service.catalog.columns(table) if column.primary_key]
+        if len(primary_key) == 1 and primary_key[0].type.upper() == "INTEGER":
+            return primary_key[0].name.lower()
+        return None
+
+    def _statement_candidates(self, sql: str) -> List[Tuple[str, Tuple[str, ...]]]:
+        usage = _analyze_columns(sql)
+        aliases = table_aliases(sql)
+        catalog = self.service.catalog
+        table_columns: Dict[str, Dict[str, str]] = {}
+        for table in aliases.values():
+            obj = catalog.get(table)
+            if obj is not None and obj.type == "table" and obj.name not in table_columns:
+                table_columns[obj.name] = {column.name.lower(): column.name for column in catalog.columns(obj.name)}
+
+        def resolve(qualifier: Optional[str], column: str) -> Optional[Tuple[str, str]]:
+            if qualifier is not None:
+                obj = catalog.get(aliases.get(qualifier.lower(), qualifier))
+                owners = [obj.name] if obj is not None and obj.name in table_columns else []
+            else:
+                owners = list(table_columns)
+            owners = [table for table in owners if column.lower() in table_columns[table]]
+            if len(owners) != 1:
+                return None
+            return owners[0], table_columns[owners[0]][column.lower()]
+
+        per_table: Dict[str, Dict[str, List[str]]] = {}
+        for kind, qualifier, column in usage:
+            resolved = resolve(qualifier, column)
+            if resolved is None:
+                continue
+            table, name = resolved
+            columns = per_table.setdefault(table, {"eq": [], "range": [], "order": []})[kind]
+            if name not in columns:
+                columns.append(name)
+
+        for table, name in self._automatic_index_columns(sql, aliases, table_columns):
+            columns = per_table.setdefault(table, {"eq": [], "range": [], "order": []})["eq"]
+            if name not in columns:
+                columns.append(name)
+
+        candidates = []
+        for table, columns in per_table.items():
+            # Lookups by rowid never need a secondary index.
+            rowid = self._rowid_column(table)
+            equality = [column for column in columns["eq"] if column.lower() != rowid]
+            ranges = [column for column in columns["range"] if column not in equality and column.lower() != rowid]
+            order = [column for column in columns["order"] if column not in equality]
+            if equality or ranges:
+                candidates.append((table, tuple((equality + ranges[:1])[:MAX_INDEX_COLUMNS])))
+            if order:
+                candidates.append((table, tuple((equality + order)[:MAX_INDEX_COLUMNS])))
+        return candidates
+
+    def _automatic_index_columns(
+        self, sql: str, aliases: Dict[str, str], table_columns: Dict[str, Dict[str, str]]
+    ) -> List[Tuple[str, str]]:
+        """Columns SQLite itself chose for automatic indexes on the live database."""
+
+        try:
+            roots = self.service.explain_query_plan(sql)
+        except DatabaseError:
+            return []
+        found = []
+        for root in roots:
+            for node in root.walk():
+                if node.kind != AUTOMATIC_INDEX or node.table not in table_columns:
+                    continue
+                match = _AUTOMATIC_COLUMNS_PATTERN.search(node.detail)
+                for term in _TERM_PATTERN.finditer(match.group("terms") if match else ""):
+                    column = table_columns[node.table].get(unquote(term.group("column")).lower())
+                    if column is not None:
+                        found.append((node.table, column))
+        return found
+
+
+def _drop_redundant(recommendations: List[IndexRecommendation]) -> List[IndexRecommendation]:
+    """Drop recommendations whose columns are a prefix of another recommended index on the same table.
+
+    The longer index serves every lookup the shorter one would.
+    """
+
+    def covered(candidate: IndexCandidate) -> bool:
+        return any(
+            other.candidate.table == candidate.table
+            and len(other.candidate.columns) > len(candidate.columns)
+            and other.candidate.columns[: len(candidate.columns)] == candidate.columns
+            for other in recommendations
+        )
+
+    return [item for item in recommendations if not covered(item.candidate)]
+
+
+def _analyze_columns(sql: str) -> List[Tuple[str, Optional[str], str]]:
+    """Return ``(kind, qualifier, column)`` for column references used by an index.
+
+    ``kind`` is ``"eq"`` for equality/IN/IS comparisons (including join
+    conditions), ``"range"`` for inequalities and BETWEEN, and ``"order"`` for
+    plain ORDER BY / GROUP BY terms. Comparisons are recognised lexically in
+    WHERE, ON and HAVING clauses; anything else is ignored.
+    """
+
+    tokens = list(tokenize(sql))
+    usage: List[Tuple[str, Optional[str], str]] = []
+    clause_stack: List[Optional[str]] = [None]
+
+    def column_at(position: int) -> Optional[Tuple[int, Optional[str], str]]:
+        """Parse ``[qualifier.]column`` starting at ``position``; return (end, qualifier, column)."""
+
+        if position >= len(tokens) or tokens[position].kind not in (WORD, QUOTED):
+            return None
+        first = tokens[position]
+        if first.keyword in _CLAUSE_KEYWORDS or first.keyword in ("NOT", "AND", "OR", "NULL", "CASE"):
+            return None
+        if (
+            position + 2 < len(tokens)
+            and tokens[position + 1].text == "."
+            and tokens[position + 2].kind in (WORD, QUOTED)
+        ):
+            return position + 3, unquote(first.text), unquote(tokens[position + 2].text)
+        if position + 1 < len(tokens) and tokens[position + 1].text == "(":
+            return None  # function call
+        return position + 1, None, unquote(first.text)
+
+    position = 0
+    while position < len(tokens):
+        token = tokens[position]
+        text = token.text
+        clause = clause_stack[-1]
+        if text == "(":
+            clause_stack.append(clause)
+        elif text == ")":
+            if len(clause_stack) > 1:
+                clause_stack.pop()
+        elif token.keyword in _CLAUSE_KEYWORDS:
+            if token.keyword in ("GROUP", "ORDER"):
+                clause_stack[-1] = "ORDER"
+                position += 2 if position + 1 < len(tokens) and tokens[position + 1].keyword == "BY" else 1
+                position = _ordering_terms(tokens, position, column_at, usage)
+                continue
+            clause_stack[-1] = token.keyword
+        elif clause in _PREDICATE_CLAUSES:
+            parsed = column_at(position)
+            if parsed is not None:
+                end, qualifier, column = parsed
+                operator = tokens[end].text.upper() if end < len(tokens) else ""
+                if operator == "IS" and end + 1 < len(tokens) and tokens[end + 1].keyword == "NOT":
+                    operator = "IS NOT"
+                if operator in _EQUALITY_OPERATORS:
+                    usage.append(("eq", qualifier, column))
+                elif operator in _RANGE_OPERATORS:
+                    usage.append(("range", qualifier, column))
+                if operator in _EQUALITY_OPERATORS or operator in _RANGE_OPERATORS:
+                    # The other side of ``a.x = b.y`` is a join column too.
+                    other = column_at(end + 1)
+                    if other is not None:
+                        usage.append(("eq" if operator in _EQUALITY_OPERATORS else "range", other[1], other[2]))
+                        position = other[0]
+                        continue
+                position = end
+                continue
+        position += 1
+    return usage
+
+
+def _ordering_terms(tokens, position, column_at, usage) -> int:
+    """Record ``col [ASC|DESC], ...`` terms; stop at the first non-column term."""
+
+    terms = []
+    while True:
+        parsed = column_at(position)
+        if parsed is None:
+            break
+        end, qualifier, column = parsed
+        while end < len(tokens) and tokens[end].keyword in _ORDERING_MODIFIERS:
+            end += 2 if tokens[end].keyword in ("NULLS", "COLLATE") else 1
+        terms.append(("order", qualifier, column))
+        position = end
+        if position < len(tokens) and tokens[position].text == ",":
+            position += 1
+            continue
+        break
+    usage.extend(terms)
+    return position
@@ -8,12 +8,26 @@ from typing import Optional
 from PyQt6.QtCore import QTimer
 from PyQt6.QtWidgets import QApplication
 
+from .database import OpenOptions
 from .mainwindow import MainWindow
+from .startup import StartupProfile
 from .theme import apply_theme, load_theme_preference
 
 
-def run(initial_path: Optional[str] = None) -> int:
-    """Launch the Qt application."""
+def run(
+    initial_path: Optional[str] = None,
+    open_options: Optional[OpenOptions] = None,
+    profile: Optional[StartupProfile] = None,
+) -> int:
+    """Launch the Qt application.
+
+    With a ``profile``, each start-up step is recorded and the breakdown is
+    printed to stderr once the first window has been painted.
+    """
+
+    def mark(label: str) -> None:
+        if profile is not None:
+            profile.mark(label)
 
     app = QApplication.instance()
     owns_app = False
@@ -22,10 +36,16 @@ def run(initial_path: Optional[str] = None) -> int:
         app.setApplicationName("SQLite View")
         app.setOrganizationName("SQLiteView")
         owns_app = True
+    mark("create QApplication")
 
-    apply_theme(load_theme_preference(), app)
-    window = MainWindow()
+    theme = apply_theme(load_theme_preference(), app)
+    mark("load and apply theme")
+    window = MainWindow(open_options, theme)
+    mark("build main window")
     window.show()
+    mark("show main window")
+    if profile is not None:
+        QTimer.singleShot(0, lambda: _report_startup(profile))
 
     if initial_path:
         QTimer.singleShot(0, lambda: window.open_database(initial_path))
@@ -33,3 +53,8 @@ def run(initial_path: Optional[str] = None) -> int:
     if owns_app:
         return app.exec()
     return 0
+
+
+def _report_startup(profile: StartupProfile) -> None:
+    profile.mark("first paint (event loop running)")
+    print(profile.report(), file=sys.stderr, flush=True)
@@ -0,0 +1,237 @@
+"""Headless command-line interface that never imports Qt.
+
+``sqliteview <command> ...`` runs one of ``COMMANDS`` against a database and
+streams the output to stdout, so it can be used from scripts, cron jobs and
+CI without a display.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional, Sequence, TextIO
+
+from . import __version__
+from .database import DatabaseError, DatabaseService, OpenOptions, QueryCancelledError
+from .export import EXPORT_BATCH_SIZE, EXPORT_FORMATS, ExportProgress, create_writer, export_query, format_for_path
+
+
+COMMANDS = ("query", "tables", "schema", "export")
+OUTPUT_FORMATS = ("csv", "tsv", "jsonl", "table")
+TABLE_WIDTH_SAMPLE_ROWS = 256
+_MAX_TABLE_CELL_WIDTH = 60
+
+
+def add_open_options(parser: argparse.ArgumentParser) -> None:
+    """Add the connection tuning flags shared by the GUI and headless commands."""
+
+    group = parser.add_argument_group("open options")
+    group.add_argument("--read-only", action="store_true", help="Open the database with mode=ro")
+    group.add_argument(
+        "--immutable",
+        action="store_true",
+        help="Open with immutable=1 (read-only, no locking; only for files nothing else modifies)",
+    )
+    group.add_argument("--mmap-size", type=int, default=0, metavar="MIB", help="PRAGMA mmap_size in MiB")
+    group.add_argument("--cache-size", type=int, default=0, metavar="MIB", help="PRAGMA cache_size in MiB")
+    group.add_argument(
+        "--temp-store-memory", action="store_true", help="Keep temporary tables and indexes in memory"
+    )
+    group.add_argument("--query-only", action="store_true", help="Set PRAGMA query_only to reject writes")
+
+
+def open_options_from_args(args: argparse.Namespace) -> OpenOptions:
+    return OpenOptions(
+        read_only=args.read_only,
+        immutable=args.immutable,
+        mmap_size_mib=max(0, args.mmap_size),
+        cache_size_mib=max(0, args.cache_size),
+        temp_store_memory=args.temp_store_memory,
+        query_only=args.query_only,
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="sqliteview", description="Query a SQLite database without the GUI")
+    parser.add_argument("--version", action="version", version=f"SQLite View {__version__}")
+    commands = parser.add_subparsers(dest="command", required=True, metavar="command")
+
+    query = commands.add_parser("query", help="Run a SQL statement and print its result")
+    query.add_argument("database", help="Path to a SQLite database")
+    query.add_argument("sql", help="SQL statement to run, or '-' to read it from stdin")
+    query.add_argument("--format", choices=OUTPUT_FORMATS, default="table", help="Output format (default: table)")
+    query.add_argument("--batch-size", type=int, default=EXPORT_BATCH_SIZE, help=argparse.SUPPRESS)
+
+    tables = commands.add_parser("tables", help="List the tables and views")
+    tables.add_argument("database", help="Path to a SQLite database")
+
+    schema = commands.add_parser("schema", help="Print CREATE statements")
+    schema.add_argument("database", help="Path to a SQLite database")
+    schema.add_argument("table", nargs="*", help="Tables to describe (default: all)")
+
+    export = commands.add_parser("export", help="Stream a query result or table to a file")
+    export.add_argument("database", help="Path to a SQLite database")
+    export.add_argument("output", help="Destination file")
+    source = export.add_mutually_exclusive_group(required=True)
+    source.add_argument("--sql", help="Read query to export, or '-' to read it from stdin")
+    source.add_argument("--table", help="Table or view to export")
+    export.add_argument(
+        "--format",
+        choices=sorted(EXPORT_FORMATS),
+        help="Output format (default: guessed from the file extension, else csv)",
+    )
+    export.add_argument("--batch-size", type=int, default=EXPORT_BATCH_SIZE, help=argparse.SUPPRESS)
+
+    for subparser in (query, tables, schema, export):
+        add_open_options(subparser)
+    return parser
+
+
+def main(argv: Sequence[str], stdout: Optional[TextIO] = None, stderr: Optional[TextIO] = None) -> int:
+    """Run a headless command and return the process exit code."""
+
+    stdout = stdout or sys.stdout
+    stderr = stderr or sys.stderr
+    args = build_parser().parse_args(list(argv))
+
+    service = DatabaseService()
+    try:
+        service.open(args.database, open_options_from_args(args))
+        handler = _HANDLERS[args.command]
+        return handler(service, args, stdout, stderr)
+    except QueryCancelledError:
+        print("Cancelled.", file=stderr)
+        return 130
+    except KeyboardInterrupt:
+        service.interrupt()
+        print("Cancelled.", file=stderr)
+        return 130
+    except BrokenPipeError:
+        # The reader (e.g. ``head``) went away; stop quietly like other CLI tools.
+        _silence_stdout(stdout)
+        return 0
+    except DatabaseError as exc:
+        print(f"error: {exc}", file=stderr)
+        return 1
+    finally:
+        service.close()
+
+
+def _run_query(service: DatabaseService, args: argparse.Namespace, stdout: TextIO, stderr: TextIO) -> int:
+    sql = _read_sql(args.sql)
+    if service.classify_query(sql) != "read" or service.is_pragma_assignment(sql) or service.modifies_data(sql):
+        result = service.execute_query(sql)
+        if result.is_write_operation:
+            affected = result.affected_rows
+            print("Statement executed." if affected is None else f"{affected} row(s) affected.", file=stderr)
+            return 0
+        _write_rows(args.format, stdout, result.columns, [result.rows])
+        if result.truncated:
+            print(f"Output truncated to {len(result.rows)} row(s).", file=stderr)
+        return 0
+
+    columns, batches = service.iter_query(sql, max(1, args.batch_size))
+    try:
+        _write_rows(args.format, stdout, columns, batches)
+    finally:
+        batches.close()
+    return 0
+
+
+def _list_tables(service: DatabaseService, args: argparse.Namespace, stdout: TextIO, stderr: TextIO) -> int:
+    for name in service.list_tables():
+        stdout.write(name + "\n")
+    return 0
+
+
+def _print_schema(service: DatabaseService, args: argparse.Namespace, stdout: TextIO, stderr: TextIO) -> int:
+    status = 0
+    for name in args.table or service.list_tables():
+        obj = service.catalog.get(name)
+        if obj is None or obj.sql is None:
+            print(f"error: no such table: {name}", file=stderr)
+            status = 1
+            continue
+        stdout.write(obj.sql.rstrip().rstrip(";") + ";\n")
+    return status
+
+
+def _export(service: DatabaseService, args: argparse.Namespace, stdout: TextIO, stderr: TextIO) -> int:
+    if args.table is not None:
+        sql = service.table_query(args.table)
+    else:
+        sql = _read_sql(args.sql)
+    fmt = args.format or format_for_path(args.output)
+    progress = export_query(service, sql, args.output, fmt, max(1, args.batch_size))
+    print(_describe_export(progress, args.output), file=stderr)
+    return 0
+
+
+_HANDLERS: dict[str, Callable[[DatabaseService, argparse.Namespace, TextIO, TextIO], int]] = {
+    "query": _run_query,
+    "tables": _list_tables,
+    "schema": _print_schema,
+    "export": _export,
+}
+
+
+def _read_sql(sql: str) -> str:
+    return sys.stdin.read() if sql == "-" else sql
+
+
+def _write_rows(fmt: str, handle: TextIO, columns: Sequence[str], batches: Iterable[Sequence[Sequence[object]]]) -> None:
+    if fmt == "table":
+        _write_table(handle, columns, batches)
+    else:
+        write_rows = create_writer(fmt, handle, columns)
+        for batch in batches:
+            write_rows(batch)
+    handle.flush()
+
+
+def _write_table(handle: TextIO, columns: Sequence[str], batches: Iterable[Sequence[Sequence[object]]]) -> None:
+    """Write aligned plain-text output.
+
+    Column widths are sized from the header and the first batch so output
+    can start streaming right away; wider values in later batches simply
+    overflow their column.
+    """
+
+    def cells(row: Sequence[object]) -> List[str]:
+        return ["NULL" if value is None else str(value).replace("\n", " ") for value in row]
+
+    batches = iter(batches)
+    first = [cells(row) for row in next(batches, [])]
+    widths = [len(name) for name in columns]
+    for row in first[:TABLE_WIDTH_SAMPLE_ROWS]:
+        for index, value in enumerate(row):
+            widths[index] = max(widths[index], min(len(value), _MAX_TABLE_CELL_WIDTH))
+
+    def line(values: Sequence[str]) -> str:
+        return "  ".join(value.ljust(width) for value, width in zip(values, widths)).rstrip() + "\n"
+
+    handle.write(line(list(columns)))
+    handle.write(line(["-" * width for width in widths]))
+    handle.writelines(line(row) for row in first)
+    for batch in batches:
+        handle.writelines(line(cells(row)) for row in batch)
+
+
+def _describe_export(progress: ExportProgress, output: str) -> str:
+    return (
+        f"Exported {progress.rows_written:,} row(s) to {Path(output).name} "
+        f"in {progress.elapsed:.2f} s ({progress.rows_per_second:,.0f} rows/s)."
+    )
+
+
+def _silence_stdout(stdout: TextIO) -> None:
+    try:
+        stdout.flush()
+    except (BrokenPipeError, ValueError):
+        pass
+    if stdout is sys.stdout:
+        # Avoid a second BrokenPipeError when the interpreter flushes stdout on exit.
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
@@ -0,0 +1,193 @@
+"""Columnar, memory-accounted storage for query result rows."""
+
+from __future__ import annotations
+
+import sys
+from array import array
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple, Union, overload
+
+# Columns whose values are all INTEGER or all REAL (plus NULLs) are kept in
+# typed arrays; anything else is a list of objects with repeated strings
+# shared. Interning stops once a column has this many distinct strings,
+# because such a column gains little from it.
+INTERN_POOL_LIMIT = 65536
+# Object sizes are measured on this many values of each batch.
+SIZE_SAMPLE_VALUES = 32
+
+_NONE = type(None)
+_NONE_SIZE = sys.getsizeof(None)
+_POINTER_SIZE = 8
+
+
+class _Column:
+    """One column: a typed ``array`` with a NULL mask, or a list of objects."""
+
+    __slots__ = ("values", "nulls", "pool", "nbytes")
+
+    def __init__(self) -> None:
+        self.values: Union[array, List[object], None] = None
+        self.nulls: Optional[bytearray] = None
+        self.pool: Optional[Dict[str, str]] = {}
+        self.nbytes = 0
+
+    def __len__(self) -> int:
+        return len(self.values) if self.values is not None else 0
+
+    def get(self, index: int) -> object:
+        if self.nulls is not None and self.nulls[index]:
+            return None
+        return self.values[index]
+
+    def __iter__(self) -> Iterator[object]:
+        if self.values is None:
+            return iter(())
+        if self.nulls is None:
+            return iter(self.values)
+        return (None if null else value for value, null in zip(self.values, self.nulls))
+
+    def extend(self, values: Sequence[object]) -> None:
+        types = set(map(type, values))
+        has_nulls = _NONE in types
+        types.discard(_NONE)
+        if not isinstance(self.values, list):
+            current = self.values.typecode if self.values is not None else None
+            if not types:
+                code = current or "q"
+            else:
+                code = "q" if types == {int} else "d" if types == {float} else None
+            if code is not None and current in (None, code) and self._extend_array(code, values, has_nulls):
+                return
+            self._to_objects()
+        self._extend_objects(values, types)
+
+    def _extend_array(self, code: str, values: Sequence[object], has_nulls: bool) -> bool:
+        start = len(self)
+        if self.values is None:
+            self.values = array(code)
+        try:
+            self.values.extend([0 if value is None else value for value in values] if has_nulls else values)
+        except OverflowError:
+            # An INTEGER outside 64 bits (only from expressions); keep it as an object.
+            del self.values[start:]
+            return False
+        if has_nulls and self.nulls is None:
+            self.nulls = bytearray(start)
+        if self.nulls is not None:
+            self.nulls.extend(value is None for value in values)
+        self.nbytes = self.values.itemsize * len(self.values) + (len(self.nulls) if self.nulls is not None else 0)
+        return True
+
+    def _to_objects(self) -> None:
+        if self.values is None:
+            self.values = []
+            return
+        values = list(self)
+        self.values, self.nulls, self.nbytes = [], None, 0
+        self._extend_objects(values, set(map(type, values)) - {_NONE})
+
+    def _extend_objects(self, values: Sequence[object], types: Set[type]) -> None:
+        size = _POINTER_SIZE * len(values)
+        pool = self.pool
+        if pool is not None and str in types:
+            known = len(pool)
+            if types == {str}:
+                strings = values = list(map(pool.setdefault, values, values))
+            else:
+                values = [pool.setdefault(value, value) if type(value) is str else value for value in values]
+                strings = [value for value in values if type(value) is str]
+                size += _sampled_size([value for value in values if type(value) is not str])
+            # Only strings new to the pool take memory: count those at the batch's average size.
+            size += _sampled_size(strings) * (len(pool) - known) // len(strings)
+            if len(pool) > INTERN_POOL_LIMIT:
+                self.pool = None
+        else:
+            size += _sampled_size(values)
+        self.values.extend(values)
+        self.nbytes += size
+
+
+def _sampled_size(values: Sequence[object]) -> int:
+    """Estimate the total size of ``values`` (NULLs are free) from an evenly spaced sample."""
+
+    if not values:
+        return 0
+    sample = values[::max(1, len(values) // SIZE_SAMPLE_VALUES)]
+    size = sum(map(sys.getsizeof, sample)) - _NONE_SIZE * sample.count(None)
+    return size * len(values) // len(sample)
+
+
+class CompactRows(Sequence[Tuple[object, ...]]):
+    """A read-only sequence of row tuples stored column by column.
+
+    INTEGER and REAL columns are stored in ``array`` objects (8 bytes a
+    value plus a NULL mask when needed) instead of one Python object per
+    cell, and repeated strings are stored once. Rows are rebuilt as tuples
+    on access. ``nbytes`` is a running estimate of the memory held, used to
+    stop fetching at a memory budget.
+    """
+
+    def __init__(self, column_count: int) -> None:
+        self._columns = [_Column() for _ in range(column_count)]
+        self._length = 0
+
+    @property
+    def column_count(self) -> int:
+        return len(self._columns)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(column.nbytes for column in self._columns)
+
+    def extend(self, rows: Sequence[Sequence[object]]) -> None:
+        """Append a batch of rows (e.g. from ``Cursor.fetchmany``)."""
+
+        if not rows:
+            return
+        for column, values in zip(self._columns, zip(*rows)):
+            column.extend(values)
+        self._length += len(rows)
+
+    def append(self, row: Sequence[object]) -> None:
+        self.extend([row])
+
+    def value(self, row: int, column: int) -> object:
+        """Return one cell without building the row tuple."""
+
+        if not 0 <= row < self._length:
+            raise IndexError("row index out of range")
+        return self._columns[column].get(row)
+
+    def __len__(self) -> int:
+        return self._length
+
+    @overload
+    def __getitem__(self, index: int) -> Tuple[object, ...]: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Tuple[object, ...]]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._length)
+            return list(islice(self, start, stop, step)) if step > 0 else [self[i] for i in range(start, stop, step)]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("row index out of range")
+        return tuple(column.get(index) for column in self._columns)
+
+    def __iter__(self) -> Iterator[Tuple[object, ...]]:
+        if not self._columns:
+            return iter([()] * self._length)
+        return zip(*self._columns)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, (CompactRows, list, tuple)):
+            return NotImplemented
+        return len(self) == len(other) and all(row == tuple(expected) for row, expected in zip(self, other))
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"CompactRows({len(self)} rows, {self.column_count} columns, {self.nbytes} bytes)"
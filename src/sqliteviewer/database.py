@@ -2,36 +2,531 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import dataclasses
+import itertools
+import re
+import threading
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Iterable, List, Optional, Sequence, Tuple
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    ContextManager,
+    Deque,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+from urllib.parse import quote as url_quote
 
 import sqlite3
 
+from .compact_rows import CompactRows
+from .instrumentation import PerformanceLog, QueryStats, StatementProbe
+from .query_cache import QueryCache, is_cacheable_sql, normalize_sql
+from .query_plan import TEMP_BTREE, PlanNode, build_plan, table_aliases
+from .spilled_rows import SpilledRows
+from .sql_lexer import first_keyword, split_statements, statement_tokens, tokenize, top_level_keywords
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from .search_index import SearchIndex
 
 DEFAULT_ROW_LIMIT = 200
-QUERY_ROW_LIMIT = 1000
+# Query results stop fetching once their rows hold about this much memory.
+RESULT_MEMORY_BUDGET = 16 * 1024 * 1024
+QUERY_STATS_HISTORY = 500
+FETCH_BATCH_SIZE = 256
+INSERT_BATCH_SIZE = 10000
+READER_POOL_SIZE = 4
+SNAPSHOT_MAX_BYTES = 256 * 1024 * 1024
+SNAPSHOT_SAMPLE_ROWS = 200_000
+# Pages copied per backup step; cancellation is checked between steps.
+SNAPSHOT_BACKUP_PAGES = 1024
+# Characters of TEXT / bytes of BLOB values shown in a preview cell.
+PREVIEW_VALUE_LIMIT = 256
+BLOB_CHUNK_SIZE = 1024 * 1024
+# SQLite VM steps between checks of an ``is_cancelled`` callback.
+CANCEL_CHECK_STEPS = 10000
 
 _READ_KEYWORDS = {"SELECT", "WITH", "PRAGMA", "EXPLAIN"}
+# Statements tried on a pooled read-only connection first.
+_READER_KEYWORDS = {"SELECT", "WITH", "VALUES"}
 _DML_KEYWORDS = {"INSERT", "UPDATE", "DELETE", "REPLACE"}
 _DDL_KEYWORDS = {"CREATE", "ALTER", "DROP"}
-_TCL_KEYWORDS = {"BEGIN", "COMMIT", "ROLLBACK", "SAVEPOINT", "RELEASE"}
+_TCL_KEYWORDS = {"BEGIN", "COMMIT", "ROLLBACK", "SAVEPOINT", "RELEASE", "END"}
+# Statements that cannot run inside the savepoint a script is wrapped in.
+_UNWRAPPABLE_KEYWORDS = _TCL_KEYWORDS | {"VACUUM", "ATTACH", "DETACH"}
+_SCRIPT_SAVEPOINT = "sqliteviewer_script"
+_ROWID_ALIASES = ("rowid", "_rowid_", "oid")
+_EXPLAIN_PREFIX_PATTERN = re.compile(r"^\s*EXPLAIN(?:\s+QUERY\s+PLAN)?\b", re.IGNORECASE)
+_FILTER_TERM_PATTERN = re.compile(r'(?:(?P<column>[^\s:"]+):)?(?:"(?P<quoted>(?:[^"]|"")*)"?|(?P<word>\S+))?')
 
 
 class DatabaseError(RuntimeError):
     """Raised when a database operation fails."""
 
 
+class QueryCancelledError(DatabaseError):
+    """Raised when a running statement is aborted via ``interrupt()``."""
+
+
 @dataclass(slots=True)
 class QueryResult:
     """Container for tabular data returned to the UI layer."""
 
     columns: List[str]
-    rows: List[Sequence[object]]
+    rows: Sequence[Sequence[object]]
     truncated: bool = False
     row_count: Optional[int] = None
     affected_rows: Optional[int] = None
     is_write_operation: bool = False
+    row_keys: Optional[List[Tuple[object, ...]]] = None
+    has_previous: bool = False
+    offset: Optional[int] = None
+    from_cache: bool = False
+    stats: Optional[QueryStats] = None
+    size_bytes: Optional[int] = None
+
+
+@dataclass(frozen=True, slots=True)
+class TruncatedValue:
+    """A preview cell holding only the start of a large TEXT or BLOB value.
+
+    ``size`` is the full length in bytes (UTF-8 for TEXT). TEXT heads hold
+    the first ``PREVIEW_VALUE_LIMIT`` characters; BLOB heads are empty
+    because reading them would load the whole value. Use
+    ``DatabaseService.read_value`` for the complete value.
+    """
+
+    head: Union[str, bytes]
+    size: int
+
+    @property
+    def is_blob(self) -> bool:
+        return isinstance(self.head, bytes)
+
+
+@dataclass(frozen=True, slots=True)
+class PreviewFilter:
+    """Substring ("contains") filters applied to a table preview.
+
+    ``text`` must occur in at least one column and every ``(column, text)``
+    pair in ``columns`` in that column. Matching follows SQL ``LIKE``:
+    case-insensitive for ASCII letters.
+    """
+
+    text: str = ""
+    columns: Tuple[Tuple[str, str], ...] = ()
+
+    @property
+    def active(self) -> bool:
+        return bool(self.text or self.columns)
+
+    @classmethod
+    def parse(cls, text: str, columns: Sequence[str]) -> "PreviewFilter":
+        """Parse filter-bar input such as ``smith city:"New York"``.
+
+        ``column:text`` terms filter one column (names are matched
+        case-insensitively; unknown names are searched for literally, and a
+        known name without text is ignored while it is being typed).
+        The remaining words form one phrase searched for in every column.
+        """
+
+        names = {column.lower(): column for column in columns}
+        words: List[str] = []
+        column_terms: List[Tuple[str, str]] = []
+        for match in _FILTER_TERM_PATTERN.finditer(text):
+            if not match.group():
+                continue
+            quoted = match.group("quoted")
+            value = quoted.replace('""', '"') if quoted is not None else match.group("word") or ""
+            column = names.get((match.group("column") or "").lower())
+            if column is None:
+                words.append(match.group() if match.group("column") else value)
+            elif value:
+                column_terms.append((column, value))
+        return cls(" ".join(word for word in words if word), tuple(column_terms))
+
+
+@dataclass(frozen=True, slots=True)
+class PreviewSort:
+    """Order a table preview by one column, ascending or descending."""
+
+    column: str
+    descending: bool = False
+
+
+@dataclass(slots=True)
+class StatementResult:
+    """Outcome of one statement of a script run by ``execute_script``.
+
+    ``status`` is ``"ok"``, ``"error"`` or ``"cancelled"``. ``rows`` counts
+    the rows returned (up to the row limit) and ``affected_rows`` the rows
+    changed by a DML statement.
+    """
+
+    number: int
+    sql: str
+    status: str = "ok"
+    rows: int = 0
+    affected_rows: Optional[int] = None
+    error: Optional[str] = None
+    stats: Optional[QueryStats] = None
+
+
+@dataclass(slots=True)
+class ScriptResult:
+    """Per-statement outcomes of a script and the last result set it produced."""
+
+    statements: List[StatementResult]
+    result: Optional[QueryResult] = None
+    result_sql: Optional[str] = None
+    transaction: bool = False
+
+    @property
+    def affected_rows(self) -> int:
+        return sum(item.affected_rows or 0 for item in self.statements)
+
+
+@dataclass(slots=True)
+class OpenOptions:
+    """Connection settings applied when a database is opened.
+
+    ``read_only`` opens with ``mode=ro``; ``immutable`` additionally sets
+    ``immutable=1`` so SQLite skips locking and change detection (only safe
+    for files nothing else modifies). Sizes are in MiB; 0 keeps SQLite's
+    default.
+    """
+
+    read_only: bool = False
+    immutable: bool = False
+    mmap_size_mib: int = 0
+    cache_size_mib: int = 0
+    temp_store_memory: bool = False
+    query_only: bool = False
+
+    def uri(self, path: Path, read_only: bool = False) -> str:
+        params = []
+        if read_only or self.read_only or self.immutable:
+            params.append("mode=ro")
+        if self.immutable:
+            params.append("immutable=1")
+        query = f"?{'&'.join(params)}" if params else ""
+        return f"file:{url_quote(path.as_posix())}{query}"
+
+    def pragmas(self) -> List[str]:
+        statements = []
+        if self.mmap_size_mib > 0:
+            statements.append(f"PRAGMA mmap_size = {self.mmap_size_mib * 1024 * 1024}")
+        if self.cache_size_mib > 0:
+            statements.append(f"PRAGMA cache_size = {-self.cache_size_mib * 1024}")
+        if self.temp_store_memory:
+            statements.append("PRAGMA temp_store = MEMORY")
+        return statements
+
+
+@dataclass(slots=True)
+class ColumnInfo:
+    """A column as reported by ``PRAGMA table_xinfo``."""
+
+    name: str
+    type: str
+    not_null: bool
+    default: Optional[str]
+    primary_key: int
+    hidden: int = 0
+
+
+@dataclass(slots=True)
+class IndexInfo:
+    """An index as reported by ``PRAGMA index_list``/``index_info``."""
+
+    name: str
+    unique: bool
+    origin: str
+    partial: bool
+    columns: List[Optional[str]]
+    sql: Optional[str] = None
+
+
+@dataclass(slots=True)
+class SchemaObject:
+    """A row of ``sqlite_master``."""
+
+    type: str
+    name: str
+    table_name: str
+    sql: Optional[str]
+
+    @property
+    def without_rowid(self) -> bool:
+        """Whether ``WITHOUT ROWID`` is among the table options after the column definitions."""
+
+        if self.type != "table" or not self.sql:
+            return False
+        depth = 0
+        options: Optional[List[Optional[str]]] = None
+        for token in tokenize(self.sql):
+            if options is not None:
+                options.append(token.keyword)
+            elif token.text == "(":
+                depth += 1
+            elif token.text == ")":
+                depth -= 1
+                if depth == 0:
+                    options = []
+        return options is not None and ("WITHOUT", "ROWID") in zip(options, options[1:])
+
+
+@dataclass
+class _CatalogSnapshot:
+    version: int
+    objects: Dict[str, SchemaObject]
+    columns: Dict[str, List[ColumnInfo]] = field(default_factory=dict)
+    indexes: Dict[str, List[IndexInfo]] = field(default_factory=dict)
+
+
+class SchemaCatalog:
+    """In-memory copy of the schema, reloaded only when ``PRAGMA schema_version`` changes.
+
+    ``sqlite_master`` is loaded in one query; per-table columns and indexes
+    are fetched on first use and memoised until the next schema change.
+    Object names are matched case-insensitively, like SQLite does.
+    """
+
+    def __init__(self, connection: Callable[[], ContextManager[sqlite3.Connection]]) -> None:
+        self._connection = connection
+        self._snapshot: Optional[_CatalogSnapshot] = None
+        self._lock = threading.RLock()
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._snapshot = None
+
+    def objects(self) -> List[SchemaObject]:
+        return list(self._current().objects.values())
+
+    def get(self, name: str) -> Optional[SchemaObject]:
+        return self._current().objects.get(name.lower())
+
+    def tables(self) -> List[str]:
+        """Return user tables and views ordered alphabetically."""
+
+        names = [
+            obj.name
+            for obj in self._current().objects.values()
+            if obj.type in ("table", "view") and not obj.name.lower().startswith("sqlite_")
+        ]
+        return sorted(names, key=str.lower)
+
+    def columns(self, table_name: str) -> List[ColumnInfo]:
+        with self._lock:
+            snapshot = self._current()
+            key = table_name.lower()
+            if key not in snapshot.columns:
+                rows = self._query(f"PRAGMA table_xinfo({quote_identifier(table_name)})")
+                snapshot.columns[key] = [
+                    ColumnInfo(
+                        name=row[1],
+                        type=row[2] or "",
+                        not_null=bool(row[3]),
+                        default=row[4],
+                        primary_key=int(row[5]),
+                        hidden=int(row[6]),
+                    )
+                    for row in rows
+                ]
+            return snapshot.columns[key]
+
+    def indexes(self, table_name: str) -> List[IndexInfo]:
+        with self._lock:
+            snapshot = self._current()
+            key = table_name.lower()
+            if key not in snapshot.indexes:
+                indexes = []
+                for row in self._query(f"PRAGMA index_list({quote_identifier(table_name)})"):
+                    name = row[1]
+                    info = self._query(f"PRAGMA index_info({quote_identifier(name)})")
+                    obj = snapshot.objects.get(name.lower())
+                    indexes.append(
+                        IndexInfo(
+                            name=name,
+                            unique=bool(row[2]),
+                            origin=row[3],
+                            partial=bool(row[4]),
+                            columns=[column[2] for column in info],
+                            sql=obj.sql if obj is not None else None,
+                        )
+                    )
+                snapshot.indexes[key] = indexes
+            return snapshot.indexes[key]
+
+    def _current(self) -> _CatalogSnapshot:
+        with self._lock:
+            version = int(self._query("PRAGMA schema_version")[0][0])
+            if self._snapshot is None or self._snapshot.version != version:
+                rows = self._query("SELECT type, name, tbl_name, sql FROM sqlite_master")
+                objects = {
+                    str(row[1]).lower(): SchemaObject(type=row[0], name=row[1], table_name=row[2], sql=row[3])
+                    for row in rows
+                }
+                self._snapshot = _CatalogSnapshot(version=version, objects=objects)
+            return self._snapshot
+
+    def _query(self, sql: str) -> List[Tuple[object, ...]]:
+        try:
+            with self._connection() as connection:
+                return connection.execute(sql).fetchall()
+        except sqlite3.Error as exc:
+            raise DatabaseError(str(exc)) from exc
+
+
+class ConnectionPool:
+    """One writer connection plus read-only connections checked out per unit of work.
+
+    A reader is owned by exactly one thread between ``acquire`` and
+    ``release``, so previews, row counts, exports and console reads can run
+    concurrently on separate connections. Up to ``max_idle`` readers are kept
+    open for reuse; extra readers are opened on demand and closed on release.
+    Readers only ever see committed data; concurrency with the writer is best
+    in WAL mode, where readers and the writer never block each other.
+    """
+
+    def __init__(
+        self,
+        writer: sqlite3.Connection,
+        open_reader: Callable[[], sqlite3.Connection],
+        max_idle: int = READER_POOL_SIZE,
+    ) -> None:
+        self.writer = writer
+        self._open_reader = open_reader
+        self._max_idle = max_idle
+        self._idle: List[sqlite3.Connection] = []
+        self._in_use: Set[sqlite3.Connection] = set()
+        self._closed = False
+        self._lock = threading.Lock()
+
+    @property
+    def wal(self) -> bool:
+        mode = self.writer.execute("PRAGMA journal_mode").fetchone()[0]
+        return str(mode).lower() == "wal"
+
+    def acquire(self) -> sqlite3.Connection:
+        with self._lock:
+            if self._closed:
+                raise DatabaseError("No database open.")
+            connection = self._idle.pop() if self._idle else None
+            if connection is None:
+                connection = self._open_reader()
+            self._in_use.add(connection)
+            return connection
+
+    def release(self, connection: sqlite3.Connection) -> None:
+        with self._lock:
+            self._in_use.discard(connection)
+            if not self._closed and len(self._idle) < self._max_idle and not connection.in_transaction:
+                self._idle.append(connection)
+                return
+        connection.close()
+
+    @contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        connection = self.acquire()
+        try:
+            yield connection
+        finally:
+            self.release(connection)
+
+    def interrupt_all(self) -> None:
+        """Abort the statements running on the writer and on every checked-out reader."""
+
+        with self._lock:
+            busy = list(self._in_use)
+        self.writer.interrupt()
+        for connection in busy:
+            connection.interrupt()
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            connection.close()
+        self.writer.close()
+
+
+def _preview_row(row: Sequence[object], start: int) -> Tuple[object, ...]:
+    """Rebuild cell values from the ``(value, length)`` pairs of ``_preview_projection``."""
+
+    values = tuple(row[start::2])
+    sizes = row[start + 1::2]
+    if not any(sizes):
+        return values
+    return tuple(
+        value if size is None else _truncated(value, size) for value, size in zip(values, sizes)
+    )
+
+
+def _truncated(head: object, size: int) -> object:
+    if head is None:
+        return TruncatedValue(b"", size)
+    if isinstance(head, str) and len(head) < PREVIEW_VALUE_LIMIT:
+        # Over the limit in bytes but not in characters: the head is the whole value.
+        return head
+    return TruncatedValue(head, size)
+
+
+def _has_numeric_affinity(declared_type: str) -> bool:
+    """Return True if a column's declared type gives it INTEGER or REAL affinity.
+
+    Such columns can still hold text that does not look like a number, but
+    in practice they never hold large values.
+    """
+
+    declared = declared_type.upper()
+    if "INT" in declared:
+        return True
+    if not declared or any(name in declared for name in ("CHAR", "CLOB", "TEXT", "BLOB")):
+        return False
+    return any(name in declared for name in ("REAL", "FLOA", "DOUB"))
+
+
+@contextmanager
+def interrupt_when_cancelled(
+    connection: sqlite3.Connection, is_cancelled: Optional[Callable[[], bool]]
+) -> Iterator[sqlite3.Connection]:
+    """Abort statements on ``connection`` with "interrupted" once ``is_cancelled`` returns True.
+
+    Unlike checks between batches, this also stops a statement that is still
+    sorting or scanning before it returns its first row.
+    """
+
+    _set_cancel_handler(connection, is_cancelled)
+    try:
+        yield connection
+    finally:
+        if is_cancelled is not None:
+            connection.set_progress_handler(None, 0)
+
+
+def _set_cancel_handler(connection: sqlite3.Connection, is_cancelled: Optional[Callable[[], bool]]) -> None:
+    if is_cancelled is not None:
+        connection.set_progress_handler(lambda: 1 if is_cancelled() else 0, CANCEL_CHECK_STEPS)
+
+
+def quote_identifier(identifier: str) -> str:
+    """Return ``identifier`` as a double-quoted SQL identifier."""
+
+    return '"' + identifier.replace('"', '""') + '"'
 
 
 class DatabaseService:
@@ -39,93 +534,869 @@ class DatabaseService:
 
     def __init__(self) -> None:
         self._connection: Optional[sqlite3.Connection] = None
+        self._pool: Optional[ConnectionPool] = None
+        self._query_connection: Optional[sqlite3.Connection] = None
         self._path: Optional[str] = None
+        self._options = OpenOptions()
+        self._row_counts: Dict[object, Tuple[Tuple[int, int, int], int]] = {}
+        self._query_cache: Optional[QueryCache] = None
+        self.catalog = SchemaCatalog(self.reading)
+        self.query_stats: Deque[QueryStats] = deque(maxlen=QUERY_STATS_HISTORY)
+        self.performance_log: Optional[PerformanceLog] = None
+        self.search_index: Optional[SearchIndex] = None
+        self.trace_statements = False
+        self.result_budget_bytes = RESULT_MEMORY_BUDGET
 
     @property
     def path(self) -> Optional[str]:
         return self._path
 
-    def open(self, database_path: str | Path) -> None:
+    @property
+    def options(self) -> OpenOptions:
+        return self._options
+
+    @property
+    def query_cache(self) -> Optional[QueryCache]:
+        return self._query_cache
+
+    def enable_query_cache(self, budget_bytes: Optional[int]) -> None:
+        """Enable the read-query result cache with a memory budget, or disable it with None."""
+
+        if budget_bytes is None:
+            self._query_cache = None
+        elif self._query_cache is None:
+            self._query_cache = QueryCache(budget_bytes)
+        else:
+            self._query_cache.budget_bytes = budget_bytes
+
+    def open(self, database_path: str | Path, options: Optional[OpenOptions] = None) -> None:
         """Open a SQLite database, closing any previous connection."""
 
         path = Path(database_path).expanduser().resolve()
         if not path.exists():
             raise DatabaseError(f"Database file not found: {path}")
+        options = options or OpenOptions()
 
         self.close()
 
         try:
-            conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            conn = sqlite3.connect(options.uri(path), uri=True, check_same_thread=False, isolation_level=None)
             conn.row_factory = sqlite3.Row
             conn.execute("PRAGMA foreign_keys = ON")
+            self._apply_pragmas(conn, options)
+            if options.query_only:
+                conn.execute("PRAGMA query_only = ON")
         except sqlite3.Error as exc:
             raise DatabaseError(f"Failed to open database: {exc}") from exc
 
+        reader_uri = options.uri(path, read_only=True)
         self._connection = conn
+        self._pool = ConnectionPool(conn, lambda: self._open_reader(reader_uri, options))
+        self._options = options
         self._path = str(path)
 
+    def _open_reader(self, uri: str, options: OpenOptions) -> sqlite3.Connection:
+        try:
+            reader = sqlite3.connect(uri, uri=True, check_same_thread=False, isolation_level=None)
+            reader.row_factory = sqlite3.Row
+            reader.execute("PRAGMA query_only = ON")
+            self._apply_pragmas(reader, options)
+        except sqlite3.Error as exc:
+            raise DatabaseError(f"Failed to open read connection: {exc}") from exc
+        return reader
+
+    def _apply_pragmas(self, connection: sqlite3.Connection, options: OpenOptions) -> None:
+        for statement in options.pragmas():
+            connection.execute(statement).fetchall()
+
+    def describe_settings(self) -> str:
+        """Summarise the effective connection settings, e.g. for the status bar."""
+
+        connection = self._ensure_connection()
+        try:
+            pragma = {
+                name: connection.execute(f"PRAGMA {name}").fetchone()[0]
+                for name in ("journal_mode", "mmap_size", "cache_size", "temp_store", "query_only")
+            }
+        except sqlite3.Error as exc:
+            raise DatabaseError(str(exc)) from exc
+
+        cache_size = int(pragma["cache_size"])
+        page_size = 0 if cache_size < 0 else int(connection.execute("PRAGMA page_size").fetchone()[0])
+        cache_bytes = -cache_size * 1024 if cache_size < 0 else cache_size * page_size
+        parts = [
+            "immutable" if self._options.immutable else "read-only" if self._options.read_only else "read-write",
+            f"journal {str(pragma['journal_mode']).lower()}",
+            f"mmap {int(pragma['mmap_size']) / 1048576:.0f} MiB",
+            f"cache {cache_bytes / 1048576:.1f} MiB",
+        ]
+        if int(pragma["temp_store"]) == 2:
+            parts.append("temp in memory")
+        if int(pragma["query_only"]):
+            parts.append("query-only")
+        return " · ".join(parts)
+
     def close(self) -> None:
         """Close the active database connection if present."""
 
-        if self._connection is not None:
-            self._connection.close()
+        if self._pool is not None:
+            self._pool.close()
+        if self.search_index is not None:
+            self.search_index.close()
         self._connection = None
+        self._pool = None
         self._path = None
+        self._options = OpenOptions()
+        self._row_counts.clear()
+        self.catalog.invalidate()
+        if self._query_cache is not None:
+            self._query_cache.clear()
 
     def list_tables(self) -> List[str]:
         """Return user tables ordered alphabetically."""
 
-        rows = self._execute(
-            "SELECT name FROM sqlite_master WHERE type IN ('table', 'view') "
-            "AND name NOT LIKE 'sqlite_%' ORDER BY lower(name)"
+        return self.catalog.tables()
+
+    def get_table_preview(
+        self,
+        table_name: str,
+        limit: int = DEFAULT_ROW_LIMIT,
+        offset: int = 0,
+        *,
+        after: Optional[Sequence[object]] = None,
+        before: Optional[Sequence[object]] = None,
+        last: bool = False,
+        exact_count: bool = True,
+        row_filter: Optional[PreviewFilter] = None,
+        sort: Optional[PreviewSort] = None,
+    ) -> QueryResult:
+        """Return one page of the given table.
+
+        Tables with a rowid (or the primary key of a WITHOUT ROWID table) are
+        paged by seeking on that key: pass the last key of the current page
+        as ``after`` for the next page, the first key as ``before`` for the
+        previous page, or ``last=True`` for the final page. The keys of the
+        returned rows are available in ``QueryResult.row_keys``. Views and
+        other key-less objects fall back to ``LIMIT``/``OFFSET`` paging.
+
+        With ``exact_count=False`` the (potentially slow) ``COUNT(*)`` is
+        skipped and ``row_count`` is only filled from the row-count cache.
+
+        ``row_filter`` restricts the page (and ``row_count``) to matching
+        rows. It is evaluated with ``LIKE`` in SQL, or answered from the
+        ``search_index`` when an up-to-date full-text index of the table
+        exists.
+
+        ``sort`` orders the rows by a column in SQL. Keyset paging then seeks
+        on ``(column, key)``; each entry of ``row_keys`` starts with the sort
+        value, so pass them back unchanged together with the same ``sort``.
+        Sorted pages always filter with ``LIKE``: the full-text index yields
+        rows in rowid order only.
+
+        TEXT and BLOB values longer than ``PREVIEW_VALUE_LIMIT`` are returned
+        as ``TruncatedValue``s, so large values never leave SQLite in full.
+        """
+
+        quoted_table = self._quote_identifier(table_name)
+        key_columns = self.get_page_key_columns(table_name)
+        if row_filter is not None and not row_filter.active:
+            row_filter = None
+
+        if key_columns is None:
+            if after is not None or before is not None:
+                raise DatabaseError(f"Table '{table_name}' does not support keyset pagination.")
+            return self._get_offset_page(table_name, limit, offset, last, exact_count, row_filter, sort)
+        if sort is not None:
+            return self._get_sorted_page(
+                table_name, key_columns, limit, offset, after, before, last, exact_count, row_filter, sort
+            )
+
+        key_exprs = [self._quote_identifier(column) for column in key_columns]
+        key_tuple = key_exprs[0] if len(key_exprs) == 1 else f"({', '.join(key_exprs)})"
+        placeholders = ", ".join("?" for _ in key_exprs)
+        key_param = f"({placeholders})" if len(key_exprs) > 1 else placeholders
+        backwards = before is not None or last
+
+        columns, projection = self._preview_projection(table_name)
+        sql = f"SELECT {', '.join(key_exprs)}, {projection} FROM {quoted_table}"
+        conditions: List[str] = []
+        parameters: Tuple[object, ...] = ()
+        page_offset = offset
+        match = self._search_match(table_name, key_columns, row_filter)
+        if match is not None:
+            # The full-text index pages through the matching rowids itself.
+            keys = self.search_index.keys(
+                table_name, match, limit + 1, after=after, before=before, backwards=backwards, offset=offset
+            )
+            conditions.append(f"{key_exprs[0]} IN ({', '.join('?' for _ in keys)})")
+            parameters = tuple(keys)
+            page_offset = 0
+        else:
+            if after is not None:
+                conditions.append(f"{key_tuple} > {key_param}")
+                parameters = tuple(after)
+            elif before is not None:
+                conditions.append(f"{key_tuple} < {key_param}")
+                parameters = tuple(before)
+            if row_filter is not None:
+                condition, filter_parameters = self._filter_condition(table_name, row_filter)
+                conditions.append(condition)
+                parameters += filter_parameters
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        direction = "DESC" if backwards else "ASC"
+        sql += " ORDER BY " + ", ".join(f"{expr} {direction}" for expr in key_exprs) + " LIMIT ? OFFSET ?"
+
+        try:
+            with self.reading() as connection:
+                rows = connection.execute(sql, parameters + (limit + 1, page_offset)).fetchmany(limit + 1)
+        except sqlite3.Error as exc:
+            raise DatabaseError(f"Failed to fetch table '{table_name}': {exc}") from exc
+
+        key_count = len(key_exprs)
+        more = len(rows) > limit
+        rows = rows[:limit]
+        if backwards:
+            rows.reverse()
+            has_previous, truncated = more, before is not None
+        else:
+            has_previous, truncated = after is not None or offset > 0, more
+
+        if exact_count:
+            row_count = self._get_table_row_count(table_name, row_filter)
+        else:
+            row_count = self.cached_row_count(table_name, row_filter)
+        return QueryResult(
+            columns=columns,
+            rows=[_preview_row(row, key_count) for row in rows],
+            truncated=truncated,
+            row_count=row_count,
+            row_keys=[tuple(row)[:key_count] for row in rows],
+            has_previous=has_previous,
         )
-        return [row[0] for row in rows]
 
-    def get_table_preview(self, table_name: str, limit: int = DEFAULT_ROW_LIMIT, offset: int = 0) -> QueryResult:
-        """Return a preview of the given table."""
+    def _get_offset_page(
+        self,
+        table_name: str,
+        limit: int,
+        offset: int,
+        last: bool,
+        exact_count: bool,
+        row_filter: Optional[PreviewFilter] = None,
+        sort: Optional[PreviewSort] = None,
+    ) -> QueryResult:
+        """Page through a key-less object (e.g. a view) using LIMIT/OFFSET."""
 
-        connection = self._ensure_connection()
         quoted_table = self._quote_identifier(table_name)
+        if exact_count or last:
+            row_count = self._get_table_row_count(table_name, row_filter)
+        else:
+            row_count = self.cached_row_count(table_name, row_filter)
+        if last and row_count:
+            offset = (row_count - 1) // limit * limit
 
+        columns, projection = self._preview_projection(table_name)
+        sql = f"SELECT {projection} FROM {quoted_table}"
+        parameters: Tuple[object, ...] = ()
+        if row_filter is not None:
+            condition, parameters = self._filter_condition(table_name, row_filter)
+            sql += f" WHERE {condition}"
+        if sort is not None:
+            sql += f" ORDER BY {self._sort_column(table_name, sort)} {'DESC' if sort.descending else 'ASC'}"
         try:
-            cursor = connection.execute(
-                f"SELECT * FROM {quoted_table} LIMIT ? OFFSET ?",
-                (limit + 1, offset),
-            )
-            rows = cursor.fetchmany(limit + 1)
+            with self.reading() as connection:
+                rows = connection.execute(f"{sql} LIMIT ? OFFSET ?", parameters + (limit + 1, offset)).fetchmany(
+                    limit + 1
+                )
         except sqlite3.Error as exc:
             raise DatabaseError(f"Failed to fetch table '{table_name}': {exc}") from exc
 
-        columns = [description[0] for description in cursor.description or []]
         truncated = len(rows) > limit
-        trimmed_rows = [tuple(row) for row in rows[:limit]]
-        row_count = self._get_table_row_count(table_name)
-        return QueryResult(columns=columns, rows=trimmed_rows, truncated=truncated, row_count=row_count)
+        return QueryResult(
+            columns=columns,
+            rows=[_preview_row(row, 0) for row in rows[:limit]],
+            truncated=truncated,
+            row_count=row_count,
+            has_previous=offset > 0,
+            offset=offset,
+        )
+
+    def _get_sorted_page(
+        self,
+        table_name: str,
+        key_columns: Sequence[str],
+        limit: int,
+        offset: int,
+        after: Optional[Sequence[object]],
+        before: Optional[Sequence[object]],
+        last: bool,
+        exact_count: bool,
+        row_filter: Optional[PreviewFilter],
+        sort: PreviewSort,
+    ) -> QueryResult:
+        """Keyset-page a table ordered by ``(sort column, key)``.
+
+        SQLite sorts NULLs first in ascending and last in descending order.
+        Seeking past a position is split into at most two index-friendly
+        range scans: the non-NULL values and the NULL block.
+        """
+
+        quoted_table = self._quote_identifier(table_name)
+        column = self._sort_column(table_name, sort)
+        key_exprs = [self._quote_identifier(key) for key in key_columns]
+        key_tuple = key_exprs[0] if len(key_exprs) == 1 else f"({', '.join(key_exprs)})"
+        key_param = ", ".join("?" for _ in key_exprs)
+        key_param = f"({key_param})" if len(key_exprs) > 1 else key_param
+        backwards = before is not None or last
+        # The direction rows are read in; previous/last pages are read in reverse and flipped.
+        descending = sort.descending != backwards
+        later = "<" if descending else ">"
+        direction = "DESC" if descending else "ASC"
+
+        segments: List[Tuple[str, Tuple[object, ...]]]
+        position = after if after is not None else before
+        if position is None:
+            segments = [("1", ())]
+        else:
+            value, keys = position[0], tuple(position[1:])
+            if value is None:
+                nulls = (f"{column} IS NULL AND {key_tuple} {later} {key_param}", keys)
+                segments = [nulls] if descending else [nulls, (f"{column} IS NOT NULL", ())]
+            else:
+                bound = "<=" if descending else ">="
+                values = (
+                    f"{column} {bound} ? AND ({column} {later} ? OR {key_tuple} {later} {key_param})",
+                    (value, value) + keys,
+                )
+                segments = [values, (f"{column} IS NULL", ())] if descending else [values]
+
+        filter_condition, filter_parameters = "", ()
+        if row_filter is not None:
+            filter_condition, filter_parameters = self._filter_condition(table_name, row_filter)
+            filter_condition = f" AND {filter_condition}"
+        order = ", ".join(f"{expr} {direction}" for expr in [column, *key_exprs])
+        columns, projection = self._preview_projection(table_name)
+        select = f"SELECT {column}, {', '.join(key_exprs)}, {projection} FROM {quoted_table}"
+
+        rows: List[sqlite3.Row] = []
+        try:
+            with self.reading() as connection:
+                for condition, parameters in segments:
+                    cursor = connection.execute(
+                        f"{select} WHERE ({condition}){filter_condition} ORDER BY {order} LIMIT ? OFFSET ?",
+                        parameters + filter_parameters + (limit + 1 - len(rows), offset if not rows else 0),
+                    )
+                    rows.extend(cursor.fetchall())
+                    if len(rows) > limit:
+                        break
+        except sqlite3.Error as exc:
+            raise DatabaseError(f"Failed to fetch table '{table_name}': {exc}") from exc
+
+        seek_count = 1 + len(key_exprs)
+        more = len(rows) > limit
+        rows = rows[:limit]
+        if backwards:
+            rows.reverse()
+            has_previous, truncated = more, before is not None
+        else:
+            has_previous, truncated = after is not None or offset > 0, more
+
+        if exact_count:
+            row_count = self._get_table_row_count(table_name, row_filter)
+        else:
+            row_count = self.cached_row_count(table_name, row_filter)
+        return QueryResult(
+            columns=columns,
+            rows=[_preview_row(row, seek_count) for row in rows],
+            truncated=truncated,
+            row_count=row_count,
+            row_keys=[tuple(row)[:seek_count] for row in rows],
+            has_previous=has_previous,
+        )
+
+    def _preview_projection(self, table_name: str) -> Tuple[List[str], str]:
+        """Return the column names of a preview page and the select list fetching them.
+
+        Every column is followed by its size in bytes if that exceeds
+        ``PREVIEW_VALUE_LIMIT`` (else NULL); ``_preview_row`` turns the pairs
+        back into cell values. A large BLOB projects NULL: ``length`` and
+        ``typeof`` of a BLOB are answered from the record header, so its
+        bytes are never read. Large TEXT is cut with ``substr`` and measured
+        as a BLOB, because ``length`` of TEXT counts characters one by one.
+        Columns with INTEGER or REAL affinity are selected unchanged to spare
+        the check on every cell.
+        """
+
+        if self.catalog.get(table_name) is None:
+            raise DatabaseError(f"No such table: {table_name}")
+        # Generated columns are part of SELECT *, hidden virtual-table columns are not.
+        visible = [column for column in self.catalog.columns(table_name) if column.hidden != 1]
+        limit = PREVIEW_VALUE_LIMIT
+        parts = []
+        for column in visible:
+            quoted = self._quote_identifier(column.name)
+            if _has_numeric_affinity(column.type):
+                parts.append(f"{quoted}, NULL")
+                continue
+            # CAST would load a BLOB; length() of a BLOB does not.
+            size = f"CASE WHEN typeof({quoted}) = 'blob' THEN length({quoted}) ELSE length(CAST({quoted} AS BLOB)) END"
+            parts.append(
+                f"CASE WHEN typeof({quoted}) = 'blob' THEN CASE WHEN length({quoted}) <= {limit} THEN {quoted} END "
+                f"WHEN length(CAST({quoted} AS BLOB)) > {limit} THEN substr({quoted}, 1, {limit}) ELSE {quoted} END, "
+                f"nullif(max({size}, {limit}), {limit})"
+            )
+        return [column.name for column in visible], ", ".join(parts)
+
+    def read_value(
+        self,
+        table_name: str,
+        column: str,
+        row_key: Sequence[object],
+        progress: Optional[Callable[[int], None]] = None,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+    ) -> object:
+        """Return the complete value of one preview cell.
+
+        ``row_key`` is the row's entry of ``QueryResult.row_keys``. BLOBs of
+        rowid tables are read incrementally with ``Connection.blobopen``
+        (Python 3.11+) in ``BLOB_CHUNK_SIZE`` pieces, reporting the bytes
+        read so far to ``progress``; other values are selected by key.
+        """
+
+        key_columns = self.get_page_key_columns(table_name)
+        if key_columns is None:
+            raise DatabaseError(f"'{table_name}' has no row key, so only the start of its values can be shown.")
+        if column not in self._preview_projection(table_name)[0]:
+            raise DatabaseError(f"No such column in '{table_name}': {column}")
+        key = tuple(row_key)[-len(key_columns):]
+        quoted = self._quote_identifier(column)
+        where = " AND ".join(f"{self._quote_identifier(name)} = ?" for name in key_columns)
+        source = f"FROM {self._quote_identifier(table_name)} WHERE {where}"
+        obj = self.catalog.get(table_name)
+        incremental = obj is not None and obj.type == "table" and not obj.without_rowid
+        try:
+            with self.reading() as connection:
+                row = connection.execute(f"SELECT typeof({quoted}) {source}", key).fetchone()
+                if row is None:
+                    raise DatabaseError(f"The row of '{table_name}' no longer exists.")
+                if row[0] == "blob" and incremental and hasattr(connection, "blobopen"):
+                    return self._read_blob(connection, table_name, column, key[0], progress, is_cancelled)
+                return connection.execute(f"SELECT {quoted} {source}", key).fetchone()[0]
+        except sqlite3.Error as exc:
+            raise DatabaseError(f"Failed to read {table_name}.{column}: {exc}") from exc
+
+    def _read_blob(
+        self,
+        connection: sqlite3.Connection,
+        table_name: str,
+        column: str,
+        rowid: object,
+        progress: Optional[Callable[[int], None]],
+        is_cancelled: Optional[Callable[[], bool]],
+    ) -> bytes:
+        chunks: List[bytes] = []
+        read = 0
+        with connection.blobopen(table_name, column, rowid, readonly=True) as blob:
+            size = len(blob)
+            while read < size:
+                if is_cancelled is not None and is_cancelled():
+                    raise QueryCancelledError("Reading cancelled.")
+                chunk = blob.read(BLOB_CHUNK_SIZE)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                read += len(chunk)
+                if progress is not None:
+                    progress(read)
+        return b"".join(chunks)
+
+    def _sort_column(self, table_name: str, sort: PreviewSort) -> str:
+        if sort.column not in self.get_table_columns(table_name):
+            raise DatabaseError(f"No such column in '{table_name}': {sort.column}")
+        return self._quote_identifier(sort.column)
+
+    def sort_needs_temp_btree(self, table_name: str, sort: PreviewSort) -> bool:
+        """Return True if SQLite has to sort the whole table for every page of ``sort``.
+
+        That is the case unless an index delivers the rows in order.
+        """
+
+        key_columns = self.get_page_key_columns(table_name) or []
+        direction = "DESC" if sort.descending else "ASC"
+        order = ", ".join(
+            f"{expr} {direction}"
+            for expr in [self._sort_column(table_name, sort), *map(self._quote_identifier, key_columns)]
+        )
+        plan = self.explain_query_plan(f"SELECT * FROM {self._quote_identifier(table_name)} ORDER BY {order}")
+        return any(node.kind == TEMP_BTREE for root in plan for node in root.walk())
+
+    def get_page_key_columns(self, table_name: str) -> Optional[List[str]]:
+        """Return the columns that uniquely order rows of a table, if any.
+
+        Rowid tables use an unshadowed rowid alias; WITHOUT ROWID tables use
+        their primary key columns. Views and unknown objects return None.
+        """
+
+        obj = self.catalog.get(table_name)
+        if obj is None or obj.type != "table":
+            return None
+
+        columns = self.catalog.columns(table_name)
+        column_names = {column.name.lower() for column in columns}
+        primary_key = sorted((column for column in columns if column.primary_key > 0), key=lambda c: c.primary_key)
+
+        if obj.without_rowid:
+            return [column.name for column in primary_key] or None
+        for alias in _ROWID_ALIASES:
+            if alias not in column_names:
+                return [alias]
+        if len(primary_key) == 1 and primary_key[0].type.upper() == "INTEGER":
+            return [primary_key[0].name]
+        return None
+
+    def _filter_condition(self, table_name: str, row_filter: PreviewFilter) -> Tuple[str, Tuple[object, ...]]:
+        """Translate a preview filter into a ``LIKE`` condition and its parameters."""
+
+        columns = self.get_table_columns(table_name)
+        known = set(columns)
+        conditions: List[str] = []
+        parameters: List[object] = []
+
+        def contains(column: str, text: str) -> str:
+            escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            parameters.append(f"%{escaped}%")
+            return f"{self._quote_identifier(column)} LIKE ? ESCAPE '\\'"
+
+        if row_filter.text and columns:
+            conditions.append("(" + " OR ".join(contains(column, row_filter.text) for column in columns) + ")")
+        for column, text in row_filter.columns:
+            if column not in known:
+                raise DatabaseError(f"No such column in '{table_name}': {column}")
+            conditions.append(contains(column, text))
+        return " AND ".join(conditions) or "1", tuple(parameters)
+
+    def _search_match(
+        self, table_name: str, key_columns: Sequence[str], row_filter: Optional[PreviewFilter]
+    ) -> Optional[str]:
+        """Return the full-text query answering ``row_filter``, if the search index can."""
+
+        if row_filter is None or self.search_index is None or len(key_columns) != 1:
+            return None
+        return self.search_index.match_query(table_name, row_filter)
 
     def get_table_schema(self, table_name: str) -> str:
         """Return the CREATE statement for the table if available."""
 
-        rows = self._execute(
-            "SELECT sql FROM sqlite_master WHERE name = ? AND type IN ('table', 'view')",
-            (table_name,),
-        )
-        if not rows or rows[0][0] is None:
+        obj = self.catalog.get(table_name)
+        if obj is None or obj.type not in ("table", "view") or obj.sql is None:
             return "Schema information not found."
-        return rows[0][0]
+        return obj.sql
+
+    def get_table_columns(self, table_name: str) -> List[str]:
+        """Return the column names of a table, or an empty list if it does not exist."""
+
+        if self.catalog.get(table_name) is None:
+            return []
+        return [column.name for column in self.catalog.columns(table_name) if not column.hidden]
+
+    def bulk_insert(
+        self,
+        table_name: str,
+        columns: Sequence[str],
+        rows: Iterable[Sequence[object]],
+        column_types: Optional[Sequence[str]] = None,
+        batch_size: int = INSERT_BATCH_SIZE,
+        fast: bool = False,
+        defer_indexes: bool = True,
+        progress: Optional[Callable[[int], None]] = None,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+    ) -> int:
+        """Insert ``rows`` into a table in large ``executemany`` batches.
+
+        Everything runs in a single transaction that is rolled back on error
+        or cancellation. When ``column_types`` is given the table is created
+        if missing. ``defer_indexes`` drops the table's non-unique indexes for
+        the load and rebuilds them afterwards; ``fast`` temporarily sets
+        ``PRAGMA synchronous=OFF`` and an in-memory rollback journal.
+        ``is_cancelled`` is also polled inside long statements such as the
+        index rebuild. Returns the number of inserted rows.
+        """
+
+        connection = self._ensure_connection()
+        if connection.in_transaction:
+            raise DatabaseError("Commit or roll back the open transaction before importing.")
+        if not columns:
+            raise DatabaseError("No columns to import.")
+
+        quoted_table = self._quote_identifier(table_name)
+        column_list = ", ".join(self._quote_identifier(column) for column in columns)
+        insert_sql = (
+            f"INSERT INTO {quoted_table} ({column_list}) "
+            f"VALUES ({', '.join('?' for _ in columns)})"
+        )
+
+        restore: List[str] = []
+        try:
+            if fast:
+                synchronous = connection.execute("PRAGMA synchronous").fetchone()[0]
+                journal_mode = connection.execute("PRAGMA journal_mode").fetchone()[0]
+                restore.append(f"PRAGMA synchronous = {int(synchronous)}")
+                connection.execute("PRAGMA synchronous = OFF")
+                if str(journal_mode).lower() not in ("wal", "memory", "off"):
+                    restore.append(f"PRAGMA journal_mode = {journal_mode}")
+                    connection.execute("PRAGMA journal_mode = MEMORY")
+
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                with interrupt_when_cancelled(connection, is_cancelled):
+                    if column_types is not None:
+                        definitions = ", ".join(
+                            f"{self._quote_identifier(column)} {kind}" for column, kind in zip(columns, column_types)
+                        )
+                        connection.execute(f"CREATE TABLE IF NOT EXISTS {quoted_table} ({definitions})")
+
+                    deferred = self._drop_secondary_indexes(table_name) if defer_indexes else []
+                    inserted = 0
+                    iterator = iter(rows)
+                    while True:
+                        if is_cancelled is not None and is_cancelled():
+                            raise QueryCancelledError("Import cancelled.")
+                        batch = list(itertools.islice(iterator, batch_size))
+                        if not batch:
+                            break
+                        connection.executemany(insert_sql, batch)
+                        inserted += len(batch)
+                        if progress is not None:
+                            progress(inserted)
+                    for index_sql in deferred:
+                        connection.execute(index_sql)
+                connection.execute("COMMIT")
+            except BaseException:
+                if connection.in_transaction:
+                    connection.execute("ROLLBACK")
+                raise
+        except sqlite3.Error as exc:
+            raise self._query_error(exc) from exc
+        finally:
+            for statement in restore:
+                try:
+                    connection.execute(statement)
+                except sqlite3.Error:
+                    pass
+        return inserted
+
+    def _drop_secondary_indexes(self, table_name: str) -> List[str]:
+        """Drop non-unique, explicitly created indexes of a table; return their SQL."""
+
+        if self.catalog.get(table_name) is None:
+            return []
+        deferred = [index for index in self.catalog.indexes(table_name) if not index.unique and index.sql]
+        for index in deferred:
+            self._ensure_connection().execute(f"DROP INDEX {self._quote_identifier(index.name)}")
+        return [index.sql for index in deferred]
+
+    def execute_query(
+        self,
+        sql: str,
+        limit: Optional[int] = None,
+        progress: Optional[Callable[[int], None]] = None,
+        spill: bool = False,
+    ) -> QueryResult:
+        """Execute a SQL statement and return results.
 
-    def execute_query(self, sql: str, limit: int = QUERY_ROW_LIMIT) -> QueryResult:
-        """Execute a SQL statement and return results."""
+        Rows are fetched in batches into ``CompactRows`` until they hold
+        ``result_budget_bytes`` of memory (or ``limit`` rows, if given); the
+        result is then marked ``truncated``. With ``spill`` a result that
+        outgrows the memory budget is instead fetched completely into
+        ``SpilledRows``, a temporary SQLite file that is read back by
+        position. ``progress`` (if given) is called with the number of rows
+        fetched so far after each batch. The statement may be aborted from
+        another thread with ``interrupt_query()``.
+
+        SELECT/WITH statements run on a pooled read-only connection unless the
+        writer has an open transaction or they modify data (``WITH ...
+        INSERT``); reads that turn out to need the writer (e.g. temp tables)
+        are retried on it.
+
+        When the query cache is enabled, read statements are answered from it
+        while the database is unchanged; such results have ``from_cache`` set.
+
+        Every call is instrumented: the ``QueryStats`` are attached to the
+        result, kept in ``query_stats`` and appended to ``performance_log``
+        if one is set. Failed and cancelled statements are recorded too.
+        """
 
         self._ensure_connection()
         sql = sql.strip()
         if not sql:
             raise DatabaseError("Query is empty.")
 
+        cache_key = cache_token = None
+        normalized = self._cacheable_sql(sql) if self._query_cache is not None else None
+        if normalized is not None:
+            cache_token = self._change_token()
+        if cache_token is not None:
+            cache_key = (normalized, limit, self.result_budget_bytes, spill)
+            cached = self._query_cache.get(cache_key, cache_token)
+            if cached is not None:
+                stats = QueryStats(sql=sql, database=self._path, rows=len(cached.rows), from_cache=True)
+                self._record_stats(stats)
+                return dataclasses.replace(cached, from_cache=True, stats=stats)
+
+        writes = self.modifies_data(sql)
+        use_reader = first_keyword(sql) in _READER_KEYWORDS and not writes
+        with self.reading() if use_reader else nullcontext(self._ensure_connection()) as connection:
+            probe = StatementProbe(connection, sql, self._path, self.trace_statements)
+            try:
+                self._query_connection = connection
+                try:
+                    cursor = probe.install().execute(sql)
+                except sqlite3.OperationalError as exc:
+                    if connection is self._connection or not self._needs_writer(exc):
+                        raise
+                    probe.remove()
+                    connection = self._query_connection = self._ensure_connection()
+                    probe = StatementProbe(connection, sql, self._path, self.trace_statements)
+                    cursor = probe.install().execute(sql)
+                result = self._collect_result(cursor, limit, progress, spill)
+                rows = result.affected_rows or 0 if result.is_write_operation else len(result.rows)
+                result.stats = probe.finish(rows)
+            except sqlite3.Error as exc:
+                error = self._query_error(exc)
+                status = "cancelled" if isinstance(error, QueryCancelledError) else "error"
+                self._record_stats(probe.finish(status=status, error=str(error)))
+                raise error from exc
+            finally:
+                probe.remove()
+                self._query_connection = None
+        self._record_stats(result.stats)
+
+        if result.is_write_operation or writes:
+            if self._query_cache is not None:
+                self._query_cache.clear()
+        elif cache_key is not None and self._change_token() == cache_token and not isinstance(result.rows, SpilledRows):
+            # Spilled results own a temporary file; they are not shared through the cache.
+            self._query_cache.put(cache_key, cache_token, result)
+        return result
+
+    def execute_script(
+        self,
+        sql: str,
+        limit: Optional[int] = None,
+        transaction: bool = True,
+        progress: Optional[Callable[[StatementResult], None]] = None,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+    ) -> ScriptResult:
+        """Run every statement of a script in order on the writer connection.
+
+        ``progress`` receives each ``StatementResult`` as soon as its
+        statement has run, including the one that failed. Execution stops at
+        the first error or cancellation and raises ``DatabaseError`` /
+        ``QueryCancelledError``.
+
+        With ``transaction`` the script runs inside one savepoint, so it
+        commits once and a failure rolls back all of its changes (also inside
+        a transaction the user already opened). Scripts that manage
+        transactions themselves (BEGIN/COMMIT/SAVEPOINT, VACUUM, ATTACH) run
+        unwrapped instead; a failure then only rolls back a transaction the
+        script opened. ``ScriptResult.transaction`` tells which mode was used.
+
+        Only the last result set is kept, truncated like ``execute_query``.
+        """
+
+        connection = self._ensure_connection()
+        statements = split_statements(sql)
+        if not statements:
+            raise DatabaseError("Query is empty.")
+
+        keywords = [first_keyword(statement) for statement in statements]
+        wrap = transaction and not any(keyword in _UNWRAPPABLE_KEYWORDS for keyword in keywords)
+        writes = any(keyword not in _READ_KEYWORDS for keyword in keywords)
+        started_in_transaction = connection.in_transaction
+        script = ScriptResult([], transaction=wrap)
         try:
-            cursor = self._connection.execute(sql)
+            if wrap:
+                connection.execute(f"SAVEPOINT {_SCRIPT_SAVEPOINT}")
+            for number, statement in enumerate(statements, 1):
+                item = StatementResult(number, statement)
+                if is_cancelled is not None and is_cancelled():
+                    item.status = "cancelled"
+                    self._report_statement(script, item, progress)
+                    raise QueryCancelledError(
+                        f"Script cancelled before statement {number}. "
+                        + self._rollback_script(connection, wrap, started_in_transaction)
+                    )
+                probe = StatementProbe(connection, statement, self._path, self.trace_statements)
+                try:
+                    self._query_connection = connection
+                    result = self._collect_result(probe.install().execute(statement), limit, None)
+                except sqlite3.Error as exc:
+                    error = self._query_error(exc)
+                    item.status = "cancelled" if isinstance(error, QueryCancelledError) else "error"
+                    item.error = str(exc)
+                    item.stats = probe.finish(status=item.status, error=str(error))
+                    self._record_stats(item.stats)
+                    self._report_statement(script, item, progress)
+                    rollback = self._rollback_script(connection, wrap, started_in_transaction)
+                    if isinstance(error, QueryCancelledError):
+                        raise QueryCancelledError(f"Script cancelled at statement {number}. {rollback}") from exc
+                    raise DatabaseError(f"Statement {number} failed: {exc}. {rollback}") from exc
+                finally:
+                    probe.remove()
+                    self._query_connection = None
+                if result.is_write_operation:
+                    item.affected_rows = result.affected_rows
+                else:
+                    item.rows = len(result.rows)
+                    script.result, script.result_sql = result, statement
+                item.stats = result.stats = probe.finish(item.affected_rows or item.rows)
+                self._record_stats(item.stats)
+                self._report_statement(script, item, progress)
+            if wrap:
+                try:
+                    connection.execute(f"RELEASE {_SCRIPT_SAVEPOINT}")
+                except sqlite3.Error as exc:
+                    rollback = self._rollback_script(connection, wrap, started_in_transaction)
+                    raise DatabaseError(f"Failed to commit script: {exc}. {rollback}") from exc
+        finally:
+            if writes and self._query_cache is not None:
+                self._query_cache.clear()
+        return script
+
+    def _report_statement(
+        self,
+        script: ScriptResult,
+        item: StatementResult,
+        progress: Optional[Callable[[StatementResult], None]],
+    ) -> None:
+        script.statements.append(item)
+        if progress is not None:
+            progress(item)
+
+    def _rollback_script(self, connection: sqlite3.Connection, savepoint: bool, started_in_transaction: bool) -> str:
+        """Undo a failed script as far as possible; return a sentence describing what happened."""
+
+        try:
+            if savepoint:
+                if connection.in_transaction:
+                    connection.execute(f"ROLLBACK TO {_SCRIPT_SAVEPOINT}")
+                    connection.execute(f"RELEASE {_SCRIPT_SAVEPOINT}")
+                # Otherwise SQLite already rolled the transaction back itself.
+                return "All changes made by the script were rolled back."
+            if connection.in_transaction and not started_in_transaction:
+                connection.execute("ROLLBACK")
+                return "The transaction opened by the script was rolled back."
         except sqlite3.Error as exc:
-            raise DatabaseError(f"Failed to execute query: {exc}") from exc
+            return f"Rolling back failed: {exc}."
+        return "Statements before it were not rolled back."
 
+    def _collect_result(
+        self,
+        cursor: sqlite3.Cursor,
+        limit: Optional[int],
+        progress: Optional[Callable[[int], None]],
+        spill: bool = False,
+    ) -> QueryResult:
         if cursor.description is None:
             # Write operation (INSERT/UPDATE/DELETE/DDL/TCL)
             affected = cursor.rowcount if cursor.rowcount >= 0 else None
@@ -137,15 +1408,311 @@ class DatabaseService:
             )
 
         columns = [description[0] for description in cursor.description]
-        rows = cursor.fetchmany(limit + 1)
-        truncated = len(rows) > limit
-        trimmed_rows = [tuple(row) for row in rows[:limit]]
-        return QueryResult(columns=columns, rows=trimmed_rows, truncated=truncated)
+        rows = CompactRows(len(columns))
+        budget = self.result_budget_bytes
+        truncated = False
+        while True:
+            # Size batches from the memory of the rows so far, so a few huge
+            # values cannot overshoot the budget by a whole batch.
+            size = min(FETCH_BATCH_SIZE, (budget - rows.nbytes) * len(rows) // max(1, rows.nbytes) + 1)
+            if limit is not None:
+                size = min(size, limit + 1 - len(rows))
+            batch = cursor.fetchmany(size)
+            if not batch:
+                break
+            if limit is not None and len(rows) + len(batch) > limit:
+                batch = batch[:limit - len(rows)]
+                truncated = True
+            rows.extend(batch)
+            if progress is not None:
+                progress(len(rows))
+            if truncated:
+                break
+            if rows.nbytes >= budget:
+                if spill and limit is None:
+                    return QueryResult(columns=columns, rows=self._spill_rows(cursor, rows, progress))
+                truncated = cursor.fetchone() is not None
+                break
+        return QueryResult(columns=columns, rows=rows, truncated=truncated, size_bytes=rows.nbytes)
+
+    def _spill_rows(
+        self,
+        cursor: sqlite3.Cursor,
+        rows: CompactRows,
+        progress: Optional[Callable[[int], None]],
+    ) -> SpilledRows:
+        """Move the rows fetched so far and the rest of the cursor into a spill file."""
+
+        try:
+            spilled = SpilledRows(rows.column_count)
+            spilled.extend(list(rows))
+        except OSError as exc:
+            raise DatabaseError(f"Failed to create a spill file: {exc}") from exc
+        while True:
+            batch = cursor.fetchmany(INSERT_BATCH_SIZE)
+            if not batch:
+                return spilled
+            spilled.extend(batch)
+            if progress is not None:
+                progress(len(spilled))
+
+    def sort_spilled_rows(
+        self,
+        rows: SpilledRows,
+        column: int,
+        descending: bool = False,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+    ) -> SpilledRows:
+        """Return ``rows`` ordered by a column, sorted inside the spill file."""
+
+        try:
+            return rows.sorted(column, descending, is_cancelled)
+        except sqlite3.Error as exc:
+            if is_cancelled is not None and is_cancelled():
+                raise QueryCancelledError("Sorting cancelled.") from exc
+            raise DatabaseError(f"Failed to sort the result: {exc}") from exc
+
+    def _record_stats(self, stats: QueryStats) -> None:
+        self.query_stats.append(stats)
+        if self.performance_log is not None:
+            try:
+                self.performance_log.append(stats)
+            except OSError:
+                # The log is diagnostic only; never fail a query because of it.
+                pass
+
+    def _needs_writer(self, exc: sqlite3.OperationalError) -> bool:
+        """Return True if a statement failed on a reader only because it needs the writer."""
+
+        message = str(exc).lower()
+        return "readonly" in message or message.startswith(("no such table", "no such function"))
+
+    def _cacheable_sql(self, sql: str) -> Optional[str]:
+        """Return the normalized cache key text for a cacheable read query, else None."""
+
+        if self.classify_query(sql) != "read" or first_keyword(sql) == "PRAGMA" or self.modifies_data(sql):
+            return None
+        normalized = normalize_sql(sql)
+        return normalized if is_cacheable_sql(normalized) else None
+
+    def iter_query(
+        self,
+        sql: str,
+        batch_size: int = FETCH_BATCH_SIZE,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+        allow_writer: bool = False,
+    ) -> Tuple[List[str], Generator[List[Tuple[object, ...]], None, None]]:
+        """Run a row-returning statement and stream its full result.
+
+        Returns the column names and a generator yielding lists of at most
+        ``batch_size`` plain tuples, without the row limit applied by
+        ``execute_query``. SELECT/WITH statements run on a pooled reader;
+        only with ``allow_writer`` are they retried on the writer if they turn
+        out to need it, because a retry repeats any write the statement does.
+        Other statements (e.g. PRAGMA) run on the writer. Once
+        ``is_cancelled`` returns True the statement is interrupted, even
+        before its first row, and ``QueryCancelledError`` is raised.
+        """
+
+        sql = sql.strip()
+        if not sql:
+            raise DatabaseError("Query is empty.")
+
+        pool = self._ensure_pool()
+        connection = pool.writer
+        if first_keyword(sql) in _READER_KEYWORDS and not connection.in_transaction:
+            connection = pool.acquire()
+        _set_cancel_handler(connection, is_cancelled)
+        cursor = connection.cursor()
+        cursor.row_factory = None
+
+        def release() -> None:
+            cursor.close()
+            if is_cancelled is not None:
+                connection.set_progress_handler(None, 0)
+            if connection is not pool.writer:
+                pool.release(connection)
+
+        try:
+            try:
+                cursor.execute(sql)
+            except sqlite3.OperationalError as exc:
+                if not allow_writer or connection is pool.writer or not self._needs_writer(exc):
+                    raise
+                release()
+                connection = pool.writer
+                _set_cancel_handler(connection, is_cancelled)
+                cursor = connection.cursor()
+                cursor.row_factory = None
+                cursor.execute(sql)
+            if cursor.description is None:
+                raise DatabaseError("Statement does not return rows.")
+        except sqlite3.Error as exc:
+            release()
+            raise self._query_error(exc) from exc
+        except DatabaseError:
+            release()
+            raise
+        columns = [description[0] for description in cursor.description]
+
+        def batches() -> Generator[List[Tuple[object, ...]], None, None]:
+            try:
+                while True:
+                    try:
+                        batch = cursor.fetchmany(batch_size)
+                    except sqlite3.Error as exc:
+                        raise self._query_error(exc) from exc
+                    if not batch:
+                        return
+                    yield batch
+            finally:
+                release()
+
+        return columns, batches()
+
+    def explain_query_plan(self, sql: str) -> List[PlanNode]:
+        """Return the ``EXPLAIN QUERY PLAN`` tree for ``sql`` without running it.
+
+        A leading ``EXPLAIN`` / ``EXPLAIN QUERY PLAN`` in ``sql`` is ignored.
+        Each SCAN/SEARCH node is resolved (through table aliases) to its table
+        and annotated with the indexes that exist on that table.
+        """
+
+        sql = _EXPLAIN_PREFIX_PATTERN.sub("", sql.strip(), count=1).strip()
+        if not sql:
+            raise DatabaseError("Query is empty.")
+
+        try:
+            with self.reading() as connection:
+                # An EXPLAIN statement is not re-prepared after a schema change, so a
+                # cached one would keep reporting the old plan: key it on the schema version.
+                version = connection.execute("PRAGMA schema_version").fetchone()[0]
+                statement = f"EXPLAIN QUERY PLAN /* schema {version} */ {sql}"
+                try:
+                    rows = connection.execute(statement).fetchall()
+                except sqlite3.OperationalError as exc:
+                    if connection is self._connection or not self._needs_writer(exc):
+                        raise
+                    rows = self._ensure_connection().execute(statement).fetchall()
+        except sqlite3.Error as exc:
+            raise DatabaseError(f"Failed to explain query: {exc}") from exc
+
+        roots = build_plan(rows)
+        aliases = table_aliases(sql)
+        for root in roots:
+            for node in root.walk():
+                if node.name is None:
+                    continue
+                for candidate in (aliases.get(node.name.lower()), node.name):
+                    obj = self.catalog.get(candidate) if candidate else None
+                    if obj is not None and obj.type == "table":
+                        node.table = obj.name
+                        node.indexes = self.catalog.indexes(obj.name)
+                        break
+        return roots
+
+    def snapshot(
+        self,
+        max_bytes: int = SNAPSHOT_MAX_BYTES,
+        sample_rows: int = SNAPSHOT_SAMPLE_ROWS,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+    ) -> Tuple[sqlite3.Connection, bool]:
+        """Return an in-memory copy of the database to experiment on, and whether it is sampled.
+
+        Databases up to ``max_bytes`` are copied whole with the backup API.
+        Larger ones get the same tables, indexes and views but only the first
+        ``sample_rows`` rows of every table. Virtual tables and triggers are
+        not copied. The caller owns (and must close) the returned connection,
+        which may only be used on the calling thread. Raises
+        ``QueryCancelledError`` once ``is_cancelled`` returns True.
+        """
+
+        def check_cancelled(*_progress: int) -> None:
+            if is_cancelled is not None and is_cancelled():
+                raise QueryCancelledError("Copy cancelled.")
+
+        copy = sqlite3.connect(":memory:")
+        try:
+            with self.reading() as connection:
+                page_count = connection.execute("PRAGMA page_count").fetchone()[0]
+                page_size = connection.execute("PRAGMA page_size").fetchone()[0]
+                if page_count * page_size <= max_bytes:
+                    connection.backup(copy, pages=SNAPSHOT_BACKUP_PAGES, progress=check_cancelled)
+                    return copy, False
+                with interrupt_when_cancelled(connection, is_cancelled), interrupt_when_cancelled(copy, is_cancelled):
+                    self._copy_sample(connection, copy, sample_rows)
+                check_cancelled()
+                return copy, True
+        except sqlite3.Error as exc:
+            copy.close()
+            if isinstance(exc, sqlite3.OperationalError) and str(exc) == "interrupted":
+                raise QueryCancelledError("Copy cancelled.") from exc
+            raise DatabaseError(f"Failed to copy database: {exc}") from exc
+        except BaseException:
+            copy.close()
+            raise
+
+    def _copy_sample(self, source: sqlite3.Connection, target: sqlite3.Connection, sample_rows: int) -> None:
+        objects = source.execute(
+            "SELECT type, name, sql FROM sqlite_master "
+            "WHERE type IN ('table', 'view', 'index') AND sql IS NOT NULL AND name NOT LIKE 'sqlite_%'"
+        ).fetchall()
+        tables = [
+            (name, sql) for obj_type, name, sql in objects
+            if obj_type == "table" and not sql.upper().startswith("CREATE VIRTUAL")
+        ]
+        for _, sql in tables:
+            target.execute(sql)
+        with target:
+            for name, _ in tables:
+                columns = [column.name for column in self.catalog.columns(name) if column.hidden == 0]
+                column_list = ", ".join(self._quote_identifier(column) for column in columns)
+                placeholders = ", ".join("?" for _ in columns)
+                insert = f"INSERT INTO {self._quote_identifier(name)} ({column_list}) VALUES ({placeholders})"
+                cursor = source.execute(
+                    f"SELECT {column_list} FROM {self._quote_identifier(name)} LIMIT ?", (sample_rows,)
+                )
+                while True:
+                    batch = cursor.fetchmany(INSERT_BATCH_SIZE)
+                    if not batch:
+                        break
+                    target.executemany(insert, batch)
+        # Indexes are built after loading the rows; views may refer to anything.
+        for obj_type, _, sql in objects:
+            if obj_type in ("index", "view"):
+                try:
+                    target.execute(sql)
+                except sqlite3.OperationalError as exc:
+                    if str(exc) == "interrupted":
+                        raise
+                    # e.g. an index or view over a virtual table that was skipped
+                    continue
+
+    def interrupt(self) -> None:
+        """Abort every statement currently running on any pooled connection.
+
+        Safe to call from a thread other than the one executing the query.
+        """
+
+        if self._pool is not None:
+            self._pool.interrupt_all()
+
+    def interrupt_query(self) -> None:
+        """Abort the statement currently running in ``execute_query`` only."""
+
+        connection = self._query_connection
+        if connection is not None:
+            connection.interrupt()
+
+    def _query_error(self, exc: sqlite3.Error) -> DatabaseError:
+        if isinstance(exc, sqlite3.OperationalError) and str(exc) == "interrupted":
+            return QueryCancelledError("Query cancelled.")
+        return DatabaseError(f"Failed to execute query: {exc}")
 
     def classify_query(self, sql: str) -> str:
         """Classify a SQL statement as read/dml/ddl/tcl/unknown."""
 
-        keyword = self._extract_first_keyword(sql)
+        keyword = first_keyword(sql)
         if keyword is None:
             return "unknown"
         if keyword in _READ_KEYWORDS:
@@ -158,6 +1725,36 @@ class DatabaseService:
             return "tcl"
         return "unknown"
 
+    def is_pragma_assignment(self, sql: str) -> bool:
+        """Return True for ``PRAGMA [schema.]name = value``, which changes a setting and returns no rows."""
+
+        tokens = list(itertools.islice(statement_tokens(sql), 5))
+        return bool(tokens) and tokens[0].keyword == "PRAGMA" and any(token.text == "=" for token in tokens[2:])
+
+    def modifies_data(self, sql: str) -> bool:
+        """Return True if the first statement inserts, updates or deletes rows.
+
+        Unlike ``classify_query`` this also catches writes after a ``WITH``
+        clause (``WITH ... INSERT ... RETURNING`` is classified "read").
+        """
+
+        depth = 0
+        pending = False
+        for position, token in enumerate(statement_tokens(sql)):
+            if pending and token.text != "(":
+                return True
+            pending = False
+            if position == 0 and token.keyword == "EXPLAIN":
+                return False
+            if token.text == "(":
+                depth += 1
+            elif token.text == ")" and depth > 0:
+                depth -= 1
+            elif depth == 0 and token.keyword in _DML_KEYWORDS:
+                # A name followed by "(" is a function call, e.g. replace(x, 'a', 'b').
+                pending = True
+        return pending
+
     def is_destructive_query(self, sql: str) -> Tuple[bool, str]:
         """Detect potentially destructive queries.
 
@@ -166,99 +1763,175 @@ class DatabaseService:
         - DELETE without a WHERE clause
         """
 
-        keyword = self._extract_first_keyword(sql)
+        keyword = first_keyword(sql)
         if keyword == "DROP":
             return True, "This will permanently drop the object."
-        if keyword == "DELETE":
-            stripped = self._strip_sql_noise(sql).upper()
-            if "WHERE" not in stripped:
-                return True, "DELETE without WHERE will remove all rows."
+        if keyword == "DELETE" and "WHERE" not in top_level_keywords(sql):
+            return True, "DELETE without WHERE will remove all rows."
         return False, ""
 
-    def _strip_sql_noise(self, sql: str) -> str:
-        """Remove SQL comments and string literals from a statement."""
-
-        result = []
-        i = 0
-        length = len(sql)
-        while i < length:
-            if sql[i] == '-' and i + 1 < length and sql[i + 1] == '-':
-                newline = sql.find('\n', i + 2)
-                i = length if newline == -1 else newline + 1
-            elif sql[i] == '/' and i + 1 < length and sql[i + 1] == '*':
-                end = sql.find('*/', i + 2)
-                i = length if end == -1 else end + 2
-            elif sql[i] in ("'", '"'):
-                quote = sql[i]
-                i += 1
-                while i < length:
-                    if sql[i] == quote and (i + 1 >= length or sql[i + 1] != quote):
-                        i += 1
-                        break
-                    if sql[i] == quote and i + 1 < length and sql[i + 1] == quote:
-                        i += 2
-                    else:
-                        i += 1
-            else:
-                result.append(sql[i])
-                i += 1
-        return ''.join(result)
+    def count_rows(
+        self,
+        table_name: str,
+        row_filter: Optional[PreviewFilter] = None,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+    ) -> int:
+        """Return the exact row count, reusing a cached value while the data is unchanged.
 
-    def _get_table_row_count(self, table_name: str) -> Optional[int]:
-        """Return row count for table; failure returns None."""
+        Cached counts are keyed on ``PRAGMA data_version`` (commits by other
+        connections), ``PRAGMA schema_version`` and this connection's
+        ``total_changes``, so they are only recomputed after a real change.
+        With ``row_filter`` only matching rows are counted. Once
+        ``is_cancelled`` returns True the scan is interrupted and
+        ``QueryCancelledError`` is raised.
+        """
 
+        if row_filter is not None and not row_filter.active:
+            row_filter = None
+        cache_key = table_name if row_filter is None else (table_name, row_filter)
+        token = self._change_token()
+        cached = self._row_counts.get(cache_key)
+        if cached is not None and token is not None and cached[0] == token:
+            return cached[1]
+
+        sql = f"SELECT COUNT(*) FROM {self._quote_identifier(table_name)}"
+        parameters: Tuple[object, ...] = ()
+        key_columns = self.get_page_key_columns(table_name) if row_filter is not None else None
+        match = self._search_match(table_name, key_columns or [], row_filter)
+        if match is not None:
+            count = self.search_index.count(table_name, match)
+        else:
+            if row_filter is not None:
+                condition, parameters = self._filter_condition(table_name, row_filter)
+                sql += f" WHERE {condition}"
+            try:
+                with self.reading() as connection, interrupt_when_cancelled(connection, is_cancelled):
+                    count = int(connection.execute(sql, parameters).fetchone()[0])
+            except sqlite3.Error as exc:
+                if isinstance(exc, sqlite3.OperationalError) and str(exc) == "interrupted":
+                    raise QueryCancelledError("Row count cancelled.") from exc
+                raise DatabaseError(str(exc)) from exc
+        if token is not None:
+            self._row_counts[cache_key] = (token, count)
+        return count
+
+    def cached_row_count(self, table_name: str, row_filter: Optional[PreviewFilter] = None) -> Optional[int]:
+        """Return the exact row count if a still-valid cached value exists."""
+
+        if row_filter is not None and not row_filter.active:
+            row_filter = None
+        cached = self._row_counts.get(table_name if row_filter is None else (table_name, row_filter))
+        if cached is None:
+            return None
         try:
+            token = self._change_token()
+        except DatabaseError:
+            return None
+        return cached[1] if token is not None and cached[0] == token else None
+
+    def estimate_row_count(self, table_name: str) -> Optional[int]:
+        """Return a cheap row count estimate without scanning the table.
+
+        Prefers a valid cached exact count, then ``sqlite_stat1`` statistics
+        gathered by ``ANALYZE``, then ``max(rowid)`` for rowid tables. Returns
+        None when no estimate is available (e.g. views).
+        """
+
+        cached = self.cached_row_count(table_name)
+        if cached is not None:
+            return cached
+
+        if self.catalog.get("sqlite_stat1") is not None:
             rows = self._execute(
-                f"SELECT COUNT(*) FROM {self._quote_identifier(table_name)}"
+                "SELECT stat FROM sqlite_stat1 WHERE tbl = ? ORDER BY idx IS NOT NULL LIMIT 1",
+                (table_name,),
             )
+            if rows and rows[0][0]:
+                head = str(rows[0][0]).split(" ", 1)[0]
+                if head.isdigit():
+                    return int(head)
+
+        key_columns = self.get_page_key_columns(table_name)
+        if key_columns is None or len(key_columns) != 1:
+            return None
+        obj = self.catalog.get(table_name)
+        if obj is None or obj.without_rowid:
+            return None
+        rows = self._execute(
+            f"SELECT max({self._quote_identifier(key_columns[0])}) FROM {self._quote_identifier(table_name)}"
+        )
+        value = rows[0][0] if rows else None
+        return max(int(value), 0) if value is not None else 0
+
+    def _change_token(self) -> Optional[Tuple[int, int, int]]:
+        """Return a value that changes whenever the database content or schema changes.
+
+        Returns None while the writer has an open transaction: uncommitted
+        state may still be rolled back and must not be cached.
+        """
+
+        connection = self._ensure_connection()
+        if connection.in_transaction:
+            return None
+        try:
+            data_version = connection.execute("PRAGMA data_version").fetchone()[0]
+            schema_version = connection.execute("PRAGMA schema_version").fetchone()[0]
+        except sqlite3.Error as exc:
+            raise DatabaseError(str(exc)) from exc
+        return int(data_version), int(schema_version), connection.total_changes
+
+    def _get_table_row_count(self, table_name: str, row_filter: Optional[PreviewFilter] = None) -> Optional[int]:
+        """Return row count for table; failure returns None."""
+
+        try:
+            return self.count_rows(table_name, row_filter)
         except DatabaseError:
             return None
-        return int(rows[0][0]) if rows else None
 
     def _execute(self, sql: str, parameters: Iterable[object] | None = None):
-        connection = self._ensure_connection()
         try:
-            cursor = connection.execute(sql, tuple(parameters or []))
-            return cursor.fetchall()
+            with self.reading() as connection:
+                cursor = connection.execute(sql, tuple(parameters or []))
+                return cursor.fetchall()
         except sqlite3.Error as exc:
             raise DatabaseError(str(exc)) from exc
 
+    @contextmanager
+    def reading(self) -> Iterator[sqlite3.Connection]:
+        """Yield a connection for read-only work.
+
+        This is a pooled reader, or the writer while it has an open
+        transaction so that uncommitted changes stay visible.
+        """
+
+        pool = self._ensure_pool()
+        if pool.writer.in_transaction:
+            yield pool.writer
+            return
+        with pool.reader() as connection:
+            yield connection
+
+    def _ensure_pool(self) -> ConnectionPool:
+        if self._pool is None:
+            raise DatabaseError("No database open.")
+        return self._pool
+
     def _ensure_connection(self) -> sqlite3.Connection:
         if self._connection is None:
             raise DatabaseError("No database open.")
         return self._connection
 
+    def table_query(self, table_name: str) -> str:
+        """Return ``SELECT * FROM`` the table or view, raising DatabaseError if it does not exist."""
+
+        if self.catalog.get(table_name) is None:
+            raise DatabaseError(f"No such table: {table_name}")
+        return f"SELECT * FROM {self._quote_identifier(table_name)}"
+
     def _quote_identifier(self, identifier: str) -> str:
         if not identifier:
             raise DatabaseError("Identifier cannot be empty.")
-        return '"' + identifier.replace('"', '""') + '"'
-
-    def _extract_first_keyword(self, sql: str) -> Optional[str]:
-        index = 0
-        length = len(sql)
-        while index < length:
-            char = sql[index]
-            if char.isspace():
-                index += 1
-                continue
-            if char == '-' and index + 1 < length and sql[index + 1] == '-':
-                newline = sql.find('\n', index + 2)
-                index = length if newline == -1 else newline + 1
-                continue
-            if char == '/' and index + 1 < length and sql[index + 1] == '*':
-                end = sql.find('*/', index + 2)
-                index = length if end == -1 else end + 2
-                continue
-            if char in '([':
-                index += 1
-                continue
-            start = index
-            while index < length and (sql[index].isalpha() or sql[index] == '_'):
-                index += 1
-            if start != index:
-                return sql[start:index].upper()
-            index += 1
-        return None
+        return quote_identifier(identifier)
 
     def __del__(self) -> None:  # pragma: no cover - best effort cleanup
         try:
@@ -0,0 +1,275 @@
+"""Auxiliary dialogs for the SQLite viewer."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QFontDatabase, QPixmap
+from PyQt6.QtWidgets import (
+    QApplication,
+    QCheckBox,
+    QDialog,
+    QDialogButtonBox,
+    QFileDialog,
+    QFormLayout,
+    QHBoxLayout,
+    QLabel,
+    QLineEdit,
+    QPlainTextEdit,
+    QPushButton,
+    QScrollArea,
+    QSpinBox,
+    QSplitter,
+    QTableView,
+    QTabWidget,
+    QVBoxLayout,
+    QWidget,
+)
+
+from .database import OpenOptions, QueryResult
+from .table_model import QueryResultModel, format_size
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from .advisor import AdvisorReport
+
+
+DATABASE_FILE_FILTER = "SQLite Database (*.db *.sqlite *.sqlite3);;All Files (*)"
+MAX_SIZE_MIB = 1024 * 1024
+ADVISOR_COLUMNS = ["Rank", "Table", "Columns", "Speedup", "Saved ms", "Statements", "CREATE INDEX"]
+# A hex dump is about four times the size of its data; longer values are cut.
+HEX_VIEW_LIMIT = 256 * 1024
+HEX_BYTES_PER_LINE = 16
+
+
+def hex_dump(data: bytes, limit: int = HEX_VIEW_LIMIT) -> str:
+    """Format ``data`` as offset, hex bytes and printable ASCII, up to ``limit`` bytes."""
+
+    lines = []
+    for offset in range(0, min(len(data), limit), HEX_BYTES_PER_LINE):
+        chunk = data[offset:offset + HEX_BYTES_PER_LINE]
+        text = "".join(chr(byte) if 32 <= byte < 127 else "." for byte in chunk)
+        lines.append(f"{offset:08x}  {chunk.hex(' '):<{HEX_BYTES_PER_LINE * 3 - 1}}  |{text}|")
+    if len(data) > limit:
+        lines.append(f"… first {format_size(limit)} of {format_size(len(data))} shown")
+    return "\n".join(lines)
+
+
+class OpenDatabaseDialog(QDialog):
+    """Pick a database file together with its open mode and tuning pragmas."""
+
+    def __init__(self, parent: Optional[QWidget] = None, path: str = "", options: Optional[OpenOptions] = None) -> None:
+        super().__init__(parent)
+        self.setWindowTitle("Open Database")
+        options = options or OpenOptions()
+
+        self.path_edit = QLineEdit(path)
+        self.path_edit.setPlaceholderText("Path to a SQLite database…")
+        browse_button = QPushButton("Browse…")
+        browse_button.clicked.connect(self._browse)
+        path_row = QHBoxLayout()
+        path_row.addWidget(self.path_edit)
+        path_row.addWidget(browse_button)
+
+        self.read_only_check = QCheckBox("Read-only (mode=ro)")
+        self.read_only_check.setChecked(options.read_only)
+        self.immutable_check = QCheckBox("Immutable snapshot (immutable=1, no locking)")
+        self.immutable_check.setChecked(options.immutable)
+        self.query_only_check = QCheckBox("Query only (PRAGMA query_only)")
+        self.query_only_check.setChecked(options.query_only)
+        self.temp_store_check = QCheckBox("Keep temporary tables in memory (temp_store=MEMORY)")
+        self.temp_store_check.setChecked(options.temp_store_memory)
+        self.mmap_spin = self._size_spin(options.mmap_size_mib)
+        self.cache_spin = self._size_spin(options.cache_size_mib)
+
+        form = QFormLayout()
+        form.addRow("Database:", path_row)
+        form.addRow("", self.read_only_check)
+        form.addRow("", self.immutable_check)
+        form.addRow("", self.query_only_check)
+        form.addRow("", self.temp_store_check)
+        form.addRow("Memory-mapped I/O:", self.mmap_spin)
+        form.addRow("Page cache:", self.cache_spin)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Open | QDialogButtonBox.StandardButton.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+
+        layout = QVBoxLayout()
+        layout.addLayout(form)
+        layout.addWidget(buttons)
+        self.setLayout(layout)
+
+    def selected_path(self) -> str:
+        return self.path_edit.text().strip()
+
+    def options(self) -> OpenOptions:
+        return OpenOptions(
+            read_only=self.read_only_check.isChecked(),
+            immutable=self.immutable_check.isChecked(),
+            mmap_size_mib=self.mmap_spin.value(),
+            cache_size_mib=self.cache_spin.value(),
+            temp_store_memory=self.temp_store_check.isChecked(),
+            query_only=self.query_only_check.isChecked(),
+        )
+
+    def _size_spin(self, value: int) -> QSpinBox:
+        spin = QSpinBox()
+        spin.setRange(0, MAX_SIZE_MIB)
+        spin.setSuffix(" MiB")
+        spin.setSpecialValueText("SQLite default")
+        spin.setValue(value)
+        return spin
+
+    def _browse(self) -> None:
+        start = self.selected_path() or str(Path.home())
+        path, _ = QFileDialog.getOpenFileName(self, "Open SQLite Database", start, DATABASE_FILE_FILTER)
+        if path:
+            self.path_edit.setText(path)
+
+
+class IndexAdvisorDialog(QDialog):
+    """Show the ranked index recommendations of an ``AdvisorReport``."""
+
+    def __init__(self, report: "AdvisorReport", parent: Optional[QWidget] = None) -> None:
+        super().__init__(parent)
+        self.setWindowTitle("Index Advisor")
+        self.resize(900, 560)
+        self.report = report
+
+        summary = (
+            f"{len(report.recommendations)} index(es) recommended from {report.candidates} candidate(s) "
+            f"for {report.statements} distinct statement(s)."
+        )
+        if report.sampled:
+            summary += " Timings were measured on a sampled copy of the database."
+        if report.skipped:
+            summary += f" {len(report.skipped)} statement(s) could not be replayed and were skipped."
+        summary_label = QLabel(summary)
+        summary_label.setWordWrap(True)
+
+        rows = [
+            (
+                rank,
+                item.candidate.table,
+                ", ".join(item.candidate.columns),
+                f"{item.speedup:.1f}×",
+                round(item.saved_ms, 2),
+                len(item.statements),
+                item.create_sql,
+            )
+            for rank, item in enumerate(report.recommendations, start=1)
+        ]
+        self.table_view = QTableView()
+        self.table_view.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.table_view.setSelectionMode(QTableView.SelectionMode.SingleSelection)
+        self.table_view.horizontalHeader().setStretchLastSection(True)
+        self.table_view.setModel(QueryResultModel(QueryResult(ADVISOR_COLUMNS, rows), self.table_view))
+        self.table_view.selectionModel().currentRowChanged.connect(self._show_detail)
+
+        self.detail_view = QPlainTextEdit()
+        self.detail_view.setReadOnly(True)
+        self.detail_view.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+
+        splitter = QSplitter(Qt.Orientation.Vertical)
+        splitter.addWidget(self.table_view)
+        splitter.addWidget(self.detail_view)
+
+        copy_button = QPushButton("Copy CREATE INDEX Statements")
+        copy_button.setEnabled(bool(report.recommendations))
+        copy_button.clicked.connect(self._copy_statements)
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Close)
+        buttons.addButton(copy_button, QDialogButtonBox.ButtonRole.ActionRole)
+        buttons.rejected.connect(self.reject)
+
+        layout = QVBoxLayout()
+        layout.addWidget(summary_label)
+        layout.addWidget(splitter)
+        layout.addWidget(buttons)
+        self.setLayout(layout)
+        if report.recommendations:
+            self.table_view.selectRow(0)
+
+    def statements(self) -> str:
+        return "\n".join(item.create_sql for item in self.report.recommendations)
+
+    def _copy_statements(self) -> None:
+        QApplication.clipboard().setText(self.statements())
+
+    def _show_detail(self, current, _previous=None) -> None:
+        if not current.isValid():
+            self.detail_view.clear()
+            return
+        item = self.report.recommendations[current.row()]
+        lines = [
+            item.create_sql,
+            "",
+            f"Workload time {item.before_ms:.2f} ms -> {item.after_ms:.2f} ms ({item.speedup:.1f}× faster)",
+        ]
+        for sql in item.statements:
+            lines.extend(["", sql, "  before:"])
+            lines.extend(f"    {step}" for step in item.plan_before.get(sql, []))
+            lines.append("  after:")
+            lines.extend(f"    {step}" for step in item.plan_after.get(sql, []))
+        self.detail_view.setPlainText("\n".join(lines))
+
+
+class CellViewerDialog(QDialog):
+    """Show one complete cell value as text, a hex dump or an image."""
+
+    def __init__(self, title: str, value: object, parent: Optional[QWidget] = None) -> None:
+        super().__init__(parent)
+        self.setWindowTitle(title)
+        self.resize(720, 520)
+        fixed_font = QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont)
+
+        if isinstance(value, bytes):
+            data = value
+            summary = f"BLOB, {format_size(len(value))}"
+            try:
+                text = value.decode("utf-8")
+            except UnicodeDecodeError:
+                text = None
+        else:
+            text = "NULL" if value is None else str(value)
+            data = text.encode("utf-8")
+            if isinstance(value, str):
+                summary = f"TEXT, {len(text):,} characters"
+            else:
+                summary = "NULL" if value is None else {int: "INTEGER", float: "REAL"}.get(type(value), "VALUE")
+        summary_label = QLabel(summary)
+
+        self.tabs = QTabWidget()
+        # BLOBs that are not UTF-8 only get the (size-capped) hex dump.
+        self.text_view: Optional[QPlainTextEdit] = None
+        if text is not None:
+            self.text_view = QPlainTextEdit(text)
+            self.text_view.setReadOnly(True)
+            self.tabs.addTab(self.text_view, "Text")
+        self.hex_view = QPlainTextEdit(hex_dump(data))
+        self.hex_view.setReadOnly(True)
+        self.hex_view.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+        self.hex_view.setFont(fixed_font)
+        self.tabs.addTab(self.hex_view, "Hex")
+
+        pixmap = QPixmap()
+        if isinstance(value, bytes) and pixmap.loadFromData(value):
+            image_label = QLabel()
+            image_label.setPixmap(pixmap)
+            image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            scroll = QScrollArea()
+            scroll.setWidget(image_label)
+            scroll.setWidgetResizable(True)
+            self.tabs.addTab(scroll, "Image")
+            summary_label.setText(f"{summary}, {pixmap.width()}×{pixmap.height()} image")
+            self.tabs.setCurrentWidget(scroll)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Close)
+        buttons.rejected.connect(self.reject)
+
+        layout = QVBoxLayout()
+        layout.addWidget(summary_label)
+        layout.addWidget(self.tabs)
+        layout.addWidget(buttons)
+        self.setLayout(layout)
@@ -0,0 +1,113 @@
+"""Streaming export of query results to CSV, TSV and JSON Lines files."""
+
+from __future__ import annotations
+
+import base64
+import csv
+import json
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional, Sequence, TextIO
+
+from .database import DatabaseError, DatabaseService, QueryCancelledError
+
+
+EXPORT_BATCH_SIZE = 5000
+EXPORT_FORMATS = {
+    "csv": "CSV",
+    "tsv": "TSV",
+    "jsonl": "JSON Lines",
+}
+
+RowWriter = Callable[[Sequence[Sequence[object]]], None]
+
+
+@dataclass(slots=True)
+class ExportProgress:
+    """Rows written so far and the time spent writing them."""
+
+    rows_written: int
+    elapsed: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_written / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def format_for_path(path: str | Path, default: str = "csv") -> str:
+    """Guess the export format from a file extension."""
+
+    suffix = Path(path).suffix.lower().lstrip(".")
+    if suffix == "ndjson":
+        return "jsonl"
+    return suffix if suffix in EXPORT_FORMATS else default
+
+
+def create_writer(fmt: str, handle: TextIO, columns: Sequence[str]) -> RowWriter:
+    """Write the header for ``fmt`` to ``handle`` and return a batch writer."""
+
+    if fmt in ("csv", "tsv"):
+        writer = csv.writer(handle, delimiter="\t" if fmt == "tsv" else ",")
+        writer.writerow(columns)
+        return writer.writerows
+    if fmt == "jsonl":
+        keys = list(columns)
+
+        def write_jsonl(rows: Sequence[Sequence[object]]) -> None:
+            handle.writelines(
+                json.dumps(dict(zip(keys, row)), ensure_ascii=False, default=_json_default) + "\n"
+                for row in rows
+            )
+
+        return write_jsonl
+    raise DatabaseError(f"Unsupported export format: {fmt}")
+
+
+def export_query(
+    service: DatabaseService,
+    sql: str,
+    path: str | Path,
+    fmt: str = "csv",
+    batch_size: int = EXPORT_BATCH_SIZE,
+    progress: Optional[Callable[[ExportProgress], None]] = None,
+    is_cancelled: Optional[Callable[[], bool]] = None,
+) -> ExportProgress:
+    """Re-run a read query and stream every row of its result to ``path``.
+
+    Rows are fetched with ``fetchmany(batch_size)`` and written batch by
+    batch, so memory stays bounded regardless of the result size. The
+    partially written file is removed if the export fails or is cancelled.
+    Statements that change data, such as ``WITH ... INSERT ... RETURNING``,
+    are refused: re-running them would repeat the change.
+    """
+
+    if service.classify_query(sql) != "read" or service.modifies_data(sql) or service.is_pragma_assignment(sql):
+        raise DatabaseError("Only read queries can be exported.")
+    if fmt not in EXPORT_FORMATS:
+        raise DatabaseError(f"Unsupported export format: {fmt}")
+
+    columns, batches = service.iter_query(sql, batch_size, is_cancelled)
+    started = time.perf_counter()
+    written = 0
+    try:
+        with open(path, "w", newline="", encoding="utf-8") as handle:
+            write_rows = create_writer(fmt, handle, columns)
+            for batch in batches:
+                if is_cancelled is not None and is_cancelled():
+                    raise QueryCancelledError("Export cancelled.")
+                write_rows(batch)
+                written += len(batch)
+                if progress is not None:
+                    progress(ExportProgress(written, time.perf_counter() - started))
+    except BaseException:
+        batches.close()
+        Path(path).unlink(missing_ok=True)
+        raise
+    return ExportProgress(written, time.perf_counter() - started)
+
+
+def _json_default(value: object) -> object:
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return base64.b64encode(bytes(value)).decode("ascii")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
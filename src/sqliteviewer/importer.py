@@ -0,0 +1,211 @@
+"""Streaming bulk import of CSV, TSV and JSON Lines files into tables."""
+
+from __future__ import annotations
+
+import csv
+import itertools
+import json
+import re
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .database import DatabaseError, DatabaseService
+
+
+IMPORT_BATCH_SIZE = 10000
+INFER_SAMPLE_ROWS = 1000
+_INTEGER_PATTERN = re.compile(r"[+-]?\d+")
+_REAL_PATTERN = re.compile(r"[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?")
+
+IMPORT_FORMATS = {
+    "csv": "CSV",
+    "tsv": "TSV",
+    "jsonl": "JSON Lines",
+}
+
+
+@dataclass(slots=True)
+class ImportProgress:
+    """Rows inserted so far and the time spent inserting them."""
+
+    rows_imported: int
+    elapsed: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_imported / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def format_for_path(path: str | Path, default: str = "csv") -> str:
+    """Guess the import format from a file extension."""
+
+    suffix = Path(path).suffix.lower().lstrip(".")
+    if suffix == "ndjson":
+        return "jsonl"
+    return suffix if suffix in IMPORT_FORMATS else default
+
+
+def read_source(path: str | Path, fmt: str) -> Tuple[List[str], Iterator[Sequence[object]]]:
+    """Return the column names of a source file and an iterator over its rows.
+
+    CSV/TSV columns come from the header row and empty fields become NULL.
+    JSON Lines columns are the keys seen in the first ``INFER_SAMPLE_ROWS``
+    objects; nested values are stored as JSON text.
+    """
+
+    if fmt in ("csv", "tsv"):
+        return _read_delimited(path, "\t" if fmt == "tsv" else ",")
+    if fmt == "jsonl":
+        return _read_jsonl(path)
+    raise DatabaseError(f"Unsupported import format: {fmt}")
+
+
+def infer_column_types(columns: Sequence[str], sample: Iterable[Sequence[object]]) -> List[str]:
+    """Infer INTEGER/REAL/TEXT column types from a sample of rows."""
+
+    candidates = ["INTEGER"] * len(columns)
+    seen = [False] * len(columns)
+    for row in sample:
+        for index, value in enumerate(row):
+            if value is None or candidates[index] == "TEXT":
+                continue
+            seen[index] = True
+            candidates[index] = _widen_type(candidates[index], value)
+    return [kind if seen[index] else "TEXT" for index, kind in enumerate(candidates)]
+
+
+def import_file(
+    service: DatabaseService,
+    path: str | Path,
+    table_name: str,
+    fmt: Optional[str] = None,
+    column_map: Optional[Dict[str, str]] = None,
+    batch_size: int = IMPORT_BATCH_SIZE,
+    fast: bool = False,
+    defer_indexes: bool = True,
+    progress: Optional[Callable[[ImportProgress], None]] = None,
+    is_cancelled: Optional[Callable[[], bool]] = None,
+) -> ImportProgress:
+    """Stream ``path`` into ``table_name`` using batched ``executemany`` inserts.
+
+    Missing tables are created with column types inferred from the first
+    rows. For existing tables, source columns are matched to table columns by
+    name (case-insensitively) unless ``column_map`` maps source names to
+    target names explicitly; unmatched source columns are skipped.
+    """
+
+    fmt = fmt or format_for_path(path)
+    source_columns, rows = read_source(path, fmt)
+    if not source_columns:
+        raise DatabaseError("The import file has no columns.")
+
+    existing = service.get_table_columns(table_name)
+    column_types: Optional[List[str]] = None
+    if existing:
+        lookup = {name.lower(): name for name in existing}
+        mapping = column_map or {name: name for name in source_columns}
+        selected = [
+            (index, lookup[mapping[name].lower()])
+            for index, name in enumerate(source_columns)
+            if name in mapping and mapping[name].lower() in lookup
+        ]
+        if not selected:
+            raise DatabaseError(f"No columns of the import file match table '{table_name}'.")
+        indices = [index for index, _ in selected]
+        target_columns = [name for _, name in selected]
+        if len(indices) != len(source_columns):
+            rows = ([row[index] for index in indices] for row in rows)
+    else:
+        target_columns = [column_map.get(name, name) if column_map else name for name in source_columns]
+        sample = list(itertools.islice(rows, INFER_SAMPLE_ROWS))
+        column_types = infer_column_types(target_columns, sample)
+        rows = itertools.chain(sample, rows)
+
+    started = time.perf_counter()
+
+    def report(count: int) -> None:
+        if progress is not None:
+            progress(ImportProgress(count, time.perf_counter() - started))
+
+    imported = service.bulk_insert(
+        table_name,
+        target_columns,
+        rows,
+        column_types=column_types,
+        batch_size=batch_size,
+        fast=fast,
+        defer_indexes=defer_indexes,
+        progress=report,
+        is_cancelled=is_cancelled,
+    )
+    return ImportProgress(imported, time.perf_counter() - started)
+
+
+def _read_delimited(path: str | Path, delimiter: str) -> Tuple[List[str], Iterator[Sequence[object]]]:
+    handle = open(path, newline="", encoding="utf-8-sig")
+    reader = csv.reader(handle, delimiter=delimiter)
+    try:
+        columns = [name.strip() for name in next(reader)]
+    except StopIteration:
+        handle.close()
+        return [], iter(())
+    width = len(columns)
+
+    def rows() -> Iterator[Sequence[object]]:
+        with handle:
+            for record in reader:
+                if len(record) != width:
+                    record = (record + [""] * width)[:width]
+                yield [value or None for value in record]
+
+    return columns, rows()
+
+
+def _read_jsonl(path: str | Path) -> Tuple[List[str], Iterator[Sequence[object]]]:
+    handle = open(path, encoding="utf-8")
+    objects = (json.loads(line) for line in handle if line.strip())
+    sample: List[dict] = []
+    for record in itertools.islice(objects, INFER_SAMPLE_ROWS):
+        if not isinstance(record, dict):
+            handle.close()
+            raise DatabaseError("Each JSON Lines record must be an object.")
+        sample.append(record)
+
+    columns: List[str] = []
+    known = set()
+    for record in sample:
+        for key in record:
+            if key not in known:
+                known.add(key)
+                columns.append(key)
+
+    def rows() -> Iterator[Sequence[object]]:
+        with handle:
+            for record in itertools.chain(sample, objects):
+                yield [_json_value(record.get(column)) for column in columns]
+
+    return columns, rows()
+
+
+def _json_value(value: object) -> object:
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    if isinstance(value, bool):
+        return int(value)
+    return value
+
+
+def _widen_type(current: str, value: object) -> str:
+    if isinstance(value, bool) or isinstance(value, int):
+        return current
+    if isinstance(value, float):
+        return "REAL"
+    if isinstance(value, str):
+        text = value.strip()
+        if _INTEGER_PATTERN.fullmatch(text):
+            return current
+        if _REAL_PATTERN.fullmatch(text):
+            return "REAL"
+    return "TEXT"
@@ -0,0 +1,177 @@
+"""Per-statement instrumentation and the persistent performance log."""
+
+from __future__ import annotations
+
+import dataclasses
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+
+PROGRESS_STEP_INTERVAL = 1000
+LOG_MAX_BYTES = 10 * 1024 * 1024
+_MAX_LOGGED_SQL = 4000
+
+
+@dataclass(slots=True)
+class QueryStats:
+    """Timings and counters for one executed statement.
+
+    ``prepare_ms`` runs until SQLite starts stepping the statement (as seen by
+    the trace callback), ``execute_ms`` until ``cursor.execute`` returns and
+    ``fetch_ms`` covers reading the rows afterwards. Preparation is only
+    measured while tracing; otherwise ``prepare_ms`` is 0 and the time is
+    part of ``execute_ms``. ``vm_steps`` counts virtual machine instructions
+    in multiples of ``PROGRESS_STEP_INTERVAL``.
+    """
+
+    sql: str
+    started_at: float = field(default_factory=time.time)
+    database: Optional[str] = None
+    prepare_ms: float = 0.0
+    execute_ms: float = 0.0
+    fetch_ms: float = 0.0
+    rows: int = 0
+    vm_steps: int = 0
+    status: str = "ok"
+    error: Optional[str] = None
+    from_cache: bool = False
+    trace: List[str] = field(default_factory=list)
+
+    @property
+    def total_ms(self) -> float:
+        return self.prepare_ms + self.execute_ms + self.fetch_ms
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / (self.total_ms / 1000) if self.total_ms > 0 else 0.0
+
+    def to_json(self) -> str:
+        data = dataclasses.asdict(self)
+        data["sql"] = self.sql[:_MAX_LOGGED_SQL]
+        data["total_ms"] = round(self.total_ms, 3)
+        for key in ("prepare_ms", "execute_ms", "fetch_ms"):
+            data[key] = round(data[key], 3)
+        return json.dumps(data, ensure_ascii=False)
+
+    @classmethod
+    def from_json(cls, line: str) -> "QueryStats":
+        data = json.loads(line)
+        names = {item.name for item in dataclasses.fields(cls)}
+        return cls(**{key: value for key, value in data.items() if key in names})
+
+
+class StatementProbe:
+    """Measure one statement on ``connection`` between ``install`` and ``remove``.
+
+    A progress handler counts VM steps. With ``trace=True`` a trace callback
+    also marks the end of statement preparation and keeps the traced
+    statement texts (including statements run by triggers); it is not
+    installed otherwise, since it runs for every statement.
+    """
+
+    def __init__(
+        self,
+        connection: sqlite3.Connection,
+        sql: str,
+        database: Optional[str] = None,
+        trace: bool = False,
+        step_interval: int = PROGRESS_STEP_INTERVAL,
+    ) -> None:
+        self.stats = QueryStats(sql=sql, database=database)
+        self._connection = connection
+        self._trace = trace
+        self._step_interval = step_interval
+        self._started = 0.0
+        self._prepared: Optional[float] = None
+        self._executed: Optional[float] = None
+
+    def install(self) -> "StatementProbe":
+        self._connection.set_progress_handler(self._on_progress, self._step_interval)
+        if self._trace:
+            self._connection.set_trace_callback(self._on_trace)
+        self._started = time.perf_counter()
+        return self
+
+    def remove(self) -> None:
+        self._connection.set_progress_handler(None, 0)
+        if self._trace:
+            self._connection.set_trace_callback(None)
+
+    def execute(self, sql: str, parameters: tuple = ()) -> sqlite3.Cursor:
+        try:
+            return self._connection.execute(sql, parameters)
+        finally:
+            self._executed = time.perf_counter()
+
+    def finish(self, rows: int = 0, status: str = "ok", error: Optional[str] = None) -> QueryStats:
+        """Fill in the timings up to now and return the stats."""
+
+        now = time.perf_counter()
+        executed = self._executed or now
+        if self._trace:
+            prepared = min(self._prepared or executed, executed)
+        else:
+            prepared = self._started
+        stats = self.stats
+        stats.prepare_ms = (prepared - self._started) * 1000
+        stats.execute_ms = (executed - prepared) * 1000
+        stats.fetch_ms = (now - executed) * 1000
+        stats.rows = rows
+        stats.status = status
+        stats.error = error
+        return stats
+
+    def _on_progress(self) -> int:
+        self.stats.vm_steps += self._step_interval
+        return 0
+
+    def _on_trace(self, statement: str) -> None:
+        if self._prepared is None:
+            self._prepared = time.perf_counter()
+        self.stats.trace.append(statement)
+
+
+class PerformanceLog:
+    """Append-only JSON Lines log of ``QueryStats``, rotated at ``max_bytes``."""
+
+    def __init__(self, path: str | Path, max_bytes: int = LOG_MAX_BYTES) -> None:
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def append(self, stats: QueryStats) -> None:
+        line = stats.to_json() + "\n"
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                if self.path.stat().st_size + len(line.encode("utf-8")) > self.max_bytes:
+                    self.path.replace(self.path.with_name(self.path.name + ".1"))
+            except FileNotFoundError:
+                pass
+            with open(self.path, "a", encoding="utf-8") as handle:
+                handle.write(line)
+
+    def entries(self) -> Iterator[QueryStats]:
+        """Yield logged stats, oldest first, skipping unreadable lines."""
+
+        for path in (self.path.with_name(self.path.name + ".1"), self.path):
+            try:
+                handle = open(path, encoding="utf-8")
+            except FileNotFoundError:
+                continue
+            with handle:
+                for line in handle:
+                    try:
+                        yield QueryStats.from_json(line)
+                    except (ValueError, TypeError):
+                        continue
+
+    def slowest(self, count: int = 20) -> List[QueryStats]:
+        """Return the ``count`` slowest logged statements across sessions."""
+
+        return sorted(self.entries(), key=lambda stats: stats.total_ms, reverse=True)[:count]
@@ -2,16 +2,21 @@
 
 from __future__ import annotations
 
-import csv
+import dataclasses
+import time
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
 
-from PyQt6.QtCore import QSettings, Qt
-from PyQt6.QtGui import QAction, QCloseEvent, QFontDatabase, QKeySequence, QShortcut
+from PyQt6.QtCore import QElapsedTimer, QModelIndex, QSettings, QStandardPaths, Qt, QThreadPool, QTimer
+from PyQt6.QtGui import QAction, QBrush, QCloseEvent, QColor, QFont, QFontDatabase, QKeySequence, QShortcut
 from PyQt6.QtWidgets import (
     QApplication,
+    QCheckBox,
+    QComboBox,
     QFileDialog,
+    QInputDialog,
     QLabel,
+    QLineEdit,
     QListWidget,
     QListWidgetItem,
     QMainWindow,
@@ -23,34 +28,102 @@ from PyQt6.QtWidgets import (
     QTableView,
     QTabWidget,
     QTextEdit,
+    QTreeWidget,
+    QTreeWidgetItem,
     QVBoxLayout,
     QWidget,
     QPlainTextEdit,
     QHBoxLayout,
+    QProgressDialog,
 )
 
-from .database import DatabaseError, DatabaseService, QueryResult
+from .database import (
+    DEFAULT_ROW_LIMIT,
+    RESULT_MEMORY_BUDGET,
+    DatabaseError,
+    DatabaseService,
+    OpenOptions,
+    PreviewFilter,
+    PreviewSort,
+    QueryCancelledError,
+    QueryResult,
+    ScriptResult,
+    StatementResult,
+    TruncatedValue,
+)
+from .dialogs import DATABASE_FILE_FILTER, CellViewerDialog, IndexAdvisorDialog, OpenDatabaseDialog
+from .instrumentation import PerformanceLog, QueryStats
+from .query_cache import DEFAULT_CACHE_BUDGET
+from .query_plan import PlanNode
 from .resources import load_icon
-from .sql_highlighter import SqlHighlighter
+from .search_index import READY, STALE, SearchIndex
+from .spilled_rows import SpilledRows
+from .sql_lexer import split_statements
+from .table_model import QueryResultModel, format_size
 from .theme import SETTINGS_GROUP, Theme, apply_theme, load_theme_preference, save_theme_preference
+from .workers import Worker
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from .advisor import AdvisorReport
+    from .export import ExportProgress
+    from .importer import ImportProgress
+    from .sql_highlighter import SqlHighlighter
 
 
 MAX_RECENT_FILES = 5
+QUERY_STATUS_INTERVAL_MS = 100
+PERFORMANCE_LOG_NAME = "performance.jsonl"
+SLOWEST_LOGGED_STATEMENTS = 100
+SEARCH_INDEX_DIR = "search"
+FILTER_DELAY_MS = 300
+# Sorting this many rows without an index takes seconds for every page: ask first.
+LARGE_SORT_ROWS = 1_000_000
+MIB = 1024 * 1024
+MAX_RESULT_BUDGET_MIB = 16 * 1024
+SEARCH_INDEX_TOOLTIPS = {
+    None: "Index the table's text with SQLite FTS5 in a side-car file so filters return without scanning the table",
+    READY: "Filters of three or more characters are answered from the search index",
+    STALE: "The search index is out of date; filters scan the table until it is rebuilt",
+}
+PERFORMANCE_COLUMNS = [
+    "Time", "Status", "Total ms", "Prepare ms", "Execute ms", "Fetch ms", "Rows", "Rows/s", "VM steps", "SQL"
+]
+PLAN_COLUMNS = ["Step", "Table", "Index used", "Indexes on table"]
+PLAN_WARNING_COLORS = {Theme.LIGHT: "#b31d28", Theme.DARK: "#f48771"}
+MESSAGE_COLUMNS = ["#", "Status", "Rows", "Time ms", "Statement"]
+MESSAGE_SQL_PREVIEW = 200
 
 
 class MainWindow(QMainWindow):
     """Top-level application window."""
 
-    def __init__(self) -> None:
+    def __init__(self, open_options: Optional[OpenOptions] = None, theme: Optional[Theme] = None) -> None:
         super().__init__()
         self.setWindowTitle("SQLite Viewer")
         self.resize(1100, 700)
         self.setWindowIcon(load_icon())
 
         self.database_service = DatabaseService()
+        self.database_service.performance_log = PerformanceLog(self._performance_log_path())
+        cache_location = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.CacheLocation)
+        self.database_service.search_index = SearchIndex(
+            self.database_service, Path(cache_location or Path.home() / ".sqliteview") / SEARCH_INDEX_DIR
+        )
+        self.open_options = open_options or OpenOptions()
         self.settings = QSettings(*SETTINGS_GROUP)
+        self.database_service.trace_statements = self.settings.value("trace_statements", False, type=bool)
+        budget_mib = self.settings.value("result_budget_mib", RESULT_MEMORY_BUDGET // MIB, type=int)
+        self.database_service.result_budget_bytes = max(1, budget_mib) * MIB
         self.query_result: Optional[QueryResult] = None
-        self.current_theme = load_theme_preference()
+        self.query_result_sql: Optional[str] = None
+        self.preview_result: Optional[QueryResult] = None
+        self._preview_table: Optional[str] = None
+        self._preview_page: Optional[int] = None
+        self._preview_filter: Optional[PreviewFilter] = None
+        self._preview_sort: Optional[PreviewSort] = None
+        # Pages of an unindexed sort are loaded in the background.
+        self._sort_in_background = False
+        self.current_theme = theme or load_theme_preference()
 
         self.table_list = QListWidget()
         self.table_list.itemSelectionChanged.connect(self._on_table_selected)
@@ -58,31 +131,48 @@ class MainWindow(QMainWindow):
         self.table_view = QTableView()
         self.table_view.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
         self.table_view.setAlternatingRowColors(True)
-        self.table_view.horizontalHeader().setStretchLastSection(True)
-
-        self.schema_view = QTextEdit()
-        self.schema_view.setReadOnly(True)
-        self.schema_view.setLineWrapMode(QTextEdit.LineWrapMode.NoWrap)
-
-        self.query_editor = QPlainTextEdit()
-        self.query_editor.setPlaceholderText("Write a SQL statement…")
-        self.highlighter = SqlHighlighter(self.query_editor.document())
-        self.highlighter.set_color_scheme(self.current_theme)
-
-        fixed_font = QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont)
-        fixed_font.setPointSize(11)
-        self.query_editor.setFont(fixed_font)
-        self.schema_view.setFont(fixed_font)
-        tab_stop = 4 * self.query_editor.fontMetrics().horizontalAdvance(" ")
-        self.query_editor.setTabStopDistance(tab_stop)
-        self.schema_view.setTabStopDistance(tab_stop)
-
-        self.query_result_view = QTableView()
-        self.query_result_view.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
-        self.query_result_view.setAlternatingRowColors(True)
-        self.query_result_view.horizontalHeader().setStretchLastSection(True)
-
-        self.query_status_label = QLabel("Ready")
+        header = self.table_view.horizontalHeader()
+        header.setStretchLastSection(True)
+        header.setSectionsClickable(True)
+        header.setSortIndicatorShown(True)
+        header.setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        header.sectionClicked.connect(self._on_preview_header_clicked)
+        self.table_view.doubleClicked.connect(self._open_cell_viewer)
+        self.table_view.setToolTip("Double-click a cell to view its complete value")
+
+        # Built lazily by _ensure_schema_view / _ensure_console.
+        self.schema_view: Optional[QTextEdit] = None
+        self._schema_table: Optional[str] = None
+        self.query_editor: Optional[QPlainTextEdit] = None
+        self.highlighter: Optional[SqlHighlighter] = None
+        self.query_result_view: Optional[QTableView] = None
+        self.plan_view: Optional[QTreeWidget] = None
+        self._plan: List[PlanNode] = []
+        self.messages_view: Optional[QTreeWidget] = None
+        self.performance_view: Optional[QTableView] = None
+        self._performance_stats: List[QueryStats] = []
+        self._tab_builders: Dict[QWidget, Callable[[], None]] = {}
+
+        self.thread_pool = QThreadPool.globalInstance()
+        self._query_worker: Optional[Worker] = None
+        self._count_worker: Optional[Worker] = None
+        self._preview_worker: Optional[Worker] = None
+        self._export_worker: Optional[Worker] = None
+        self._import_worker: Optional[Worker] = None
+        self._advisor_worker: Optional[Worker] = None
+        self._search_index_worker: Optional[Worker] = None
+        self._result_sort_worker: Optional[Worker] = None
+        # Spilled console results can be sorted: the unsorted rows and the (column, descending) shown.
+        self._result_rows: Optional[SpilledRows] = None
+        self._result_sort: Optional[Tuple[int, bool]] = None
+        self._cell_worker: Optional[Worker] = None
+        self._query_rows_fetched = 0
+        self._script_total = 0
+        self._script_done = 0
+        self._query_elapsed = QElapsedTimer()
+        self._query_status_timer = QTimer(self)
+        self._query_status_timer.setInterval(QUERY_STATUS_INTERVAL_MS)
+        self._query_status_timer.timeout.connect(self._update_running_query_status)
 
         self._build_ui()
         self._build_menus()
@@ -103,7 +193,7 @@ class MainWindow(QMainWindow):
         left_layout.addWidget(self.table_list)
         splitter.addWidget(left_container)
 
-        right_tabs = QTabWidget()
+        self.right_tabs = right_tabs = QTabWidget()
         splitter.addWidget(right_tabs)
         splitter.setStretchFactor(0, 1)
         splitter.setStretchFactor(1, 3)
@@ -111,41 +201,278 @@ class MainWindow(QMainWindow):
         table_tab = QWidget()
         table_layout = QVBoxLayout()
         table_tab.setLayout(table_layout)
+
+        filter_bar = QHBoxLayout()
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText('Filter rows: text in any column, or column:text (quote "two words")')
+        self.filter_edit.setClearButtonEnabled(True)
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(FILTER_DELAY_MS)
+        self._filter_timer.timeout.connect(self._apply_preview_filter)
+        self.filter_edit.textChanged.connect(self._filter_timer.start)
+        self.filter_edit.returnPressed.connect(self._apply_preview_filter)
+        self.search_index_button = QPushButton("Build Search Index")
+        self.search_index_button.clicked.connect(self._build_search_index)
+        filter_bar.addWidget(self.filter_edit, 1)
+        filter_bar.addWidget(self.search_index_button)
+        table_layout.addLayout(filter_bar)
         table_layout.addWidget(self.table_view)
+        self._update_search_index_button()
+
+        page_bar = QHBoxLayout()
+        self.first_page_button = QPushButton("First")
+        self.first_page_button.clicked.connect(lambda: self._load_preview_page("first"))
+        self.previous_page_button = QPushButton("Previous")
+        self.previous_page_button.clicked.connect(lambda: self._load_preview_page("previous"))
+        self.page_label = QLabel()
+        self.next_page_button = QPushButton("Next")
+        self.next_page_button.clicked.connect(lambda: self._load_preview_page("next"))
+        self.last_page_button = QPushButton("Last")
+        self.last_page_button.clicked.connect(lambda: self._load_preview_page("last"))
+        page_bar.addWidget(self.first_page_button)
+        page_bar.addWidget(self.previous_page_button)
+        page_bar.addStretch(1)
+        page_bar.addWidget(self.page_label)
+        page_bar.addStretch(1)
+        page_bar.addWidget(self.next_page_button)
+        page_bar.addWidget(self.last_page_button)
+        table_layout.addLayout(page_bar)
+        self._update_page_controls()
+
         right_tabs.addTab(table_tab, "Data Preview")
 
-        schema_tab = QWidget()
-        schema_layout = QVBoxLayout()
-        schema_tab.setLayout(schema_layout)
-        schema_layout.addWidget(self.schema_view)
-        right_tabs.addTab(schema_tab, "Schema")
+        self.schema_tab = QWidget()
+        self.schema_tab.setLayout(QVBoxLayout())
+        right_tabs.addTab(self.schema_tab, "Schema")
+        self._tab_builders[self.schema_tab] = self._ensure_schema_view
+
+        self.console_tab = QWidget()
+        self.console_tab.setLayout(QVBoxLayout())
+        right_tabs.addTab(self.console_tab, "SQL Console")
+        self._tab_builders[self.console_tab] = self._ensure_console
+
+        self.performance_tab = QWidget()
+        self.performance_tab.setLayout(QVBoxLayout())
+        right_tabs.addTab(self.performance_tab, "Performance")
+        self._tab_builders[self.performance_tab] = self._ensure_performance_panel
+        right_tabs.currentChanged.connect(self._on_tab_changed)
+
+        self.status_bar = QStatusBar()
+        self.connection_label = QLabel()
+        self.status_bar.addPermanentWidget(self.connection_label)
+        self.setStatusBar(self.status_bar)
+
+        self.setCentralWidget(central)
+
+    def _on_tab_changed(self, index: int) -> None:
+        builder = self._tab_builders.pop(self.right_tabs.widget(index), None)
+        if builder is not None:
+            builder()
 
-        query_tab = QWidget()
-        query_layout = QVBoxLayout()
-        query_tab.setLayout(query_layout)
+    def _fixed_font(self) -> QFont:
+        font = QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont)
+        font.setPointSize(11)
+        return font
 
+    def _ensure_schema_view(self) -> QTextEdit:
+        if self.schema_view is not None:
+            return self.schema_view
+
+        self.schema_view = QTextEdit()
+        self.schema_view.setReadOnly(True)
+        self.schema_view.setLineWrapMode(QTextEdit.LineWrapMode.NoWrap)
+        self.schema_view.setFont(self._fixed_font())
+        self.schema_view.setTabStopDistance(4 * self.schema_view.fontMetrics().horizontalAdvance(" "))
+        self.schema_tab.layout().addWidget(self.schema_view)
+        if self._schema_table is not None:
+            self._load_table_schema(self._schema_table)
+        return self.schema_view
+
+    def _ensure_console(self) -> QPlainTextEdit:
+        """Build the SQL console (editor, highlighter, result view) on first use."""
+
+        if self.query_editor is not None:
+            return self.query_editor
+
+        from .sql_highlighter import SqlHighlighter
+
+        query_layout = self.console_tab.layout()
+
+        self.query_editor = QPlainTextEdit()
+        self.query_editor.setPlaceholderText("Write a SQL statement…")
+        self.query_editor.setFont(self._fixed_font())
+        self.query_editor.setTabStopDistance(4 * self.query_editor.fontMetrics().horizontalAdvance(" "))
+        self.highlighter = SqlHighlighter(self.query_editor.document())
+        self.highlighter.set_color_scheme(self.current_theme)
         query_layout.addWidget(self.query_editor)
 
         button_bar = QHBoxLayout()
         self.run_button = QPushButton("Run Query")
         self.run_button.setToolTip("Execute SQL (Ctrl+Enter)")
         self.run_button.clicked.connect(self._run_query)
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.setToolTip("Abort the running query")
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.clicked.connect(self._cancel_query)
+        explain_button = QPushButton("Explain")
+        explain_button.setToolTip("Show the query plan without running the query (Ctrl+E)")
+        explain_button.clicked.connect(self._explain_query)
         export_button = QPushButton("Export Results")
         export_button.clicked.connect(self._export_results)
+        self.script_transaction_box = QCheckBox("Run scripts in one transaction")
+        self.script_transaction_box.setToolTip(
+            "Wrap multi-statement scripts in a single transaction: faster, and a failing statement rolls back "
+            "the whole script"
+        )
+        self.script_transaction_box.setChecked(self.settings.value("script_transaction", True, type=bool))
+        self.script_transaction_box.toggled.connect(
+            lambda checked: self.settings.setValue("script_transaction", checked)
+        )
         button_bar.addWidget(self.run_button)
+        button_bar.addWidget(self.cancel_button)
+        button_bar.addWidget(explain_button)
         button_bar.addWidget(export_button)
         button_bar.addStretch(1)
+        button_bar.addWidget(self.script_transaction_box)
         query_layout.addLayout(button_bar)
 
-        query_layout.addWidget(self.query_result_view)
+        self.query_result_view = QTableView()
+        self.query_result_view.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.query_result_view.setAlternatingRowColors(True)
+        result_header = self.query_result_view.horizontalHeader()
+        result_header.setStretchLastSection(True)
+        result_header.setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        result_header.sectionClicked.connect(self._on_result_header_clicked)
+
+        self.plan_view = QTreeWidget()
+        self.plan_view.setHeaderLabels(PLAN_COLUMNS)
+        self.plan_view.setAlternatingRowColors(True)
+        self.plan_view.itemActivated.connect(self._on_plan_item_activated)
+
+        self.messages_view = QTreeWidget()
+        self.messages_view.setHeaderLabels(MESSAGE_COLUMNS)
+        self.messages_view.setRootIsDecorated(False)
+        self.messages_view.setAlternatingRowColors(True)
+        self.messages_view.setUniformRowHeights(True)
+
+        self.console_results = QTabWidget()
+        self.console_results.addTab(self.query_result_view, "Results")
+        self.console_results.addTab(self.messages_view, "Messages")
+        self.console_results.addTab(self.plan_view, "Plan")
+        query_layout.addWidget(self.console_results)
+
+        self.query_status_label = QLabel("Ready")
         query_layout.addWidget(self.query_status_label)
 
-        right_tabs.addTab(query_tab, "SQL Console")
+        self._install_shortcuts()
+        self._tab_builders.pop(self.console_tab, None)
+        return self.query_editor
+
+    def _ensure_performance_panel(self) -> QTableView:
+        """Build the Performance tab listing instrumented console statements."""
+
+        if self.performance_view is not None:
+            return self.performance_view
+
+        layout = self.performance_tab.layout()
+        controls = QHBoxLayout()
+        self.performance_source = QComboBox()
+        self.performance_source.addItems(["This session", "Slowest logged statements"])
+        self.performance_source.currentIndexChanged.connect(self._refresh_performance_panel)
+        self.trace_check = QCheckBox("Trace statements")
+        self.trace_check.setToolTip("Record every statement SQLite runs, including those fired by triggers")
+        self.trace_check.setChecked(self.database_service.trace_statements)
+        self.trace_check.toggled.connect(self._toggle_statement_trace)
+        clear_button = QPushButton("Clear Session")
+        clear_button.clicked.connect(self._clear_performance_session)
+        controls.addWidget(self.performance_source)
+        controls.addWidget(self.trace_check)
+        controls.addStretch(1)
+        controls.addWidget(clear_button)
+        layout.addLayout(controls)
+
+        splitter = QSplitter(Qt.Orientation.Vertical)
+        self.performance_view = QTableView()
+        self.performance_view.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.performance_view.setSelectionMode(QTableView.SelectionMode.SingleSelection)
+        self.performance_view.setAlternatingRowColors(True)
+        self.performance_view.horizontalHeader().setStretchLastSection(True)
+        self.performance_detail = QPlainTextEdit()
+        self.performance_detail.setReadOnly(True)
+        self.performance_detail.setFont(self._fixed_font())
+        splitter.addWidget(self.performance_view)
+        splitter.addWidget(self.performance_detail)
+        splitter.setStretchFactor(0, 3)
+        splitter.setStretchFactor(1, 1)
+        layout.addWidget(splitter)
+
+        log = self.database_service.performance_log
+        log_label = QLabel(f"Log: {log.path}" if log is not None else "Log disabled")
+        log_label.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+        layout.addWidget(log_label)
 
-        self.status_bar = QStatusBar()
-        self.setStatusBar(self.status_bar)
+        self._tab_builders.pop(self.performance_tab, None)
+        self._refresh_performance_panel()
+        return self.performance_view
 
-        self.setCentralWidget(central)
+    def _refresh_performance_panel(self) -> None:
+        if self.performance_view is None:
+            return
+        log = self.database_service.performance_log
+        if self.performance_source.currentIndex() == 1 and log is not None:
+            stats = log.slowest(SLOWEST_LOGGED_STATEMENTS)
+            time_format = "%Y-%m-%d %H:%M:%S"
+        else:
+            stats = list(reversed(self.database_service.query_stats))
+            time_format = "%H:%M:%S"
+        self._performance_stats = stats
+        rows = [
+            (
+                time.strftime(time_format, time.localtime(item.started_at)),
+                "cached" if item.from_cache else item.status,
+                round(item.total_ms, 2),
+                round(item.prepare_ms, 2),
+                round(item.execute_ms, 2),
+                round(item.fetch_ms, 2),
+                item.rows,
+                round(item.rows_per_second),
+                item.vm_steps,
+                " ".join(item.sql.split()),
+            )
+            for item in stats
+        ]
+        model = QueryResultModel(QueryResult(PERFORMANCE_COLUMNS, rows), self.performance_view)
+        self._set_view_model(self.performance_view, model)
+        self.performance_view.selectionModel().currentRowChanged.connect(self._show_performance_detail)
+        self.performance_detail.clear()
+
+    def _show_performance_detail(self, current, _previous=None) -> None:
+        if not current.isValid() or current.row() >= len(self._performance_stats):
+            self.performance_detail.clear()
+            return
+        stats = self._performance_stats[current.row()]
+        lines = [stats.sql, ""]
+        if stats.database:
+            lines.append(f"Database: {stats.database}")
+        if stats.error:
+            lines.append(f"Error: {stats.error}")
+        if stats.trace:
+            lines.append("Trace:")
+            lines.extend(f"  {statement}" for statement in stats.trace)
+        self.performance_detail.setPlainText("\n".join(lines))
+
+    def _toggle_statement_trace(self, enabled: bool) -> None:
+        self.database_service.trace_statements = enabled
+        self.settings.setValue("trace_statements", enabled)
+
+    def _clear_performance_session(self) -> None:
+        self.database_service.query_stats.clear()
+        self._refresh_performance_panel()
+
+    def _performance_log_path(self) -> Path:
+        location = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppDataLocation)
+        return Path(location or Path.home() / ".sqliteview") / PERFORMANCE_LOG_NAME
 
     def _build_menus(self) -> None:
         menubar = self.menuBar()
@@ -156,9 +483,19 @@ class MainWindow(QMainWindow):
         open_action.triggered.connect(self._open_dialog)
         file_menu.addAction(open_action)
 
+        open_options_action = QAction("Open With &Options…", self)
+        open_options_action.setShortcut("Ctrl+Shift+O")
+        open_options_action.triggered.connect(self._open_with_options_dialog)
+        file_menu.addAction(open_options_action)
+
         self.recent_menu = QMenu("Open Recent", self)
         file_menu.addMenu(self.recent_menu)
 
+        import_action = QAction("&Import…", self)
+        import_action.setShortcut("Ctrl+I")
+        import_action.triggered.connect(self._import_file)
+        file_menu.addAction(import_action)
+
         close_action = QAction("Close Database", self)
         close_action.triggered.connect(self._close_database)
         file_menu.addAction(close_action)
@@ -179,40 +516,93 @@ class MainWindow(QMainWindow):
         self.toggle_dark_mode_action.toggled.connect(self._toggle_dark_mode)
         view_menu.addAction(self.toggle_dark_mode_action)
 
+        self.query_cache_action = QAction("Cache Query Results", self)
+        self.query_cache_action.setCheckable(True)
+        self.query_cache_action.setToolTip("Reuse results of read queries while the database is unchanged")
+        self.query_cache_action.toggled.connect(self._toggle_query_cache)
+        self.query_cache_action.setChecked(self.settings.value("query_cache", False, type=bool))
+        view_menu.addAction(self.query_cache_action)
+
+        self.spill_results_action = QAction("Spill Large Results to Disk", self)
+        self.spill_results_action.setCheckable(True)
+        self.spill_results_action.setToolTip(
+            "Keep results beyond the memory budget in a temporary file, so all rows can be browsed and sorted"
+        )
+        self.spill_results_action.setChecked(self.settings.value("spill_results", False, type=bool))
+        self.spill_results_action.toggled.connect(lambda checked: self.settings.setValue("spill_results", checked))
+        view_menu.addAction(self.spill_results_action)
+
+        result_budget_action = QAction("Result Memory Budget…", self)
+        result_budget_action.setToolTip("Stop fetching query results once they use this much memory")
+        result_budget_action.triggered.connect(self._set_result_budget)
+        view_menu.addAction(result_budget_action)
+
         refresh_action = QAction("Refresh Tables", self)
         refresh_action.setShortcut("Ctrl+R")
         refresh_action.triggered.connect(self._refresh_tables)
         view_menu.addAction(refresh_action)
 
+        tools_menu = menubar.addMenu("&Tools")
+        advisor_action = QAction("Index &Advisor…", self)
+        advisor_action.setToolTip("Suggest indexes for the statements run against this database")
+        advisor_action.triggered.connect(self._run_index_advisor)
+        tools_menu.addAction(advisor_action)
+
         help_menu = menubar.addMenu("&Help")
         about_action = QAction("About", self)
         about_action.triggered.connect(self._show_about_dialog)
         help_menu.addAction(about_action)
 
-        self._install_shortcuts()
-
     def _install_shortcuts(self) -> None:
         for shortcut_key in ("Ctrl+Return", "Ctrl+Enter", "F5"):
             shortcut = QShortcut(QKeySequence(shortcut_key), self.query_editor)
             shortcut.activated.connect(self._run_query)
+        explain_shortcut = QShortcut(QKeySequence("Ctrl+E"), self.query_editor)
+        explain_shortcut.activated.connect(self._explain_query)
 
     def _open_dialog(self) -> None:
-        path, _ = QFileDialog.getOpenFileName(self, "Open SQLite Database", str(Path.home()), "SQLite Database (*.db *.sqlite *.sqlite3);;All Files (*)")
+        path, _ = QFileDialog.getOpenFileName(self, "Open SQLite Database", str(Path.home()), DATABASE_FILE_FILTER)
         if path:
             self.open_database(path)
 
+    def _open_with_options_dialog(self) -> None:
+        dialog = OpenDatabaseDialog(self, self.database_service.path or "", self.open_options)
+        if dialog.exec() != OpenDatabaseDialog.DialogCode.Accepted or not dialog.selected_path():
+            return
+        self.open_options = dialog.options()
+        self.open_database(dialog.selected_path())
+
     def _toggle_dark_mode(self, checked: bool) -> None:
         self._set_theme(Theme.DARK if checked else Theme.LIGHT)
 
+    def _toggle_query_cache(self, enabled: bool) -> None:
+        self.database_service.enable_query_cache(DEFAULT_CACHE_BUDGET if enabled else None)
+        self.settings.setValue("query_cache", enabled)
+
+    def _set_result_budget(self) -> None:
+        current = self.database_service.result_budget_bytes // MIB
+        budget, accepted = QInputDialog.getInt(
+            self, "Result Memory Budget", "Keep up to this many MiB of query result rows:",
+            current, 1, MAX_RESULT_BUDGET_MIB,
+        )
+        if accepted:
+            self.database_service.result_budget_bytes = budget * MIB
+            self.settings.setValue("result_budget_mib", budget)
+
     def _set_theme(self, theme: Theme) -> None:
         self.current_theme = theme
         apply_theme(theme)
         save_theme_preference(theme)
-        self.highlighter.set_color_scheme(theme)
+        if self.highlighter is not None:
+            self.highlighter.set_color_scheme(theme)
+        if self._plan:
+            self._render_plan()
 
-    def open_database(self, path: str) -> None:
+    def open_database(self, path: str, options: Optional[OpenOptions] = None) -> None:
+        self._stop_background_work()
         try:
-            self.database_service.open(path)
+            self.database_service.open(path, options or self.open_options)
+            self.connection_label.setText(self.database_service.describe_settings())
         except DatabaseError as exc:
             QMessageBox.critical(self, "Unable to open database", str(exc))
             return
@@ -250,11 +640,30 @@ class MainWindow(QMainWindow):
             self.table_list.setCurrentRow(0)
 
     def _close_database(self) -> None:
+        self._stop_background_work()
         self.database_service.close()
+        self.connection_label.clear()
         self.table_list.clear()
-        self.table_view.setModel(None)
-        self.schema_view.clear()
-        self.query_result_view.setModel(None)
+        self._set_view_model(self.table_view, None)
+        self.preview_result = None
+        self._preview_table = None
+        self._preview_filter = None
+        self._preview_sort = None
+        self._sort_in_background = False
+        self._update_sort_indicator()
+        self.filter_edit.blockSignals(True)
+        self.filter_edit.clear()
+        self.filter_edit.blockSignals(False)
+        self._update_page_controls()
+        self._update_search_index_button()
+        self._schema_table = None
+        if self.schema_view is not None:
+            self.schema_view.clear()
+        if self.query_result_view is not None:
+            self._show_query_result(None, None)
+        self._plan = []
+        if self.plan_view is not None:
+            self.plan_view.clear()
         self.status_bar.showMessage("Database closed.", 3000)
         self.setWindowTitle("SQLite Viewer")
 
@@ -267,43 +676,539 @@ class MainWindow(QMainWindow):
         self._load_table_schema(table_name)
 
     def _load_table_preview(self, table_name: str) -> None:
+        if table_name != self._preview_table:
+            # Column filters and sorting belong to one table.
+            self._filter_timer.stop()
+            self.filter_edit.blockSignals(True)
+            self.filter_edit.clear()
+            self.filter_edit.blockSignals(False)
+            self._preview_filter = None
+            self._preview_sort = None
+            self._sort_in_background = False
+            self._update_sort_indicator()
+        self._preview_table = table_name
+        self._update_search_index_button()
+        self._load_preview_page("first")
+
+    def _apply_preview_filter(self) -> None:
+        self._filter_timer.stop()
+        table_name = self._preview_table
+        if table_name is None:
+            return
+        try:
+            columns = self.database_service.get_table_columns(table_name)
+        except DatabaseError as exc:
+            QMessageBox.critical(self, "Error", str(exc))
+            return
+        row_filter = PreviewFilter.parse(self.filter_edit.text(), columns)
+        self._preview_filter = row_filter if row_filter.active else None
+        self._load_preview_page("first")
+
+    def _on_preview_header_clicked(self, section: int) -> None:
+        """Cycle the clicked column through ascending, descending and unsorted."""
+
+        table_name = self._preview_table
+        result = self.preview_result
+        if table_name is None or result is None or not 0 <= section < len(result.columns):
+            self._update_sort_indicator()
+            return
+        column = result.columns[section]
+        current = self._preview_sort
+        if current is None or current.column != column:
+            sort: Optional[PreviewSort] = PreviewSort(column)
+        elif not current.descending:
+            sort = PreviewSort(column, descending=True)
+        else:
+            sort = None
+
+        background = False
+        if sort is not None:
+            try:
+                needs_sort = self.database_service.sort_needs_temp_btree(table_name, sort)
+                rows = 0
+                if needs_sort:
+                    rows = self.database_service.cached_row_count(table_name)
+                    if rows is None:
+                        rows = self.database_service.estimate_row_count(table_name) or 0
+            except DatabaseError as exc:
+                QMessageBox.critical(self, "Error", str(exc))
+                self._update_sort_indicator()
+                return
+            if rows >= LARGE_SORT_ROWS:
+                answer = QMessageBox.question(
+                    self,
+                    "Sort without index",
+                    f"No index on {table_name}.{column} can return rows in order, so SQLite sorts all "
+                    f"~{rows:,} rows for every page.\n\nCreate an index on the column to make this fast. "
+                    "Sort in the background anyway?",
+                )
+                if answer != QMessageBox.StandardButton.Yes:
+                    self._update_sort_indicator()
+                    return
+            background = needs_sort
+        self._preview_sort = sort
+        self._sort_in_background = background
+        self._update_sort_indicator()
+        self._load_preview_page("first")
+
+    def _update_sort_indicator(self) -> None:
+        header = self.table_view.horizontalHeader()
+        sort = self._preview_sort
+        columns = self.preview_result.columns if self.preview_result is not None else []
+        if sort is None or sort.column not in columns:
+            header.setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+            return
+        order = Qt.SortOrder.DescendingOrder if sort.descending else Qt.SortOrder.AscendingOrder
+        header.setSortIndicator(columns.index(sort.column), order)
+
+    def _open_cell_viewer(self, index: QModelIndex) -> None:
+        """Show the complete value of a preview cell, loading truncated values in the background."""
+
+        result = self.preview_result
+        table_name = self._preview_table
+        if result is None or table_name is None or not index.isValid() or self._cell_worker is not None:
+            return
+        value = result.rows[index.row()][index.column()]
+        column = result.columns[index.column()]
+        title = f"{table_name}.{column}"
+        if not isinstance(value, TruncatedValue):
+            CellViewerDialog(title, value, self).exec()
+            return
+        if not result.row_keys:
+            QMessageBox.information(
+                self, "Cell Viewer", f"'{table_name}' has no row key, so only the start of its values can be shown."
+            )
+            if not value.is_blob:
+                CellViewerDialog(f"{title} (start)", value.head, self).exec()
+            return
+
+        row_key = result.row_keys[index.row()]
+        progress_dialog = QProgressDialog(f"Loading {title}…", "Cancel", 0, value.size if value.is_blob else 0, self)
+        progress_dialog.setWindowTitle("Cell Viewer")
+        progress_dialog.setWindowModality(Qt.WindowModality.WindowModal)
+        progress_dialog.setMinimumDuration(500)
+        worker = Worker(
+            lambda task: self.database_service.read_value(
+                table_name, column, row_key, progress=task.report_progress, is_cancelled=task.is_cancelled
+            )
+        )
+        worker.signals.progress.connect(lambda read: progress_dialog.setValue(min(read, progress_dialog.maximum())))
+        worker.signals.finished.connect(
+            lambda full: self._on_cell_value_loaded(worker, progress_dialog, title, full)
+        )
+        worker.signals.failed.connect(lambda exc: self._on_cell_value_failed(worker, progress_dialog, exc))
+        progress_dialog.canceled.connect(worker.cancel)
+        self._cell_worker = worker
+        self.thread_pool.start(worker)
+
+    def _on_cell_value_loaded(self, worker: Worker, dialog: QProgressDialog, title: str, value: object) -> None:
+        dialog.reset()
+        dialog.deleteLater()
+        if worker is not self._cell_worker:
+            return
+        self._cell_worker = None
+        CellViewerDialog(title, value, self).exec()
+
+    def _on_cell_value_failed(self, worker: Worker, dialog: QProgressDialog, exc: Exception) -> None:
+        dialog.reset()
+        dialog.deleteLater()
+        if worker is not self._cell_worker:
+            return
+        self._cell_worker = None
+        if isinstance(exc, QueryCancelledError):
+            self.status_bar.showMessage("Loading the value was cancelled.", 4000)
+            return
+        QMessageBox.critical(self, "Error", str(exc))
+
+    def _update_search_index_button(self) -> None:
+        index = self.database_service.search_index
+        table_name = self._preview_table
+        supported = (
+            index is not None
+            and table_name is not None
+            and self._search_index_worker is None
+            and self.database_service.path is not None
+            and index.supports(table_name)
+        )
+        self.search_index_button.setEnabled(supported)
+        state = index.state(table_name) if supported else None
+        self.search_index_button.setText(
+            "Rebuild Search Index" if state in (READY, STALE) else "Build Search Index"
+        )
+        self.search_index_button.setToolTip(SEARCH_INDEX_TOOLTIPS.get(state, SEARCH_INDEX_TOOLTIPS[None]))
+
+    def _build_search_index(self) -> None:
+        index = self.database_service.search_index
+        table_name = self._preview_table
+        if index is None or table_name is None or self._search_index_worker is not None:
+            return
+        if not index.available():
+            QMessageBox.information(
+                self, "Search Index", "This SQLite build does not include FTS5 with the trigram tokenizer."
+            )
+            return
+
+        total = self.database_service.cached_row_count(table_name)
+        if total is None:
+            total = self.database_service.estimate_row_count(table_name)
+        progress_dialog = QProgressDialog(f"Indexing {table_name}…", "Cancel", 0, total or 0, self)
+        progress_dialog.setWindowTitle("Search Index")
+        progress_dialog.setWindowModality(Qt.WindowModality.WindowModal)
+        progress_dialog.setMinimumDuration(500)
+
+        worker = Worker(
+            lambda task: index.build(table_name, progress=task.report_progress, is_cancelled=task.is_cancelled)
+        )
+        worker.signals.progress.connect(
+            lambda rows: (
+                progress_dialog.setValue(min(rows, progress_dialog.maximum()) if progress_dialog.maximum() else 0),
+                progress_dialog.setLabelText(f"Indexing {table_name}… {rows:,} rows"),
+            )
+        )
+        worker.signals.finished.connect(
+            lambda rows: self._on_search_index_finished(progress_dialog, table_name, rows)
+        )
+        worker.signals.failed.connect(lambda exc: self._on_search_index_failed(progress_dialog, exc))
+        progress_dialog.canceled.connect(worker.cancel)
+        self._search_index_worker = worker
+        self.search_index_button.setEnabled(False)
+        self.thread_pool.start(worker)
+
+    def _on_search_index_finished(self, dialog: QProgressDialog, table_name: str, rows: int) -> None:
+        self._search_index_worker = None
+        dialog.reset()
+        dialog.deleteLater()
+        self._update_search_index_button()
+        self.status_bar.showMessage(f"Indexed {rows:,} rows of {table_name} for search.", 5000)
+        if table_name == self._preview_table and self._preview_filter is not None:
+            self._load_preview_page("first")
+
+    def _on_search_index_failed(self, dialog: QProgressDialog, exc: Exception) -> None:
+        self._search_index_worker = None
+        dialog.reset()
+        dialog.deleteLater()
+        self._update_search_index_button()
+        if isinstance(exc, QueryCancelledError):
+            self.status_bar.showMessage("Indexing cancelled.", 4000)
+            return
+        QMessageBox.critical(self, "Indexing failed", str(exc))
+
+    def _load_preview_page(self, page: str) -> None:
+        """Load the first/previous/next/last page of the previewed table."""
+
+        table_name = self._preview_table
+        if table_name is None:
+            return
+        current = self.preview_result if page in ("previous", "next") else None
+        kwargs: dict = {}
+        if page == "last":
+            kwargs["last"] = True
+        elif current is not None and page == "next":
+            if current.row_keys:
+                kwargs["after"] = current.row_keys[-1]
+            else:
+                kwargs["offset"] = (current.offset or 0) + DEFAULT_ROW_LIMIT
+        elif current is not None and page == "previous":
+            if current.row_keys:
+                kwargs["before"] = current.row_keys[0]
+            else:
+                kwargs["offset"] = max(0, (current.offset or 0) - DEFAULT_ROW_LIMIT)
+
+        row_filter = self._preview_filter
+        sort = self._preview_sort
+
+        def fetch() -> Tuple[QueryResult, Optional[int]]:
+            result = self.database_service.get_table_preview(
+                table_name, exact_count=False, row_filter=row_filter, sort=sort, **kwargs
+            )
+            estimate = None
+            if result.row_count is None and row_filter is None:
+                estimate = self.database_service.estimate_row_count(table_name)
+            return result, estimate
+
+        if self._preview_worker is not None:
+            # A newer page (or another table) supersedes a page still being sorted.
+            self._preview_worker.cancel()
+            self._preview_worker = None
+        if sort is not None and self._sort_in_background:
+            worker = Worker(lambda task: fetch())
+            worker.signals.finished.connect(lambda value: self._on_preview_page_loaded(worker, page, *value))
+            worker.signals.failed.connect(lambda exc: self._on_preview_page_failed(worker, exc))
+            self._preview_worker = worker
+            self._update_page_controls()
+            self.status_bar.showMessage(f"Sorting {table_name} by {sort.column}…")
+            self.thread_pool.start(worker)
+            return
         try:
-            result = self.database_service.get_table_preview(table_name)
+            result, estimate = fetch()
         except DatabaseError as exc:
             QMessageBox.critical(self, "Error", str(exc))
             return
+        self._show_preview_page(page, result, estimate)
+
+    def _on_preview_page_loaded(
+        self, worker: Worker, page: str, result: QueryResult, estimate: Optional[int]
+    ) -> None:
+        if worker is not self._preview_worker:
+            return
+        self._preview_worker = None
+        self._show_preview_page(page, result, estimate)
 
+    def _on_preview_page_failed(self, worker: Worker, exc: Exception) -> None:
+        if worker is not self._preview_worker:
+            return
+        self._preview_worker = None
+        self._update_page_controls()
+        QMessageBox.critical(self, "Error", str(exc))
+
+    def _show_preview_page(self, page: str, result: QueryResult, estimate: Optional[int]) -> None:
+        table_name = self._preview_table
+        row_filter = self._preview_filter
+        if page == "first":
+            self._preview_page = 1
+        elif page == "last":
+            self._preview_page = self._page_count(result)
+        elif self._preview_page is not None:
+            self._preview_page += 1 if page == "next" else -1
+            if not result.has_previous:
+                self._preview_page = 1
+
+        self.preview_result = result
         self._populate_table(self.table_view, result)
+        self._update_sort_indicator()
+        self._update_page_controls()
+
         message = f"Loaded {table_name}"
+        if row_filter is not None:
+            message += " — filtered"
+        if self._preview_sort is not None:
+            sort = self._preview_sort
+            message += f" — sorted by {sort.column} {'descending' if sort.descending else 'ascending'}"
         if result.row_count is not None:
-            message += f" — {result.row_count} rows"
-        if result.truncated:
-            message += " (showing first chunk)"
+            message += f" — {result.row_count} {'matching ' if row_filter is not None else ''}rows"
+        elif estimate is not None:
+            message += f" — ~{estimate} rows (estimate, counting…)"
+        if result.truncated or result.has_previous:
+            message += f" (page {self._preview_page})" if self._preview_page else " (partial)"
         self.status_bar.showMessage(message, 5000)
+        if result.row_count is None:
+            self._start_row_count(table_name, row_filter)
+
+    def _start_row_count(self, table_name: str, row_filter: Optional[PreviewFilter] = None) -> None:
+        """Count (matching) rows of ``table_name`` in the background and update the status bar."""
+
+        if self._count_worker is not None:
+            self._count_worker.cancel()
+        # A superseded count is interrupted rather than left to scan the whole table.
+        worker = Worker(lambda task: self.database_service.count_rows(table_name, row_filter, task.is_cancelled))
+        worker.signals.finished.connect(
+            lambda count: self._on_row_count_finished(worker, table_name, count, row_filter)
+        )
+        worker.signals.failed.connect(lambda exc: self._on_row_count_failed(worker))
+        self._count_worker = worker
+        self.thread_pool.start(worker)
+
+    def _on_row_count_finished(
+        self, worker: Worker, table_name: str, count: int, row_filter: Optional[PreviewFilter] = None
+    ) -> None:
+        if worker is not self._count_worker:
+            return
+        self._count_worker = None
+        if (
+            worker.is_cancelled()
+            or table_name != self._preview_table
+            or row_filter != self._preview_filter
+            or self.preview_result is None
+        ):
+            return
+        self.preview_result.row_count = count
+        if self._preview_page is None and not self.preview_result.truncated:
+            self._preview_page = self._page_count(self.preview_result)
+        self._update_page_controls()
+        matching = "matching " if row_filter is not None else ""
+        self.status_bar.showMessage(f"{table_name} — {count} {matching}rows", 5000)
+
+    def _on_row_count_failed(self, worker: Worker) -> None:
+        if worker is self._count_worker:
+            self._count_worker = None
+
+    def _page_count(self, result: QueryResult) -> Optional[int]:
+        if result.row_count is None:
+            return None
+        return max(1, -(-result.row_count // DEFAULT_ROW_LIMIT))
+
+    def _update_page_controls(self) -> None:
+        result = self.preview_result
+        idle = self._preview_worker is None
+        has_previous = idle and result is not None and result.has_previous
+        has_next = idle and result is not None and result.truncated
+        self.first_page_button.setEnabled(has_previous)
+        self.previous_page_button.setEnabled(has_previous)
+        self.next_page_button.setEnabled(has_next)
+        self.last_page_button.setEnabled(has_next)
+
+        if result is None:
+            self.page_label.setText("")
+            return
+        text = f"Page {self._preview_page or '?'}"
+        total = self._page_count(result)
+        if total is not None:
+            text += f" of {total}"
+        self.page_label.setText(text)
 
     def _load_table_schema(self, table_name: str) -> None:
+        self._schema_table = table_name
+        if self.schema_view is None:
+            # Loaded when the Schema tab is first shown.
+            return
         try:
             schema = self.database_service.get_table_schema(table_name)
+            indexes = self.database_service.catalog.indexes(table_name)
         except DatabaseError as exc:
             QMessageBox.warning(self, "Schema unavailable", str(exc))
             schema = "Schema information not found."
-        self.schema_view.setPlainText(schema)
+            indexes = []
+        definitions = [
+            index.sql if index.sql else f"-- {index.name}: automatic index on ({', '.join(map(str, index.columns))})"
+            for index in indexes
+        ]
+        self.schema_view.setPlainText("\n\n".join([schema, *definitions]))
+
+    def _show_query_result(self, result: Optional[QueryResult], sql: Optional[str]) -> None:
+        """Show a console result (or clear it with None), resetting its sort."""
+
+        self.query_result = result
+        self.query_result_sql = sql
+        self._result_rows = result.rows if result is not None and isinstance(result.rows, SpilledRows) else None
+        self._result_sort = None
+        if result is None:
+            self._set_view_model(self.query_result_view, None)
+        else:
+            self._populate_table(self.query_result_view, result)
+        self._update_result_sort_indicator()
+
+    def _on_result_header_clicked(self, section: int) -> None:
+        """Cycle a spilled result through ascending, descending and unsorted by the clicked column."""
+
+        rows = self._result_rows
+        result = self.query_result
+        if rows is None or result is None or self._result_sort_worker is not None:
+            return
+        current = self._result_sort
+        if current is None or current[0] != section:
+            sort: Optional[Tuple[int, bool]] = (section, False)
+        elif not current[1]:
+            sort = (section, True)
+        else:
+            sort = None
+        if sort is None:
+            self._on_result_sorted(None, sort, rows)
+            return
+
+        column, descending = sort
+        worker = Worker(
+            lambda task: self.database_service.sort_spilled_rows(rows, column, descending, task.is_cancelled)
+        )
+        worker.signals.finished.connect(lambda sorted_rows: self._on_result_sorted(worker, sort, sorted_rows))
+        worker.signals.failed.connect(lambda exc: self._on_result_sort_failed(worker, exc))
+        self._result_sort_worker = worker
+        self._update_result_sort_indicator()
+        self.status_bar.showMessage(f"Sorting {len(rows):,} rows by {result.columns[column]}…")
+        self.thread_pool.start(worker)
+
+    def _on_result_sorted(
+        self, worker: Optional[Worker], sort: Optional[Tuple[int, bool]], rows: SpilledRows
+    ) -> None:
+        if worker is not self._result_sort_worker or self.query_result is None:
+            return
+        self._result_sort_worker = None
+        self._result_sort = sort
+        self.query_result = dataclasses.replace(self.query_result, rows=rows)
+        self._populate_table(self.query_result_view, self.query_result)
+        self._update_result_sort_indicator()
+        self.status_bar.clearMessage()
+
+    def _on_result_sort_failed(self, worker: Worker, exc: Exception) -> None:
+        if worker is not self._result_sort_worker:
+            return
+        self._result_sort_worker = None
+        self._update_result_sort_indicator()
+        if isinstance(exc, QueryCancelledError):
+            self.status_bar.showMessage("Sorting cancelled.", 4000)
+            return
+        self.status_bar.clearMessage()
+        QMessageBox.critical(self, "Error", str(exc))
+
+    def _update_result_sort_indicator(self) -> None:
+        header = self.query_result_view.horizontalHeader()
+        sortable = self._result_rows is not None
+        header.setSectionsClickable(sortable and self._result_sort_worker is None)
+        header.setSortIndicatorShown(sortable)
+        sort = self._result_sort
+        if sort is None:
+            header.setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        else:
+            header.setSortIndicator(sort[0], Qt.SortOrder.DescendingOrder if sort[1] else Qt.SortOrder.AscendingOrder)
 
     def _populate_table(self, view: QTableView, result: QueryResult) -> None:
-        from PyQt6.QtGui import QStandardItem, QStandardItemModel
+        self._set_view_model(view, QueryResultModel(result, view))
 
-        model = QStandardItemModel()
-        model.setHorizontalHeaderLabels(result.columns)
-        for row in result.rows:
-            items = [QStandardItem(str(value) if value is not None else "NULL") for value in row]
-            model.appendRow(items)
+    def _set_view_model(self, view: QTableView, model: Optional[QueryResultModel]) -> None:
+        previous = view.model()
         view.setModel(model)
+        if previous is not None:
+            previous.deleteLater()
 
     def _run_query(self) -> None:
+        if self._query_worker is not None:
+            return
         query = self.query_editor.toPlainText()
+        statements = split_statements(query)
+        if not self._confirm_destructive(statements or [query]):
+            return
 
-        is_destructive, reason = self.database_service.is_destructive_query(query)
-        if is_destructive:
+        if len(statements) > 1:
+            transaction = self.script_transaction_box.isChecked()
+            worker = Worker(
+                lambda task: self.database_service.execute_script(
+                    query, transaction=transaction, progress=task.report_progress, is_cancelled=task.is_cancelled
+                )
+            )
+            worker.signals.progress.connect(self._on_script_progress)
+            worker.signals.finished.connect(lambda script: self._on_script_finished(worker, statements, script))
+            worker.signals.failed.connect(lambda exc: self._on_script_failed(worker, statements, exc))
+        else:
+            spill = self.spill_results_action.isChecked()
+            worker = Worker(
+                lambda task: self.database_service.execute_query(query, progress=task.report_progress, spill=spill)
+            )
+            worker.signals.progress.connect(self._on_query_progress)
+            worker.signals.finished.connect(lambda result: self._on_query_finished(worker, query, result))
+            worker.signals.failed.connect(lambda exc: self._on_query_failed(worker, exc))
+        self.messages_view.clear()
+        if self._result_sort_worker is not None:
+            self._result_sort_worker.cancel()
+            self._result_sort_worker = None
+        self._query_worker = worker
+        self._query_rows_fetched = 0
+        self._script_total = len(statements) if len(statements) > 1 else 0
+        self._script_done = 0
+        self._query_elapsed.start()
+        self._query_status_timer.start()
+        self.run_button.setEnabled(False)
+        self.cancel_button.setEnabled(True)
+        self._update_running_query_status()
+        self.thread_pool.start(worker)
+
+    def _confirm_destructive(self, statements: List[str]) -> bool:
+        """Ask before running a statement that drops objects or deletes every row."""
+
+        for number, statement in enumerate(statements, 1):
+            is_destructive, reason = self.database_service.is_destructive_query(statement)
+            if not is_destructive:
+                continue
+            if len(statements) > 1:
+                reason = f"Statement {number}: {reason}"
             reply = QMessageBox.warning(
                 self,
                 "Potentially destructive operation",
@@ -311,33 +1216,248 @@ class MainWindow(QMainWindow):
                 QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
                 QMessageBox.StandardButton.No,
             )
-            if reply != QMessageBox.StandardButton.Yes:
-                return
+            return reply == QMessageBox.StandardButton.Yes
+        return True
 
-        try:
-            result = self.database_service.execute_query(query)
-        except DatabaseError as exc:
-            QMessageBox.critical(self, "Query failed", str(exc))
+    def _cancel_query(self) -> None:
+        if self._query_worker is None:
+            return
+        self._query_worker.cancel()
+        self.database_service.interrupt_query()
+        self.query_status_label.setText("Cancelling…")
+
+    def _on_query_progress(self, rows_fetched: int) -> None:
+        self._query_rows_fetched = rows_fetched
+
+    def _update_running_query_status(self) -> None:
+        seconds = self._query_elapsed.elapsed() / 1000
+        if self._script_total:
+            current = min(self._script_done + 1, self._script_total)
+            self.query_status_label.setText(
+                f"Running… {seconds:.1f} s — statement {current} of {self._script_total}"
+            )
+            return
+        self.query_status_label.setText(
+            f"Running… {seconds:.1f} s — {self._query_rows_fetched} row(s) fetched"
+        )
+
+    def _finish_query(self) -> float:
+        """Reset running-query state and return the elapsed time in seconds."""
+
+        self._query_status_timer.stop()
+        self._query_worker = None
+        self._script_total = 0
+        self.run_button.setEnabled(True)
+        self.cancel_button.setEnabled(False)
+        return self._query_elapsed.elapsed() / 1000
+
+    def _on_query_failed(self, worker: Worker, exc: Exception) -> None:
+        if worker is not self._query_worker:
+            return
+        seconds = self._finish_query()
+        if isinstance(exc, QueryCancelledError):
+            self.query_status_label.setText(f"Query cancelled after {seconds:.2f} s")
+            self.status_bar.showMessage("Query cancelled.", 4000)
+            self._refresh_performance_panel()
             return
+        self.query_status_label.setText(f"Query failed after {seconds:.2f} s")
+        self._refresh_performance_panel()
+        QMessageBox.critical(self, "Query failed", str(exc))
 
+    def _on_query_finished(self, worker: Worker, query: str, result: QueryResult) -> None:
+        if worker is not self._query_worker:
+            return
+        seconds = self._finish_query()
         if result.is_write_operation:
-            self.query_result = None
-            self.query_result_view.setModel(None)
+            self._show_query_result(None, None)
             if result.affected_rows is not None:
                 status = f"{result.affected_rows} row(s) affected"
             else:
                 status = "Statement executed successfully"
-            self.query_status_label.setText(status)
+            self.query_status_label.setText(f"{status} in {seconds:.2f} s")
             self.status_bar.showMessage("Statement executed successfully.", 4000)
             self._refresh_after_write(query)
         else:
-            self.query_result = result
-            self._populate_table(self.query_result_view, result)
-            status = f"Returned {len(result.rows)} row(s)"
+            writes = self.database_service.modifies_data(query)
+            # RETURNING rows of a write are shown, but never re-run for export.
+            self._show_query_result(result, None if writes else query)
+            self.console_results.setCurrentWidget(self.query_result_view)
+            status = f"Returned {len(result.rows):,} row(s)"
             if result.truncated:
-                status += " (truncated)"
+                budget = format_size(self.database_service.result_budget_bytes)
+                status += f" (truncated at the {budget} result memory budget)"
+            status += f" in {seconds:.2f} s"
+            if result.size_bytes is not None:
+                status += f" · {format_size(result.size_bytes)} in memory"
+            elif isinstance(result.rows, SpilledRows):
+                status += f" · spilled to disk ({format_size(result.rows.file_size)}), click a header to sort"
+            if result.stats is not None and not result.from_cache:
+                status += f" · {result.stats.rows_per_second:,.0f} rows/s · {result.stats.vm_steps:,} VM steps"
+            cache = self.database_service.query_cache
+            if cache is not None:
+                status += " — cache hit" if result.from_cache else " — cache miss"
+                status += f" ({cache.hits} hits, {cache.misses} misses, {cache.size_bytes / 1048576:.1f} MiB)"
             self.query_status_label.setText(status)
             self.status_bar.showMessage("Query executed successfully.", 4000)
+            if writes:
+                self._refresh_after_write(query)
+        self._refresh_performance_panel()
+
+    def _on_script_progress(self, item: StatementResult) -> None:
+        self._script_done = item.number
+        stats = item.stats
+        rows = item.affected_rows if item.affected_rows is not None else item.rows
+        preview = item.sql.splitlines()[0][:MESSAGE_SQL_PREVIEW]
+        if preview != item.sql:
+            preview += "…"
+        row = QTreeWidgetItem(
+            self.messages_view,
+            [
+                str(item.number),
+                item.status if item.error is None else f"{item.status}: {item.error}",
+                str(rows) if item.status == "ok" else "",
+                f"{stats.total_ms:.1f}" if stats is not None else "",
+                preview,
+            ],
+        )
+        row.setToolTip(4, item.sql[:MESSAGE_SQL_PREVIEW * 10])
+        if item.status != "ok":
+            brush = QBrush(QColor(PLAN_WARNING_COLORS[self.current_theme]))
+            for column in range(len(MESSAGE_COLUMNS)):
+                row.setForeground(column, brush)
+            self.messages_view.scrollToItem(row)
+
+    def _on_script_finished(self, worker: Worker, statements: List[str], script: ScriptResult) -> None:
+        if worker is not self._query_worker:
+            return
+        seconds = self._finish_query()
+        for column in range(len(MESSAGE_COLUMNS) - 1):
+            self.messages_view.resizeColumnToContents(column)
+        if script.result is not None:
+            self._show_query_result(script.result, script.result_sql)
+            self.console_results.setCurrentWidget(self.query_result_view)
+        else:
+            self._show_query_result(None, None)
+            self.console_results.setCurrentWidget(self.messages_view)
+        status = f"{len(script.statements)} statement(s) executed in {seconds:.2f} s"
+        status += " in one transaction" if script.transaction else ""
+        status += f" · {script.affected_rows} row(s) affected"
+        if script.result is not None:
+            status += f" · last result {len(script.result.rows)} row(s)"
+            if script.result.truncated:
+                status += " (truncated)"
+            if script.result.size_bytes is not None:
+                status += f", {format_size(script.result.size_bytes)} in memory"
+        self.query_status_label.setText(status)
+        self.status_bar.showMessage("Script executed successfully.", 4000)
+        self._refresh_after_script(statements)
+        self._refresh_performance_panel()
+
+    def _on_script_failed(self, worker: Worker, statements: List[str], exc: Exception) -> None:
+        if worker is not self._query_worker:
+            return
+        self.console_results.setCurrentWidget(self.messages_view)
+        # Without a wrapping transaction the statements before the failure stay applied.
+        self._refresh_after_script(statements)
+        self._on_query_failed(worker, exc)
+
+    def _refresh_after_script(self, statements: List[str]) -> None:
+        """Refresh UI panels once for the most far-reaching statement of a script."""
+
+        kinds = {self.database_service.classify_query(statement): statement for statement in reversed(statements)}
+        for kind in ("ddl", "dml"):
+            if kind in kinds:
+                self._refresh_after_write(kinds[kind])
+                return
+
+    def _explain_query(self) -> None:
+        query = self.query_editor.toPlainText()
+        try:
+            self._plan = self.database_service.explain_query_plan(query)
+        except DatabaseError as exc:
+            QMessageBox.warning(self, "Explain failed", str(exc))
+            return
+        self._render_plan()
+        self.console_results.setCurrentWidget(self.plan_view)
+        flagged = sum(1 for root in self._plan for node in root.walk() if node.warning)
+        steps = sum(1 for root in self._plan for _ in root.walk())
+        self.query_status_label.setText(f"Query plan: {steps} step(s), {flagged} flagged")
+
+    def _render_plan(self) -> None:
+        """Fill the Plan tab from ``self._plan``; flagged steps are drawn in the warning colour."""
+
+        if self.plan_view is None:
+            return
+        self.plan_view.clear()
+        warning_brush = QBrush(QColor(PLAN_WARNING_COLORS[self.current_theme]))
+        bold = self.plan_view.font()
+        bold.setBold(True)
+
+        def add(node: PlanNode, parent) -> None:
+            available = ", ".join(index.name for index in node.indexes)
+            item = QTreeWidgetItem(parent, [node.detail, node.table or "", node.index or "", available])
+            item.setData(0, Qt.ItemDataRole.UserRole, node.table)
+            warning = node.warning
+            if warning:
+                for column in range(len(PLAN_COLUMNS)):
+                    item.setForeground(column, warning_brush)
+                item.setFont(0, bold)
+                item.setToolTip(0, warning)
+            for index in node.indexes:
+                columns = ", ".join(column or "<expression>" for column in index.columns)
+                flags = [flag for flag, enabled in (("unique", index.unique), ("partial", index.partial)) if enabled]
+                label = f"index {index.name} ({columns})" + (f" [{', '.join(flags)}]" if flags else "")
+                index_item = QTreeWidgetItem(item, [label, node.table or "", "", ""])
+                index_item.setData(0, Qt.ItemDataRole.UserRole, node.table)
+                index_item.setToolTip(0, index.sql or "Created automatically for a PRIMARY KEY or UNIQUE constraint")
+                if index.name == node.index:
+                    index_item.setFont(0, bold)
+            for child in node.children:
+                add(child, item)
+            # Plan steps start expanded; index lists start collapsed.
+            item.setExpanded(bool(node.children))
+
+        for root in self._plan:
+            add(root, self.plan_view)
+        self.plan_view.resizeColumnToContents(0)
+
+    def _on_plan_item_activated(self, item: QTreeWidgetItem, _column: int) -> None:
+        table_name = item.data(0, Qt.ItemDataRole.UserRole)
+        if not table_name:
+            return
+        matches = self.table_list.findItems(table_name, Qt.MatchFlag.MatchExactly)
+        if matches:
+            self.table_list.setCurrentItem(matches[0])
+        self._load_table_schema(table_name)
+        self.right_tabs.setCurrentWidget(self.schema_tab)
+
+    def _stop_background_work(self) -> None:
+        """Abort running background work and wait for it before touching the connection."""
+
+        workers = (
+            self._query_worker,
+            self._count_worker,
+            self._preview_worker,
+            self._export_worker,
+            self._import_worker,
+            self._advisor_worker,
+            self._search_index_worker,
+            self._cell_worker,
+            self._result_sort_worker,
+        )
+        running = [worker for worker in workers if worker is not None]
+        for worker in running:
+            worker.cancel()
+        if running:
+            self.database_service.interrupt()
+        self.thread_pool.waitForDone()
+        self._count_worker = None
+        self._preview_worker = None
+        self._cell_worker = None
+        self._result_sort_worker = None
+        if self._query_worker is not None:
+            self._finish_query()
+            self.query_status_label.setText("Ready")
 
     def _refresh_after_write(self, sql: str) -> None:
         """Refresh UI panels after a write operation."""
@@ -352,7 +1472,7 @@ class MainWindow(QMainWindow):
                 table_name = selected_items[0].text()
                 self._load_table_preview(table_name)
                 self._load_table_schema(table_name)
-        elif query_type == "dml":
+        elif query_type == "dml" or self.database_service.modifies_data(sql):
             selected_items = self.table_list.selectedItems()
             if selected_items:
                 table_name = selected_items[0].text()
@@ -362,21 +1482,232 @@ class MainWindow(QMainWindow):
         if not self.query_result or not self.query_result.columns:
             QMessageBox.information(self, "Export", "No query results to export.")
             return
+        if not self.query_result_sql:
+            QMessageBox.information(
+                self,
+                "Export",
+                "Results of statements that change data cannot be exported: exporting runs the query again.",
+            )
+            return
+        if self._export_worker is not None:
+            return
+
+        from .export import EXPORT_FORMATS, export_query, format_for_path
 
-        path, _ = QFileDialog.getSaveFileName(self, "Export to CSV", str(Path.home() / "query_results.csv"), "CSV Files (*.csv)")
+        filters = ";;".join(f"{label} Files (*.{fmt})" for fmt, label in EXPORT_FORMATS.items())
+        path, selected_filter = QFileDialog.getSaveFileName(
+            self, "Export Results", str(Path.home() / "query_results.csv"), filters
+        )
+        if not path:
+            return
+        default_format = next(
+            (fmt for fmt, label in EXPORT_FORMATS.items() if selected_filter.startswith(label)), "csv"
+        )
+        fmt = format_for_path(path, default_format)
+        sql = self.query_result_sql
+
+        progress_dialog = QProgressDialog("Exporting results…", "Cancel", 0, 0, self)
+        progress_dialog.setWindowTitle("Export Results")
+        progress_dialog.setWindowModality(Qt.WindowModality.WindowModal)
+        progress_dialog.setMinimumDuration(0)
+
+        worker = Worker(
+            lambda task: export_query(
+                self.database_service,
+                sql,
+                path,
+                fmt,
+                progress=task.report_progress,
+                is_cancelled=task.is_cancelled,
+            )
+        )
+        worker.signals.progress.connect(
+            lambda progress: progress_dialog.setLabelText(self._format_export_progress(progress))
+        )
+        worker.signals.finished.connect(lambda stats: self._on_export_finished(progress_dialog, path, stats))
+        worker.signals.failed.connect(lambda exc: self._on_export_failed(progress_dialog, exc))
+        progress_dialog.canceled.connect(worker.cancel)
+        self._export_worker = worker
+        self.thread_pool.start(worker)
+
+    def _format_export_progress(self, progress: ExportProgress) -> str:
+        return f"Exported {progress.rows_written} row(s) — {progress.rows_per_second:,.0f} rows/s"
+
+    def _on_export_finished(self, dialog: QProgressDialog, path: str, stats: ExportProgress) -> None:
+        self._export_worker = None
+        dialog.reset()
+        dialog.deleteLater()
+        self.status_bar.showMessage(
+            f"Exported {stats.rows_written} row(s) to {path} in {stats.elapsed:.2f} s", 5000
+        )
+
+    def _on_export_failed(self, dialog: QProgressDialog, exc: Exception) -> None:
+        self._export_worker = None
+        dialog.reset()
+        dialog.deleteLater()
+        if isinstance(exc, QueryCancelledError):
+            self.status_bar.showMessage("Export cancelled.", 4000)
+            return
+        QMessageBox.critical(self, "Export failed", str(exc))
+
+    def _import_file(self) -> None:
+        if self.database_service.path is None:
+            QMessageBox.information(self, "Import", "Open a database before importing data.")
+            return
+        if self._import_worker is not None:
+            return
+        busy = [
+            label
+            for label, worker in (
+                ("query", self._query_worker),
+                ("export", self._export_worker),
+                ("index advisor", self._advisor_worker),
+                ("search indexing", self._search_index_worker),
+            )
+            if worker is not None
+        ]
+        if busy:
+            QMessageBox.information(
+                self, "Import", f"Cancel or wait for the running {' and '.join(busy)} before importing."
+            )
+            return
+
+        from .importer import IMPORT_FORMATS, import_file
+
+        filters = ";;".join(f"{label} Files (*.{fmt})" for fmt, label in IMPORT_FORMATS.items())
+        path, _ = QFileDialog.getOpenFileName(self, "Import Data", str(Path.home()), f"{filters};;All Files (*)")
         if not path:
             return
 
         try:
-            with open(path, "w", newline="", encoding="utf-8") as csv_file:
-                writer = csv.writer(csv_file)
-                writer.writerow(self.query_result.columns)
-                writer.writerows(self.query_result.rows)
-        except OSError as exc:
-            QMessageBox.critical(self, "Export failed", str(exc))
+            tables = self.database_service.list_tables()
+        except DatabaseError as exc:
+            QMessageBox.critical(self, "Import failed", str(exc))
+            return
+        table_name, accepted = QInputDialog.getItem(
+            self, "Import Data", "Target table (created if missing):", [Path(path).stem] + tables, 0, True
+        )
+        table_name = table_name.strip()
+        if not accepted or not table_name:
+            return
+        fast = (
+            QMessageBox.question(
+                self,
+                "Import Data",
+                "Use fast mode?\n\nJournaling and fsync are relaxed during the import. "
+                "Faster, but a crash mid-import can damage the database.",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+                QMessageBox.StandardButton.No,
+            )
+            == QMessageBox.StandardButton.Yes
+        )
+
+        # Only the row count and preview are invalidated by the import; other work keeps running.
+        for worker in (self._count_worker, self._preview_worker):
+            if worker is not None:
+                worker.cancel()
+        self._count_worker = None
+        self._preview_worker = None
+        self._update_page_controls()
+        progress_dialog = QProgressDialog("Importing…", "Cancel", 0, 0, self)
+        progress_dialog.setWindowTitle("Import Data")
+        progress_dialog.setWindowModality(Qt.WindowModality.WindowModal)
+        progress_dialog.setMinimumDuration(0)
+
+        worker = Worker(
+            lambda task: import_file(
+                self.database_service,
+                path,
+                table_name,
+                fast=fast,
+                progress=task.report_progress,
+                is_cancelled=task.is_cancelled,
+            )
+        )
+        worker.signals.progress.connect(
+            lambda progress: progress_dialog.setLabelText(self._format_import_progress(progress))
+        )
+        worker.signals.finished.connect(lambda stats: self._on_import_finished(progress_dialog, table_name, stats))
+        worker.signals.failed.connect(lambda exc: self._on_import_failed(progress_dialog, exc))
+        progress_dialog.canceled.connect(worker.cancel)
+        self._import_worker = worker
+        self.thread_pool.start(worker)
+
+    def _format_import_progress(self, progress: ImportProgress) -> str:
+        return f"Imported {progress.rows_imported} row(s) — {progress.rows_per_second:,.0f} rows/s"
+
+    def _on_import_finished(self, dialog: QProgressDialog, table_name: str, stats: ImportProgress) -> None:
+        self._import_worker = None
+        dialog.reset()
+        dialog.deleteLater()
+        self.status_bar.showMessage(
+            f"Imported {stats.rows_imported} row(s) into {table_name} in {stats.elapsed:.2f} s", 5000
+        )
+        self._refresh_tables()
+
+    def _on_import_failed(self, dialog: QProgressDialog, exc: Exception) -> None:
+        self._import_worker = None
+        dialog.reset()
+        dialog.deleteLater()
+        if isinstance(exc, QueryCancelledError):
+            self.status_bar.showMessage("Import cancelled; no rows were written.", 4000)
+            return
+        QMessageBox.critical(self, "Import failed", str(exc))
+
+    def _run_index_advisor(self) -> None:
+        if self._advisor_worker is not None:
+            return
+        path = self.database_service.path
+        if path is None:
+            QMessageBox.information(self, "Index Advisor", "Open a database first.")
             return
 
-        self.status_bar.showMessage(f"Exported results to {path}", 5000)
+        from .advisor import IndexAdvisor, collect_workload
+
+        # The log already holds this session's statements; fall back to the session if logging is off.
+        log = self.database_service.performance_log
+        stats = list(log.entries()) if log is not None else list(self.database_service.query_stats)
+        workload = collect_workload(stats, path)
+        if not workload:
+            QMessageBox.information(
+                self, "Index Advisor", "Run some SELECT statements in the SQL Console first; they form the workload."
+            )
+            return
+
+        progress_dialog = QProgressDialog("Copying database…", "Cancel", 0, 0, self)
+        progress_dialog.setWindowTitle("Index Advisor")
+        progress_dialog.setWindowModality(Qt.WindowModality.WindowModal)
+        progress_dialog.setMinimumDuration(0)
+
+        advisor = IndexAdvisor(self.database_service, workload)
+        worker = Worker(lambda task: advisor.run(progress=task.report_progress, is_cancelled=task.is_cancelled))
+        worker.signals.progress.connect(
+            lambda progress: (
+                progress_dialog.setMaximum(progress.total),
+                progress_dialog.setValue(progress.step - 1),
+                progress_dialog.setLabelText(progress.message),
+            )
+        )
+        worker.signals.finished.connect(lambda report: self._on_advisor_finished(progress_dialog, report))
+        worker.signals.failed.connect(lambda exc: self._on_advisor_failed(progress_dialog, exc))
+        progress_dialog.canceled.connect(worker.cancel)
+        self._advisor_worker = worker
+        self.thread_pool.start(worker)
+
+    def _on_advisor_finished(self, dialog: QProgressDialog, report: AdvisorReport) -> None:
+        self._advisor_worker = None
+        dialog.reset()
+        dialog.deleteLater()
+        IndexAdvisorDialog(report, self).exec()
+
+    def _on_advisor_failed(self, dialog: QProgressDialog, exc: Exception) -> None:
+        self._advisor_worker = None
+        dialog.reset()
+        dialog.deleteLater()
+        if isinstance(exc, QueryCancelledError):
+            self.status_bar.showMessage("Index advisor cancelled.", 4000)
+            return
+        QMessageBox.critical(self, "Index advisor failed", str(exc))
 
     def _show_about_dialog(self) -> None:
         QMessageBox.about(
@@ -422,5 +1753,6 @@ class MainWindow(QMainWindow):
         self._update_recent_menu()
 
     def closeEvent(self, event: QCloseEvent) -> None:  # noqa: N802 (Qt API)
+        self._stop_background_work()
         self.database_service.close()
         event.accept()
@@ -0,0 +1,120 @@
+"""Memory-budgeted LRU cache for read query results."""
+
+from __future__ import annotations
+
+import re
+import sys
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Hashable, Optional, Tuple
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from .database import QueryResult
+
+
+DEFAULT_CACHE_BUDGET = 64 * 1024 * 1024
+_SIZE_SAMPLE_ROWS = 64
+
+_NORMALIZE_PATTERN = re.compile(
+    r"""('(?:[^']|'')*'|"(?:[^"]|"")*"|`(?:[^`]|``)*`|\[[^\]]*\])"""
+    r"|(?:\s+|--[^\n]*|/\*.*?(?:\*/|\Z))+",
+    re.DOTALL,
+)
+_VOLATILE_PATTERN = re.compile(
+    r"\b(random|randomblob|changes|total_changes|last_insert_rowid|"
+    r"current_date|current_time|current_timestamp)\b|'now'",
+    re.IGNORECASE,
+)
+
+
+def normalize_sql(sql: str) -> str:
+    """Drop comments and collapse whitespace outside of literals and quoted names."""
+
+    normalized = _NORMALIZE_PATTERN.sub(lambda match: match.group(1) or " ", sql)
+    return normalized.strip().rstrip(";").strip()
+
+
+def is_cacheable_sql(normalized_sql: str) -> bool:
+    """Return False for statements whose result may differ between runs on unchanged data."""
+
+    return _VOLATILE_PATTERN.search(normalized_sql) is None
+
+
+def estimate_result_size(result: "QueryResult") -> int:
+    """Estimate the memory held by a result by sampling its rows.
+
+    Results that accounted for their own memory (``size_bytes``) use that.
+    """
+
+    if result.size_bytes is not None:
+        return result.size_bytes + sum(sys.getsizeof(column) for column in result.columns)
+    rows = result.rows
+    size = sys.getsizeof(rows) + sum(sys.getsizeof(column) for column in result.columns)
+    if not rows:
+        return size
+    step = max(1, len(rows) // _SIZE_SAMPLE_ROWS)
+    sample = [rows[index] for index in range(0, len(rows), step)]
+    sample_size = sum(sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row) for row in sample)
+    return size + sample_size * len(rows) // len(sample)
+
+
+class QueryCache:
+    """LRU cache of query results evicted under a memory budget.
+
+    Every entry belongs to a single change token (see
+    ``DatabaseService._change_token``); looking up with a different token
+    drops all entries, so any write or external change invalidates the cache.
+    """
+
+    def __init__(self, budget_bytes: int = DEFAULT_CACHE_BUDGET) -> None:
+        self.budget_bytes = budget_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Tuple[QueryResult, int]]" = OrderedDict()
+        self._token: Optional[Hashable] = None
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @property
+    def size_bytes(self) -> int:
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, token: Hashable) -> Optional["QueryResult"]:
+        with self._lock:
+            if token != self._token:
+                self._reset(token)
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, token: Hashable, result: "QueryResult", size: Optional[int] = None) -> None:
+        size = estimate_result_size(result) if size is None else size
+        with self._lock:
+            if token != self._token:
+                self._reset(token)
+            if size > self.budget_bytes:
+                return
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= previous[1]
+            self._entries[key] = (result, size)
+            self._size += size
+            while self._size > self.budget_bytes and self._entries:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._reset(None)
+
+    def _reset(self, token: Optional[Hashable]) -> None:
+        self._entries.clear()
+        self._size = 0
+        self._token = token
@@ -0,0 +1,158 @@
+"""Parse ``EXPLAIN QUERY PLAN`` output into a tree and flag costly steps."""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from .database import IndexInfo
+
+
+# Node kinds. Full table scans, automatic indexes and temporary B-trees are
+# the steps worth a second look when tuning a query.
+SCAN = "scan"
+INDEX_SCAN = "index_scan"
+SEARCH = "search"
+AUTOMATIC_INDEX = "automatic_index"
+TEMP_BTREE = "temp_btree"
+OTHER = "other"
+
+_WARNINGS = {
+    SCAN: "Full table scan: every row of {table} is visited.",
+    AUTOMATIC_INDEX: "SQLite builds a temporary index on {table} for every run; consider a permanent index.",
+    TEMP_BTREE: "Rows are collected into a temporary B-tree; an index matching the clause can avoid it.",
+}
+
+_IDENTIFIER = r'(?:"(?:[^"]|"")*"|\[[^\]]*\]|`(?:[^`]|``)*`|[\w$]+)'
+_ACCESS_PATTERN = re.compile(
+    rf"^(?P<operation>SCAN|SEARCH)\s+(?:TABLE\s+)?(?P<name>\(.*?\)|{_IDENTIFIER})"
+    rf"(?:\s+AS\s+(?P<alias>{_IDENTIFIER}))?(?:\s+(?:USING|VIRTUAL TABLE)\s+(?P<using>.*))?$",
+    re.IGNORECASE,
+)
+_INDEX_PATTERN = re.compile(rf"\b(?:COVERING\s+)?INDEX\s+(?P<index>{_IDENTIFIER})", re.IGNORECASE)
+_NOT_ALIASES = (
+    "WHERE JOIN ON USING LEFT RIGHT FULL INNER OUTER CROSS NATURAL GROUP ORDER LIMIT HAVING WINDOW UNION "
+    "INTERSECT EXCEPT INDEXED NOT SET VALUES DEFAULT SELECT RETURNING DO FROM"
+).split()
+_SOURCE_PATTERN = re.compile(
+    rf"(?:\b(?:FROM|JOIN|UPDATE|INTO)|,)\s*(?:(?P<schema>{_IDENTIFIER})\s*\.\s*)?(?P<table>{_IDENTIFIER})"
+    rf"(?:\s+(?:AS\s+)?(?!(?:{'|'.join(_NOT_ALIASES)})\b)(?P<alias>{_IDENTIFIER}))?",
+    re.IGNORECASE,
+)
+_NOISE_PATTERN = re.compile(r"--[^\n]*|/\*.*?(?:\*/|$)|'(?:[^']|'')*'", re.DOTALL)
+
+
+@dataclass(slots=True)
+class PlanNode:
+    """One row of ``EXPLAIN QUERY PLAN`` with its children.
+
+    ``name`` is the object named in a SCAN/SEARCH step (often an alias);
+    ``table`` is the schema table it resolves to and ``indexes`` lists every
+    index that exists on that table, so the step can be compared with the
+    indexes available to it.
+    """
+
+    id: int
+    parent: int
+    detail: str
+    children: List["PlanNode"] = field(default_factory=list)
+    operation: Optional[str] = None
+    name: Optional[str] = None
+    index: Optional[str] = None
+    table: Optional[str] = None
+    indexes: List["IndexInfo"] = field(default_factory=list)
+
+    @property
+    def kind(self) -> str:
+        detail = self.detail.upper()
+        if "TEMP B-TREE" in detail:
+            return TEMP_BTREE
+        if "AUTOMATIC" in detail and "INDEX" in detail:
+            return AUTOMATIC_INDEX
+        if self.operation == "SEARCH":
+            return SEARCH
+        if self.operation == "SCAN":
+            return INDEX_SCAN if self.index is not None else SCAN
+        return OTHER
+
+    @property
+    def warning(self) -> Optional[str]:
+        """Describe why this step is costly, or None if it is not flagged.
+
+        Scans are only flagged for real tables: scanning a subquery, CTE or
+        table-valued function result is expected.
+        """
+
+        kind = self.kind
+        if kind == SCAN and self.table is None:
+            return None
+        template = _WARNINGS.get(kind)
+        return template.format(table=self.table or self.name) if template is not None else None
+
+    def walk(self) -> Iterable["PlanNode"]:
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+
+def unquote(identifier: str) -> str:
+    if len(identifier) >= 2 and identifier[0] in "\"[`" and identifier[-1] in "\"]`":
+        quote = identifier[0]
+        inner = identifier[1:-1]
+        return inner if quote == "[" else inner.replace(quote * 2, quote)
+    return identifier
+
+
+def parse_detail(detail: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """Return ``(operation, name, index)`` for a SCAN/SEARCH step.
+
+    Older SQLite releases report ``SCAN TABLE t AS a``; newer ones report
+    ``SCAN a``. Either way the alias (if any) is returned as the name.
+    """
+
+    match = _ACCESS_PATTERN.match(detail.strip())
+    if match is None:
+        return None, None, None
+    name = unquote(match.group("alias") or match.group("name"))
+    index = None
+    using = match.group("using") or ""
+    if "AUTOMATIC" not in using.upper():
+        index_match = _INDEX_PATTERN.search(using)
+        if index_match is not None:
+            index = unquote(index_match.group("index"))
+    return match.group("operation").upper(), name, index
+
+
+def build_plan(rows: Sequence[Sequence[object]]) -> List[PlanNode]:
+    """Turn ``(id, parent, notused, detail)`` rows into a list of root nodes."""
+
+    nodes: Dict[int, PlanNode] = {}
+    roots: List[PlanNode] = []
+    for row in rows:
+        node_id, parent_id, detail = int(row[0]), int(row[1]), str(row[-1])
+        operation, name, index = parse_detail(detail)
+        node = PlanNode(node_id, parent_id, detail, operation=operation, name=name, index=index)
+        nodes[node_id] = node
+        parent = nodes.get(parent_id)
+        (parent.children if parent is not None else roots).append(node)
+    return roots
+
+
+def table_aliases(sql: str) -> Dict[str, str]:
+    """Map lower-cased aliases (and table names) used in ``sql`` to table names.
+
+    This is a lexical scan of FROM/JOIN/UPDATE/INTO clauses and comma joins.
+    It over-collects (a column list looks like a comma join), so callers
+    only trust entries that name a table in the schema.
+    """
+
+    aliases: Dict[str, str] = {}
+    for match in _SOURCE_PATTERN.finditer(_NOISE_PATTERN.sub(" ", sql)):
+        table = unquote(match.group("table"))
+        aliases.setdefault(table.lower(), table)
+        alias = match.group("alias")
+        if alias is not None:
+            aliases[unquote(alias).lower()] = table
+    return aliases
@@ -0,0 +1,306 @@
+"""Side-car FTS5 trigram indexes that answer Data Preview filters without a LIKE scan."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Sequence
+
+from .database import INSERT_BATCH_SIZE, DatabaseError, PreviewFilter, QueryCancelledError, quote_identifier
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from .database import DatabaseService
+
+
+# The trigram tokenizer cannot match terms shorter than three characters.
+MIN_TERM_LENGTH = 3
+
+# Index states reported by ``SearchIndex.state``.
+MISSING = "missing"
+STALE = "stale"
+READY = "ready"
+
+
+@dataclass(slots=True)
+class _IndexEntry:
+    fts: str
+    columns: List[str]
+    fingerprint: str
+
+
+class SearchIndex:
+    """Full-text (FTS5 trigram) indexes of rowid tables, kept outside the database.
+
+    Each database gets one side-car SQLite file in ``directory``; the
+    database itself is never written, so read-only and immutable databases
+    can be indexed too. An index records a fingerprint of the table's
+    definition and of the database files' size and modification time. Any
+    change to the database makes the index stale: it is then ignored (the
+    preview falls back to ``LIKE``) until it is rebuilt.
+
+    Lookups share one side-car connection, reopened when another database
+    is opened; builds and drops write through a connection of their own so
+    that lookups keep seeing the last committed index.
+    """
+
+    def __init__(self, service: "DatabaseService", directory: str | Path) -> None:
+        self.service = service
+        self.directory = Path(directory)
+        self._entries: Dict[str, Dict[str, _IndexEntry]] = {}
+        self._lock = threading.Lock()
+        self._reader: Optional[sqlite3.Connection] = None
+        self._reader_path: Optional[Path] = None
+        self._reader_lock = threading.Lock()
+
+    @staticmethod
+    def available() -> bool:
+        """Return True if this SQLite build has FTS5 with the trigram tokenizer."""
+
+        with closing(sqlite3.connect(":memory:")) as connection:
+            try:
+                connection.execute("CREATE VIRTUAL TABLE probe USING fts5(value, tokenize='trigram')")
+            except sqlite3.OperationalError:
+                return False
+        return True
+
+    def sidecar_path(self) -> Path:
+        path = self.service.path
+        if path is None:
+            raise DatabaseError("No database open.")
+        digest = hashlib.sha1(path.encode("utf-8")).hexdigest()[:16]
+        return self.directory / f"{Path(path).stem}-{digest}.search.sqlite"
+
+    def state(self, table_name: str) -> str:
+        """Return ``READY``, ``STALE`` or ``MISSING`` for the index of a table."""
+
+        entry = self._entry(table_name)
+        if entry is None:
+            return MISSING
+        return READY if entry.fingerprint == self._fingerprint(table_name) else STALE
+
+    def supports(self, table_name: str) -> bool:
+        """Return True if the table can be indexed (it is paged by a single rowid-like key)."""
+
+        obj = self.service.catalog.get(table_name)
+        key_columns = self.service.get_page_key_columns(table_name)
+        return (
+            obj is not None
+            and obj.type == "table"
+            and not obj.without_rowid
+            and key_columns is not None
+            and len(key_columns) == 1
+        )
+
+    def build(
+        self,
+        table_name: str,
+        progress: Optional[Callable[[int], None]] = None,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+    ) -> int:
+        """(Re)build the index of a table and return the number of indexed rows.
+
+        The old index stays usable until the new one is committed. Every
+        value is indexed as text, the way ``LIKE`` compares it.
+        """
+
+        if not self.supports(table_name):
+            raise DatabaseError(f"'{table_name}' cannot be indexed: only rowid tables are supported.")
+        if not self.available():
+            raise DatabaseError("This SQLite build lacks FTS5 with the trigram tokenizer.")
+
+        columns = self.service.get_table_columns(table_name)
+        key = self.service.get_page_key_columns(table_name)[0]
+        fts = "fts_" + hashlib.sha1(table_name.encode("utf-8")).hexdigest()[:16]
+        # Taken before reading: a change during the build leaves the index stale.
+        fingerprint = self._fingerprint(table_name)
+        select = (
+            f"SELECT {quote_identifier(key)}, "
+            + ", ".join(f"CAST({quote_identifier(column)} AS TEXT)" for column in columns)
+            + f" FROM {quote_identifier(table_name)}"
+        )
+        fts_columns = [f"c{position}" for position in range(len(columns))]
+        insert = (
+            f"INSERT INTO {fts} (rowid, {', '.join(fts_columns)}) "
+            f"VALUES (?, {', '.join('?' for _ in fts_columns)})"
+        )
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        indexed = 0
+        with closing(self._connect()) as sidecar:
+            try:
+                sidecar.execute("BEGIN IMMEDIATE")
+                sidecar.execute(f"DROP TABLE IF EXISTS {fts}")
+                sidecar.execute(
+                    f"CREATE VIRTUAL TABLE {fts} USING fts5({', '.join(fts_columns)}, tokenize='trigram')"
+                )
+                with self.service.reading() as connection:
+                    cursor = connection.execute(select)
+                    while True:
+                        if is_cancelled is not None and is_cancelled():
+                            raise QueryCancelledError("Indexing cancelled.")
+                        batch = cursor.fetchmany(INSERT_BATCH_SIZE)
+                        if not batch:
+                            break
+                        sidecar.executemany(insert, [tuple(row) for row in batch])
+                        indexed += len(batch)
+                        if progress is not None:
+                            progress(indexed)
+                sidecar.execute(f"INSERT INTO {fts} ({fts}) VALUES ('optimize')")
+                sidecar.execute(
+                    "INSERT OR REPLACE INTO indexes (tbl, fts, columns, fingerprint) VALUES (?, ?, ?, ?)",
+                    (table_name, fts, json.dumps(columns), fingerprint),
+                )
+                sidecar.execute("COMMIT")
+            except sqlite3.Error as exc:
+                if sidecar.in_transaction:
+                    sidecar.execute("ROLLBACK")
+                raise DatabaseError(f"Failed to build search index: {exc}") from exc
+            except BaseException:
+                if sidecar.in_transaction:
+                    sidecar.execute("ROLLBACK")
+                raise
+        with self._lock:
+            self._entries.pop(self.service.path, None)
+        return indexed
+
+    def drop(self, table_name: str) -> None:
+        entry = self._entry(table_name)
+        if entry is None:
+            return
+        with closing(self._connect()) as sidecar:
+            try:
+                sidecar.execute("BEGIN IMMEDIATE")
+                sidecar.execute(f"DROP TABLE IF EXISTS {entry.fts}")
+                sidecar.execute("DELETE FROM indexes WHERE tbl = ?", (table_name,))
+                sidecar.execute("COMMIT")
+            except sqlite3.Error as exc:
+                if sidecar.in_transaction:
+                    sidecar.execute("ROLLBACK")
+                raise DatabaseError(f"Failed to drop search index: {exc}") from exc
+        with self._lock:
+            self._entries.pop(self.service.path, None)
+
+    def match_query(self, table_name: str, row_filter: PreviewFilter) -> Optional[str]:
+        """Return an FTS5 query equivalent to ``row_filter``, or None if the index cannot answer it.
+
+        That is the case when there is no up-to-date index, a term is shorter
+        than ``MIN_TERM_LENGTH`` or a column is not indexed.
+        """
+
+        terms = ([row_filter.text] if row_filter.text else []) + [text for _, text in row_filter.columns]
+        if not terms or any(len(term) < MIN_TERM_LENGTH for term in terms):
+            return None
+        entry = self._entry(table_name)
+        if entry is None or entry.fingerprint != self._fingerprint(table_name):
+            return None
+        positions = {column: position for position, column in enumerate(entry.columns)}
+        phrases = ['"' + row_filter.text.replace('"', '""') + '"'] if row_filter.text else []
+        for column, text in row_filter.columns:
+            if column not in positions:
+                return None
+            phrases.append(f'c{positions[column]} : "' + text.replace('"', '""') + '"')
+        return " AND ".join(phrases)
+
+    def keys(
+        self,
+        table_name: str,
+        match: str,
+        limit: int,
+        after: Optional[Sequence[object]] = None,
+        before: Optional[Sequence[object]] = None,
+        backwards: bool = False,
+        offset: int = 0,
+    ) -> List[int]:
+        """Return up to ``limit`` matching rowids in page order (descending when ``backwards``)."""
+
+        entry = self._require(table_name)
+        sql = f"SELECT rowid FROM {entry.fts} WHERE {entry.fts} MATCH ?"
+        parameters: List[object] = [match]
+        if after is not None:
+            sql += " AND rowid > ?"
+            parameters.append(after[0])
+        elif before is not None:
+            sql += " AND rowid < ?"
+            parameters.append(before[0])
+        sql += f" ORDER BY rowid {'DESC' if backwards else 'ASC'} LIMIT ? OFFSET ?"
+        parameters += [limit, offset]
+        return [row[0] for row in self._query(sql, parameters)]
+
+    def count(self, table_name: str, match: str) -> int:
+        entry = self._require(table_name)
+        return int(self._query(f"SELECT count(*) FROM {entry.fts} WHERE {entry.fts} MATCH ?", [match])[0][0])
+
+    def _require(self, table_name: str) -> _IndexEntry:
+        entry = self._entry(table_name)
+        if entry is None:
+            raise DatabaseError(f"No search index for '{table_name}'.")
+        return entry
+
+    def _entry(self, table_name: str) -> Optional[_IndexEntry]:
+        path = self.service.path
+        if path is None:
+            return None
+        with self._lock:
+            entries = self._entries.get(path)
+        if entries is None:
+            entries = {}
+            if self.sidecar_path().exists():
+                for tbl, fts, columns, fingerprint in self._query("SELECT tbl, fts, columns, fingerprint FROM indexes"):
+                    entries[tbl] = _IndexEntry(fts, json.loads(columns), fingerprint)
+            with self._lock:
+                self._entries[path] = entries
+        return entries.get(table_name)
+
+    def _fingerprint(self, table_name: str) -> str:
+        obj = self.service.catalog.get(table_name)
+        parts: List[object] = [obj.sql if obj is not None else None, self.service.get_table_columns(table_name)]
+        path = self.service.path or ""
+        for suffix in ("", "-wal"):
+            try:
+                stat = os.stat(path + suffix)
+            except OSError:
+                continue
+            # An empty WAL file comes and goes with connections; it holds no data.
+            if stat.st_size:
+                parts += [suffix, stat.st_size, stat.st_mtime_ns]
+        return json.dumps(parts)
+
+    def _connect(self) -> sqlite3.Connection:
+        try:
+            connection = sqlite3.connect(self.sidecar_path(), isolation_level=None, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS indexes "
+                "(tbl TEXT PRIMARY KEY, fts TEXT NOT NULL, columns TEXT NOT NULL, fingerprint TEXT NOT NULL)"
+            )
+        except sqlite3.Error as exc:
+            raise DatabaseError(f"Failed to open search index: {exc}") from exc
+        return connection
+
+    def close(self) -> None:
+        """Close the shared side-car connection; the next lookup reopens it."""
+
+        with self._reader_lock:
+            if self._reader is not None:
+                self._reader.close()
+            self._reader = self._reader_path = None
+
+    def _query(self, sql: str, parameters: Sequence[object] = ()) -> List[tuple]:
+        path = self.sidecar_path()
+        try:
+            with self._reader_lock:
+                if self._reader is not None and self._reader_path != path:
+                    self._reader.close()
+                    self._reader = None
+                if self._reader is None:
+                    self._reader = self._connect()
+                    self._reader_path = path
+                return self._reader.execute(sql, tuple(parameters)).fetchall()
+        except sqlite3.Error as exc:
+            raise DatabaseError(f"Search index query failed: {exc}") from exc
@@ -0,0 +1,243 @@
+"""Query result rows kept in a temporary SQLite file instead of memory."""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import tempfile
+import threading
+import weakref
+from collections import OrderedDict
+from itertools import islice
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple, overload
+
+# Rows are read back in blocks of this many rows; the most recently used
+# blocks stay in memory, which bounds the memory of a spilled result.
+BLOCK_ROWS = 256
+CACHED_BLOCKS = 64
+# Page cache of each connection to the spill file, in KiB.
+SPILL_CACHE_KIB = 8 * 1024
+# VM steps between checks of ``is_cancelled`` while sorting.
+_CANCEL_CHECK_STEPS = 10000
+
+
+def _remove(connection: sqlite3.Connection, path: str) -> None:
+    connection.close()
+    for suffix in ("", "-wal", "-shm"):
+        try:
+            os.remove(path + suffix)
+        except OSError:
+            pass
+
+
+class _SpillStore:
+    """The temporary file behind a spilled result and all its sorted views.
+
+    The file is deleted by ``close()`` or, at the latest, when the store is
+    garbage collected or the interpreter exits.
+    """
+
+    def __init__(self, column_count: int, directory: Optional[str] = None) -> None:
+        handle, self.path = tempfile.mkstemp(prefix="sqliteview-result-", suffix=".sqlite", dir=directory)
+        os.close(handle)
+        self.column_count = column_count
+        self.lock = threading.Lock()
+        self.connection = self.connect()
+        self.connection.execute(f"CREATE TABLE rows ({', '.join(f'c{i}' for i in range(column_count))})")
+        self.insert = f"INSERT INTO rows VALUES ({', '.join('?' for _ in range(column_count))})"
+        self._orders = 0
+        self._finalizer = weakref.finalize(self, _remove, self.connection, self.path)
+
+    def connect(self) -> sqlite3.Connection:
+        # WAL lets a sort write its order table while the grid keeps reading.
+        # The file is scratch data, so it is never synced.
+        connection = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.execute("PRAGMA synchronous = OFF")
+        connection.execute(f"PRAGMA cache_size = {-SPILL_CACHE_KIB}")
+        return connection
+
+    def new_order_table(self) -> str:
+        with self.lock:
+            self._orders += 1
+            return f"order_{self._orders}"
+
+    @property
+    def closed(self) -> bool:
+        return not self._finalizer.alive
+
+    def close(self) -> None:
+        self._finalizer()
+
+
+class SpilledRows(Sequence[Tuple[object, ...]]):
+    """A sequence of row tuples stored in a temporary SQLite file.
+
+    Rows are appended with ``extend`` and read back by position in blocks of
+    ``BLOCK_ROWS``, keeping at most ``CACHED_BLOCKS`` blocks in memory, so
+    a result of any size can be scrolled with bounded memory. ``sorted``
+    returns a view of the same rows in another order without re-running
+    the query. Values are stored as they are (the spill table has no column
+    affinity) and sort in SQLite's order: NULLs, numbers, text, BLOBs.
+    """
+
+    def __init__(self, column_count: int, directory: Optional[str] = None) -> None:
+        self._store = _SpillStore(column_count, directory)
+        self._order: Optional[str] = None
+        self._length = 0
+        self._blocks: "OrderedDict[int, List[Tuple[object, ...]]]" = OrderedDict()
+
+    @classmethod
+    def _view(cls, store: _SpillStore, order: str, length: int) -> "SpilledRows":
+        view = cls.__new__(cls)
+        view._store, view._order, view._length, view._blocks = store, order, length, OrderedDict()
+        return view
+
+    @property
+    def column_count(self) -> int:
+        return self._store.column_count
+
+    @property
+    def path(self) -> str:
+        return self._store.path
+
+    @property
+    def file_size(self) -> int:
+        """Bytes on disk, including the write-ahead log."""
+
+        size = 0
+        for suffix in ("", "-wal"):
+            try:
+                size += os.path.getsize(self._store.path + suffix)
+            except OSError:
+                pass
+        return size
+
+    @property
+    def nbytes(self) -> int:
+        """Rough memory held by the cached blocks (not the file)."""
+
+        return sum(len(block) for block in self._blocks.values()) * self.column_count * 16
+
+    def extend(self, rows: Sequence[Sequence[object]]) -> None:
+        """Append a batch of rows; only the original, unsorted rows can grow."""
+
+        if self._order is not None:
+            raise TypeError("Sorted views of spilled rows are read-only.")
+        if not rows:
+            return
+        store = self._store
+        with store.lock:
+            store.connection.execute("BEGIN")
+            try:
+                store.connection.executemany(store.insert, rows)
+            except BaseException:
+                store.connection.execute("ROLLBACK")
+                raise
+            store.connection.execute("COMMIT")
+        # The last block may have been cached while it was incomplete.
+        self._blocks.pop(self._length // BLOCK_ROWS, None)
+        self._length += len(rows)
+
+    def sorted(
+        self,
+        column: int,
+        descending: bool = False,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+    ) -> "SpilledRows":
+        """Return a view of the rows ordered by one column (ties keep their order).
+
+        The order is written to a table in the spill file on a separate
+        connection, so the rows can still be read while it is built. When
+        ``is_cancelled`` returns True the sort is interrupted and
+        ``sqlite3.OperationalError`` raised.
+        """
+
+        if not 0 <= column < self.column_count:
+            raise IndexError("column index out of range")
+        store = self._store
+        order = store.new_order_table()
+        source = "rows" if self._order is None else f"{self._order} AS o JOIN rows AS r ON r.rowid = o.src"
+        position = "rowid" if self._order is None else "o.rowid"
+        value = f"c{column}" if self._order is None else f"r.c{column}"
+        connection = store.connect()
+        try:
+            if is_cancelled is not None:
+                connection.set_progress_handler(lambda: 1 if is_cancelled() else 0, _CANCEL_CHECK_STEPS)
+            connection.execute(
+                f"CREATE TABLE {order} AS SELECT {'rowid' if self._order is None else 'o.src'} AS src "
+                f"FROM {source} ORDER BY {value} {'DESC' if descending else 'ASC'}, {position}"
+            )
+        finally:
+            connection.close()
+        return SpilledRows._view(store, order, self._length)
+
+    def close(self) -> None:
+        """Delete the spill file; this view and every view sharing it become unusable."""
+
+        self._blocks.clear()
+        self._store.close()
+
+    def value(self, row: int, column: int) -> object:
+        """Return one cell without building the row tuple."""
+
+        if not 0 <= row < self._length:
+            raise IndexError("row index out of range")
+        return self._block(row // BLOCK_ROWS)[row % BLOCK_ROWS][column]
+
+    def _block(self, number: int) -> List[Tuple[object, ...]]:
+        block = self._blocks.get(number)
+        if block is not None:
+            self._blocks.move_to_end(number)
+            return block
+        first = number * BLOCK_ROWS + 1
+        last = first + BLOCK_ROWS - 1
+        if self._order is None:
+            sql = "SELECT * FROM rows WHERE rowid BETWEEN ? AND ? ORDER BY rowid"
+        else:
+            sql = (
+                f"SELECT r.* FROM {self._order} AS o JOIN rows AS r ON r.rowid = o.src "
+                "WHERE o.rowid BETWEEN ? AND ? ORDER BY o.rowid"
+            )
+        store = self._store
+        if store.closed:
+            raise ValueError("Spilled rows are closed.")
+        with store.lock:
+            block = store.connection.execute(sql, (first, last)).fetchall()
+        self._blocks[number] = block
+        if len(self._blocks) > CACHED_BLOCKS:
+            self._blocks.popitem(last=False)
+        return block
+
+    def __len__(self) -> int:
+        return self._length
+
+    @overload
+    def __getitem__(self, index: int) -> Tuple[object, ...]: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Tuple[object, ...]]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._length)
+            return list(islice(self, start, stop, step)) if step > 0 else [self[i] for i in range(start, stop, step)]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("row index out of range")
+        return self._block(index // BLOCK_ROWS)[index % BLOCK_ROWS]
+
+    def __iter__(self) -> Iterator[Tuple[object, ...]]:
+        for number in range(-(-self._length // BLOCK_ROWS)):
+            yield from self._block(number)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, (SpilledRows, list, tuple)):
+            return NotImplemented
+        return len(self) == len(other) and all(row == tuple(expected) for row, expected in zip(self, other))
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"SpilledRows({len(self)} rows, {self.column_count} columns, {self.path!r})"
@@ -1,13 +1,49 @@
-"""Simple SQL syntax highlighter for the query editor."""
+"""Incremental SQL syntax highlighter for the query editor."""
 
 from __future__ import annotations
 
-from PyQt6.QtCore import QRegularExpression
-from PyQt6.QtGui import QColor, QFont, QTextCharFormat, QSyntaxHighlighter
+import re
+import time
+from typing import Optional
+
+from PyQt6.QtCore import QTimer
+from PyQt6.QtGui import QColor, QFont, QTextBlock, QTextCharFormat, QSyntaxHighlighter
 
 from .theme import Theme
 
 
+# Time one synchronous highlighting pass may take before the remaining
+# blocks are deferred to idle time (keeps typing and pasting responsive).
+HIGHLIGHT_BUDGET_MS = 20
+
+# Block states: the lexical context a block ends in, which the next block
+# starts in. PENDING marks blocks whose highlighting was deferred.
+NORMAL = 0
+IN_COMMENT = 1
+IN_STRING = 2
+IN_IDENTIFIER = 3
+PENDING = 4
+
+# One alternation per token kind; tokens are told apart by ``match.lastindex``
+# (cheaper than named groups), most frequent first.
+_WORD, _NUMBER, _LINE_COMMENT, _BLOCK_COMMENT, _STRING, _IDENTIFIER, _QUOTED = range(1, 8)
+_TOKEN_PATTERN = re.compile(
+    r"([A-Za-z_][\w$]*)"
+    r"|((?:\d+(?:\.\d*)?|\.\d+)(?:[eE][-+]?\d+)?)"
+    r"|(--.*)"
+    r"|(/\*)"
+    r"|(')"
+    r"|(\")"
+    r"|(\[[^\]]*\]?|`[^`]*`?)"
+)
+_CLOSERS = {
+    IN_COMMENT: re.compile(r".*?\*/"),
+    IN_STRING: re.compile(r"(?:[^']|'')*'"),
+    IN_IDENTIFIER: re.compile(r'(?:[^"]|"")*"'),
+}
+_OPENERS = {_BLOCK_COMMENT: IN_COMMENT, _STRING: IN_STRING, _IDENTIFIER: IN_IDENTIFIER}
+
+
 class SqlHighlighter(QSyntaxHighlighter):
     """Applies formatting rules to highlight SQL keywords and tokens."""
 
@@ -135,13 +171,16 @@ class SqlHighlighter(QSyntaxHighlighter):
 
         self.number_format = QTextCharFormat()
 
-        self.comment_expression = QRegularExpression(r"--[^\n]*")
-        self.string_expression = QRegularExpression(r"'([^']|'')*'")
-        self.number_expression = QRegularExpression(r"\b\d+(\.\d+)?\b")
-
-        pattern_str = r"\b(" + "|".join(self.KEYWORDS) + r")\b"
-        self.keyword_pattern = QRegularExpression(pattern_str)
-        self.keyword_pattern.setPatternOptions(QRegularExpression.PatternOption.CaseInsensitiveOption)
+        self._keywords = frozenset(keyword.upper() for keyword in self.KEYWORDS)
+        self._deadline: Optional[float] = None
+        self._pending_from: Optional[int] = None
+        self._idle_timer = QTimer(self)
+        self._idle_timer.setSingleShot(True)
+        self._idle_timer.setInterval(0)
+        self._idle_timer.timeout.connect(self._highlight_idle)
+        # Connected after QSyntaxHighlighter's own handler, so this runs once
+        # the synchronous pass triggered by an edit has finished.
+        document.contentsChange.connect(self._end_pass)
         self.set_color_scheme(Theme.LIGHT)
 
     def set_color_scheme(self, theme: Theme) -> None:
@@ -153,17 +192,117 @@ class SqlHighlighter(QSyntaxHighlighter):
         self.string_format.setForeground(QColor(colors["string"]))
         self.number_format.setForeground(QColor(colors["number"]))
         self.rehighlight()
+        self._end_pass()
+
+    @property
+    def has_pending(self) -> bool:
+        """True while some blocks are still waiting to be highlighted at idle time."""
+
+        return self._pending_from is not None
+
+    def highlight_pending(self) -> None:
+        """Highlight every deferred block now, without a time budget."""
+
+        while self._pending_from is not None:
+            self._highlight_idle(budget=False)
 
     def highlightBlock(self, text: str) -> None:  # noqa: N802 (Qt API signature)
-        self._apply_regex(self.keyword_pattern, text, self.keyword_format)
-        self._apply_regex(self.comment_expression, text, self.comment_format)
-        self._apply_regex(self.string_expression, text, self.string_format)
-        self._apply_regex(self.number_expression, text, self.number_format)
-
-    def _apply_regex(self, expression: QRegularExpression, text: str, fmt: QTextCharFormat) -> None:
-        iterator = expression.globalMatch(text)
-        while iterator.hasNext():
-            match = iterator.next()
-            start = match.capturedStart()
-            length = match.capturedLength()
-            self.setFormat(start, length, fmt)
+        """Tokenize ``text`` in one pass, starting in the state the previous block ended in.
+
+        Qt calls this for the edited blocks and keeps going only while a
+        block's end state changes, so an edit re-highlights just the blocks
+        it affects. Once a pass exceeds ``HIGHLIGHT_BUDGET_MS`` the remaining
+        blocks are marked PENDING and finished from the idle timer.
+        """
+
+        previous = self.previousBlockState()
+        if previous == PENDING:
+            # Entry state unknown until the previous block is done.
+            self.setCurrentBlockState(PENDING)
+            return
+        now = time.perf_counter()
+        if self._deadline is None:
+            self._deadline = now + HIGHLIGHT_BUDGET_MS / 1000
+            # Passes Qt starts on its own (e.g. the initial delayed one) end here.
+            QTimer.singleShot(0, self._end_pass)
+        elif now > self._deadline:
+            self._defer(self.currentBlock())
+            return
+
+        state = previous if previous in _CLOSERS else NORMAL
+        position = 0
+        if state != NORMAL:
+            end = self._close_region(text, 0, 0, state)
+            if end is None:
+                self.setCurrentBlockState(state)
+                return
+            position, state = end, NORMAL
+
+        while True:
+            match = _TOKEN_PATTERN.search(text, position)
+            if match is None:
+                break
+            kind = match.lastindex
+            start, position = match.span()
+            if kind == _WORD:
+                if match.group().upper() in self._keywords:
+                    self.setFormat(start, position - start, self.keyword_format)
+            elif kind == _NUMBER:
+                self.setFormat(start, position - start, self.number_format)
+            elif kind == _LINE_COMMENT:
+                self.setFormat(start, position - start, self.comment_format)
+            elif kind in _OPENERS:
+                end = self._close_region(text, start, position, _OPENERS[kind])
+                if end is None:
+                    state = _OPENERS[kind]
+                    break
+                position = end
+        self.setCurrentBlockState(state)
+
+    def _close_region(self, text: str, start: int, search_from: int, state: int) -> Optional[int]:
+        """Format a comment/string/quoted name from ``start``; return its end, or None if it runs on."""
+
+        closer = _CLOSERS[state].match(text, search_from)
+        end = closer.end() if closer is not None else len(text)
+        if state == IN_COMMENT:
+            self.setFormat(start, end - start, self.comment_format)
+        elif state == IN_STRING:
+            self.setFormat(start, end - start, self.string_format)
+        return end if closer is not None else None
+
+    def _defer(self, block: QTextBlock) -> None:
+        self.setCurrentBlockState(PENDING)
+        number = block.blockNumber()
+        if self._pending_from is None or number < self._pending_from:
+            self._pending_from = number
+        if not self._idle_timer.isActive():
+            self._idle_timer.start()
+
+    def _end_pass(self, position: int = -1, removed: int = 0, _added: int = 0) -> None:
+        self._deadline = None
+        if removed and self._pending_from is not None:
+            # Removed lines shift deferred blocks up; resume from the edit at the latest.
+            edited = self.document().findBlock(position).blockNumber()
+            self._pending_from = min(self._pending_from, edited)
+
+    def _highlight_idle(self, budget: bool = True) -> None:
+        """Resume highlighting at the first deferred block for one budgeted pass."""
+
+        document = self.document()
+        block = document.findBlockByNumber(self._pending_from or 0)
+        while block.isValid() and block.userState() != PENDING:
+            block = block.next()
+        if not block.isValid():
+            self._pending_from = None
+            return
+        self._pending_from = None
+        self._deadline = None if budget else float("inf")
+        # Re-highlighting cascades into the following blocks while their end
+        # state changes, i.e. through the deferred run until the budget is spent.
+        self.rehighlightBlock(block)
+        self._end_pass()
+        if self._pending_from is None:
+            # Re-scan from just after this block in case deferred blocks remain.
+            self._pending_from = block.blockNumber() + 1
+        if budget:
+            self._idle_timer.start()
@@ -0,0 +1,166 @@
+"""Regex-based SQL lexer shared by statement classification and analysis.
+
+Tokens are produced lazily, so questions about the start of a statement
+(its first keyword, whether it has a WHERE clause) stop reading at the end
+of the first statement instead of scanning a whole script. Those answers
+are cached per SQL text because the same statement is usually inspected
+several times per run (safety check, classification, cache lookup).
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import FrozenSet, Iterator, List, Optional
+
+
+# Token kinds.
+WORD = "word"
+QUOTED = "quoted"
+STRING = "string"
+BLOB = "blob"
+NUMBER = "number"
+PARAMETER = "parameter"
+OPERATOR = "operator"
+
+_ANALYSIS_CACHE_SIZE = 32
+# Longer SQL is analysed without the cache, so that it does not keep large
+# scripts alive.
+_CACHED_SQL_LENGTH = 16 * 1024
+
+_TOKEN_PATTERN = re.compile(
+    r"""(?P<skip>\s+|--[^\n]*|/\*.*?(?:\*/|\Z))"""
+    r"""|(?P<blob>[xX]'[0-9A-Fa-f]*'?)"""
+    r"""|(?P<string>'(?:[^']|'')*'?)"""
+    r"""|(?P<quoted>"(?:[^"]|"")*"?|`(?:[^`]|``)*`?|\[[^\]]*\]?)"""
+    r"""|(?P<word>[^\W\d][\w$]*)"""
+    r"""|(?P<number>0[xX][0-9A-Fa-f]+|(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][-+]?\d+)?)"""
+    r"""|(?P<parameter>\?\d*|[:@$]\w+)"""
+    r"""|(?P<operator>->>|->|<=|>=|==|!=|<>|<<|>>|\|\||.)""",
+    re.DOTALL,
+)
+# Comments, string literals and quoted identifiers: everything that can hide
+# a keyword from a plain text search.
+_NOISE_PATTERN = re.compile(
+    r"""--[^\n]*|/\*.*?(?:\*/|\Z)|'(?:[^']|'')*'?|"(?:[^"]|"")*"?""",
+    re.DOTALL,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Token:
+    """A lexical token; whitespace and comments are never emitted."""
+
+    kind: str
+    text: str
+    start: int
+
+    @property
+    def keyword(self) -> Optional[str]:
+        """The upper-cased text of a bare word, else None."""
+
+        return self.text.upper() if self.kind == WORD else None
+
+
+def tokenize(sql: str) -> Iterator[Token]:
+    """Yield the tokens of ``sql`` in order, skipping whitespace and comments.
+
+    Unterminated strings, quoted identifiers and comments run to the end of
+    the text rather than raising, so partial input from the editor lexes.
+    """
+
+    for match in _TOKEN_PATTERN.finditer(sql):
+        kind = match.lastgroup
+        if kind != "skip":
+            yield Token(kind, match.group(), match.start())
+
+
+def statement_tokens(sql: str) -> Iterator[Token]:
+    """Yield the tokens of the first statement, stopping at its ``;``."""
+
+    for token in tokenize(sql):
+        if token.kind == OPERATOR and token.text == ";":
+            return
+        yield token
+
+
+def first_keyword(sql: str) -> Optional[str]:
+    """Return the upper-cased leading keyword, ignoring comments and ``(``."""
+
+    return _cached_first_keyword(sql) if len(sql) <= _CACHED_SQL_LENGTH else _first_keyword(sql)
+
+
+def top_level_keywords(sql: str) -> FrozenSet[str]:
+    """Return the upper-cased bare words outside parentheses in the first statement."""
+
+    return _cached_top_level_keywords(sql) if len(sql) <= _CACHED_SQL_LENGTH else _top_level_keywords(sql)
+
+
+def _first_keyword(sql: str) -> Optional[str]:
+    for token in tokenize(sql):
+        if token.kind == WORD:
+            return token.text.upper()
+        if token.text != "(":
+            return None
+    return None
+
+
+def _top_level_keywords(sql: str) -> FrozenSet[str]:
+    depth = 0
+    words = set()
+    for token in statement_tokens(sql):
+        if token.kind == WORD:
+            if depth == 0:
+                words.add(token.text.upper())
+        elif token.text == "(":
+            depth += 1
+        elif token.text == ")" and depth > 0:
+            depth -= 1
+    return frozenset(words)
+
+
+_cached_first_keyword = lru_cache(maxsize=_ANALYSIS_CACHE_SIZE)(_first_keyword)
+_cached_top_level_keywords = lru_cache(maxsize=_ANALYSIS_CACHE_SIZE)(_top_level_keywords)
+
+
+def strip_noise(sql: str) -> str:
+    """Replace comments, string literals and quoted identifiers with a space."""
+
+    return _NOISE_PATTERN.sub(" ", sql)
+
+
+def split_statements(sql: str) -> List[str]:
+    """Split a script into statements at semicolons, dropping empty ones.
+
+    Semicolons inside literals, comments and the ``BEGIN ... END`` body of a
+    ``CREATE TRIGGER`` do not end a statement. Comments before a statement
+    are not part of it.
+    """
+
+    statements: List[str] = []
+    start: Optional[int] = None
+    end = 0
+    position = 0
+    trigger = False
+    depth = 0
+    for token in tokenize(sql):
+        if token.text == ";" and depth == 0:
+            if start is not None:
+                statements.append(sql[start:end])
+            start, position, trigger = None, 0, False
+            continue
+        if start is None:
+            start = token.start
+        end = token.start + len(token.text)
+        keyword = token.keyword
+        if position < 3 and keyword == "TRIGGER" and sql[start:start + 6].upper() == "CREATE":
+            trigger = True
+        elif trigger and (keyword == "BEGIN" or (keyword == "CASE" and depth > 0)):
+            depth += 1
+        elif trigger and keyword == "END" and depth > 0:
+            depth -= 1
+        position += 1
+    if start is not None:
+        statements.append(sql[start:end])
+    return statements
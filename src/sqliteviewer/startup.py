@@ -0,0 +1,50 @@
+"""Start-up timing breakdown reported by ``sqliteview --profile-startup``."""
+
+from __future__ import annotations
+
+import time
+from typing import Callable, List, Tuple
+
+
+# Regression target for time-to-first-window, measured from the entry point
+# (interpreter start-up excluded) to the first event loop iteration after the
+# main window was shown.
+TIME_TO_FIRST_WINDOW_TARGET = 0.5
+
+
+class StartupProfile:
+    """Collect named checkpoints and format the time spent between them."""
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter) -> None:
+        self._clock = clock
+        self._started = clock()
+        self.marks: List[Tuple[str, float]] = []
+
+    def mark(self, label: str) -> None:
+        """Record that the step ending now, named ``label``, has finished."""
+
+        self.marks.append((label, self._clock()))
+
+    @property
+    def elapsed(self) -> float:
+        return (self.marks[-1][1] if self.marks else self._clock()) - self._started
+
+    def steps(self) -> List[Tuple[str, float]]:
+        """Return ``(label, duration)`` pairs in the order they were recorded."""
+
+        previous = self._started
+        steps = []
+        for label, timestamp in self.marks:
+            steps.append((label, timestamp - previous))
+            previous = timestamp
+        return steps
+
+    def report(self, target: float = TIME_TO_FIRST_WINDOW_TARGET) -> str:
+        steps = self.steps()
+        width = max((len(label) for label, _ in steps), default=0)
+        lines = ["Startup profile:"]
+        lines.extend(f"  {label.ljust(width)}  {duration * 1000:8.1f} ms" for label, duration in steps)
+        total = self.elapsed
+        verdict = "OK" if total <= target else "over target"
+        lines.append(f"  Time to first window: {total * 1000:.1f} ms (target {target * 1000:.0f} ms, {verdict})")
+        return "\n".join(lines)
@@ -0,0 +1,111 @@
+"""Lazy table model that exposes query results to Qt views."""
+
+from __future__ import annotations
+
+from typing import Optional
+
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, QObject, Qt
+
+from .compact_rows import CompactRows
+from .database import QueryResult, TruncatedValue
+from .spilled_rows import SpilledRows
+
+
+FETCH_BATCH_SIZE = 256
+
+
+def format_size(size: int) -> str:
+    """Return a byte count as B/KiB/MiB/GiB text."""
+
+    value = float(size)
+    for unit in ("B", "KiB", "MiB"):
+        if value < 1024:
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GiB"
+
+
+def format_cell(value: object) -> str:
+    """Return the display text for a single cell value."""
+
+    if value is None:
+        return "NULL"
+    if isinstance(value, TruncatedValue):
+        if value.is_blob:
+            return f"BLOB ({format_size(value.size)})"
+        return f"{value.head}… ({format_size(value.size)})"
+    return str(value)
+
+
+class QueryResultModel(QAbstractTableModel):
+    """Read-only model backed directly by the rows of a ``QueryResult``.
+
+    Cells are formatted on demand in ``data()`` and rows are exposed to the
+    view in batches through ``canFetchMore``/``fetchMore``, so only the part
+    of the result the user scrolls to is ever materialised by Qt. Spilled
+    results are exposed in full at once: their rows are read from disk only
+    when a cell is painted, and fetching millions of rows in batches would
+    make the scroll bar useless.
+    """
+
+    def __init__(
+        self,
+        result: QueryResult,
+        parent: Optional[QObject] = None,
+        batch_size: int = FETCH_BATCH_SIZE,
+    ) -> None:
+        super().__init__(parent)
+        self._result = result
+        self._batch_size = max(1, batch_size)
+        rows = result.rows
+        self._loaded = len(rows) if isinstance(rows, SpilledRows) else min(self._batch_size, len(rows))
+
+    @property
+    def result(self) -> QueryResult:
+        return self._result
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:  # noqa: N802 (Qt API)
+        if parent.isValid():
+            return 0
+        return self._loaded
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:  # noqa: N802 (Qt API)
+        if parent.isValid():
+            return 0
+        return len(self._result.columns)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> object:
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        rows = self._result.rows
+        if isinstance(rows, (CompactRows, SpilledRows)):
+            return format_cell(rows.value(index.row(), index.column()))
+        return format_cell(rows[index.row()][index.column()])
+
+    def headerData(  # noqa: N802 (Qt API)
+        self,
+        section: int,
+        orientation: Qt.Orientation,
+        role: int = Qt.ItemDataRole.DisplayRole,
+    ) -> object:
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            if 0 <= section < len(self._result.columns):
+                return self._result.columns[section]
+            return None
+        return super().headerData(section, orientation, role)
+
+    def canFetchMore(self, parent: QModelIndex = QModelIndex()) -> bool:  # noqa: N802 (Qt API)
+        if parent.isValid():
+            return False
+        return self._loaded < len(self._result.rows)
+
+    def fetchMore(self, parent: QModelIndex = QModelIndex()) -> None:  # noqa: N802 (Qt API)
+        if parent.isValid():
+            return
+        remaining = len(self._result.rows) - self._loaded
+        if remaining <= 0:
+            return
+        count = min(self._batch_size, remaining)
+        self.beginInsertRows(QModelIndex(), self._loaded, self._loaded + count - 1)
+        self._loaded += count
+        self.endInsertRows()
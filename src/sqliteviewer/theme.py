@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from enum import Enum
+from functools import lru_cache
 
 from PyQt6.QtCore import QSettings
 from PyQt6.QtWidgets import QApplication
@@ -21,8 +22,9 @@ SETTINGS_GROUP = ("SQLiteViewer", "App")
 _THEME_KEY = "theme"
 
 
+@lru_cache(maxsize=None)
 def load_theme(theme: Theme) -> str:
-    """Load the QSS content for the requested theme."""
+    """Load the QSS content for the requested theme (read from disk once per process)."""
 
     stylesheet_path = resource_path(f"{theme.value}.qss")
     with open(stylesheet_path, encoding="utf-8") as stylesheet_file:
@@ -0,0 +1,49 @@
+"""Background task helpers for running database work off the GUI thread."""
+
+from __future__ import annotations
+
+import threading
+from typing import Callable
+
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+
+
+class WorkerSignals(QObject):
+    """Signals emitted by a ``Worker``; delivered on the GUI thread."""
+
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(object)
+    progress = pyqtSignal(object)
+
+
+class Worker(QRunnable):
+    """Run ``task(worker)`` on a ``QThreadPool`` and report back via signals.
+
+    The task receives the worker itself so it can call ``report_progress``
+    and poll ``is_cancelled``. Its return value is emitted through
+    ``signals.finished``; any exception is emitted through ``signals.failed``.
+    """
+
+    def __init__(self, task: Callable[["Worker"], object]) -> None:
+        super().__init__()
+        self.setAutoDelete(False)
+        self.signals = WorkerSignals()
+        self._task = task
+        self._cancelled = threading.Event()
+
+    def run(self) -> None:
+        try:
+            result = self._task(self)
+        except Exception as exc:  # noqa: BLE001 - forwarded to the GUI thread
+            self.signals.failed.emit(exc)
+        else:
+            self.signals.finished.emit(result)
+
+    def report_progress(self, value: object) -> None:
+        self.signals.progress.emit(value)
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    def is_cancelled(self) -> bool:
+        return self._cancelled.is_set()
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+from sqliteviewer.advisor import IndexAdvisor, IndexCandidate, WorkloadEntry, _analyze_columns, collect_workload
+from sqliteviewer.database import DatabaseService, QueryCancelledError
+from sqliteviewer.instrumentation import QueryStats
+
+
+class ColumnAnalysisTests(unittest.TestCase):
+    def test_predicates_joins_and_ordering(self) -> None:
+        usage = _analyze_columns(
+            "SELECT * FROM users u JOIN orders o ON o.user_id = u.id "
+            "WHERE u.city = 'x' AND o.total > 10 AND lower(u.name) = 'y' AND u.age IS NOT NULL "
+            "ORDER BY o.created DESC, u.name"
+        )
+        self.assertEqual(
+            usage,
+            [
+                ("eq", "o", "user_id"),
+                ("eq", "u", "id"),
+                ("eq", "u", "city"),
+                ("range", "o", "total"),
+                ("order", "o", "created"),
+                ("order", "u", "name"),
+            ],
+        )
+
+    def test_ignores_literals_comments_and_subquery_select_lists(self) -> None:
+        usage = _analyze_columns(
+            "SELECT a FROM t -- WHERE fake = 1\n"
+            "WHERE b BETWEEN 1 AND 5 AND c IN (SELECT d FROM u WHERE e = 'f = g')"
+        )
+        self.assertEqual(usage, [("range", None, "b"), ("eq", None, "c"), ("eq", None, "e")])
+
+    def test_collect_workload_groups_reads(self) -> None:
+        stats = [
+            QueryStats("SELECT * FROM t WHERE a = 1", database="db", execute_ms=5),
+            QueryStats("select  * from t where a = 1;", database="db", execute_ms=1, from_cache=True),
+            QueryStats("SELECT * FROM t WHERE a = 1", database="other", execute_ms=5),
+            QueryStats("SELECT * FROM missing", database="db", status="error"),
+            QueryStats("UPDATE t SET a = 2", database="db", execute_ms=50),
+        ]
+        workload = collect_workload(stats, "db")
+        self.assertEqual(len(workload), 2)
+        self.assertEqual({entry.executions for entry in workload}, {1})
+        self.assertTrue(all(entry.sql.upper().startswith("SELECT") for entry in workload))
+
+
+class IndexAdvisorTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmpdir.name) / "advisor.db"
+        conn = sqlite3.connect(self.path)
+        conn.executescript(
+            """
+            CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT, age INTEGER, city TEXT);
+            CREATE INDEX idx_users_name ON users (name);
+            WITH RECURSIVE seq(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM seq WHERE n < 20000)
+            INSERT INTO users (name, age, city) SELECT 'user' || n, n % 90, 'city' || (n % 50) FROM seq;
+            """
+        )
+        conn.close()
+        self.service = DatabaseService()
+        self.service.open(self.path)
+
+    def tearDown(self) -> None:
+        self.service.close()
+        self.tmpdir.cleanup()
+
+    def test_candidates_skip_existing_indexes_and_rowid(self) -> None:
+        advisor = IndexAdvisor(
+            self.service,
+            [
+                WorkloadEntry("SELECT * FROM users WHERE name = 'user1'"),
+                WorkloadEntry("SELECT * FROM users WHERE id = 5"),
+                WorkloadEntry("SELECT * FROM users WHERE age = 30 AND city = 'city1' ORDER BY name"),
+            ],
+        )
+        columns = sorted(candidate.columns for candidate in advisor.candidates())
+        self.assertEqual(columns, [("age", "city"), ("age", "city", "name")])
+
+    def test_candidates_skip_names_already_in_use(self) -> None:
+        self.service.execute_query("CREATE INDEX idx_users_city ON users (age)")
+        advisor = IndexAdvisor(self.service, [WorkloadEntry("SELECT * FROM users WHERE city = 'city1'")])
+        self.assertEqual(advisor.candidates(), [])
+
+    def test_candidate_that_cannot_be_created_is_skipped(self) -> None:
+        sql = "SELECT * FROM users WHERE city = 'city1'"
+        advisor = IndexAdvisor(self.service, [WorkloadEntry(sql)], repeat=1)
+        copy, _ = self.service.snapshot()
+        try:
+            copy.execute('CREATE TABLE "idx_users_city" (x)')
+            self.assertIsNone(advisor._validate(copy, IndexCandidate("users", ("city",)), {sql: (1.0, [])}))
+            self.assertIsNone(advisor._validate(copy, IndexCandidate("users", ("missing",)), {sql: (1.0, [])}))
+        finally:
+            copy.close()
+
+    def test_run_ranks_validated_indexes_without_touching_the_database(self) -> None:
+        workload = [
+            WorkloadEntry("SELECT count(*) FROM users WHERE city = 'city7'", executions=10),
+            WorkloadEntry("SELECT * FROM users WHERE name = 'user5'"),
+            WorkloadEntry("SELECT * FROM missing_table"),
+        ]
+        report = IndexAdvisor(self.service, workload, repeat=1).run()
+        self.assertFalse(report.sampled)
+        self.assertEqual([item.create_sql for item in report.recommendations], [
+            'CREATE INDEX "idx_users_city" ON "users" ("city");'
+        ])
+        recommendation = report.recommendations[0]
+        self.assertGreater(recommendation.speedup, 1)
+        self.assertIn("SCAN users", recommendation.plan_before[workload[0].sql])
+        self.assertIn("idx_users_city", recommendation.plan_after[workload[0].sql][0])
+        self.assertEqual([sql for sql, _ in report.skipped], ["SELECT * FROM missing_table"])
+        self.assertEqual([index.name for index in self.service.catalog.indexes("users")], ["idx_users_name"])
+
+    def test_run_can_be_cancelled(self) -> None:
+        advisor = IndexAdvisor(self.service, [WorkloadEntry("SELECT count(*) FROM users WHERE city = 'city7'")])
+        with self.assertRaises(QueryCancelledError):
+            advisor.run(is_cancelled=lambda: True)
+
+    def test_snapshot_can_be_cancelled(self) -> None:
+        for max_bytes in (0, 1 << 30):
+            with self.assertRaises(QueryCancelledError):
+                self.service.snapshot(max_bytes=max_bytes, is_cancelled=lambda: True)
+
+    def test_snapshot_samples_large_databases(self) -> None:
+        copy, sampled = self.service.snapshot(max_bytes=0, sample_rows=10)
+        try:
+            self.assertTrue(sampled)
+            self.assertEqual(copy.execute("SELECT count(*) FROM users").fetchone()[0], 10)
+            names = [row[0] for row in copy.execute("SELECT name FROM sqlite_master WHERE type = 'index'")]
+            self.assertEqual(names, ["idx_users_name"])
+        finally:
+            copy.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
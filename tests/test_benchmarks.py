@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+class BenchmarkSuiteTests(unittest.TestCase):
+    """Keep the benchmark scripts runnable; the numbers themselves are not checked."""
+
+    def test_database_suite_smoke_run(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output = Path(tmpdir) / "results.json"
+            completed = subprocess.run(
+                [
+                    sys.executable,
+                    str(ROOT / "benchmarks" / "bench_database.py"),
+                    "--scale",
+                    "smoke",
+                    "--repeat",
+                    "1",
+                    "--only",
+                    "preview.first_page,export.csv,catalog.*",
+                    "--data-dir",
+                    tmpdir,
+                    "--output",
+                    str(output),
+                ],
+                env=dict(os.environ, PYTHONPATH=str(ROOT / "src")),
+                capture_output=True,
+                text=True,
+            )
+            self.assertEqual(completed.returncode, 0, completed.stderr)
+            report = json.loads(output.read_text(encoding="utf-8"))
+
+            names = [result["name"] for result in report["results"]]
+            self.assertEqual(
+                names,
+                [
+                    "preview.first_page",
+                    "export.csv",
+                    "catalog.list_tables_cold",
+                    "catalog.list_tables_warm",
+                    "catalog.table_schema_cold",
+                ],
+            )
+            export = report["results"][1]
+            self.assertEqual(export["items"], 10_000)
+            self.assertGreater(export["throughput_per_s"], 0)
+            self.assertIsNotNone(export["peak_memory_bytes"])
+
+            compared = subprocess.run(
+                [
+                    sys.executable,
+                    str(ROOT / "benchmarks" / "bench_database.py"),
+                    "--scale",
+                    "smoke",
+                    "--repeat",
+                    "1",
+                    "--only",
+                    "catalog.list_tables_warm",
+                    "--data-dir",
+                    tmpdir,
+                    "--output",
+                    str(Path(tmpdir) / "again.json"),
+                    "--compare",
+                    str(output),
+                    "--threshold",
+                    "1000",
+                ],
+                env=dict(os.environ, PYTHONPATH=str(ROOT / "src")),
+                capture_output=True,
+                text=True,
+            )
+            self.assertEqual(compared.returncode, 0, compared.stderr)
+            self.assertIn("catalog.list_tables_warm:", compared.stderr)
+
+    def test_gui_suite_smoke_run(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output = Path(tmpdir) / "gui.json"
+            completed = subprocess.run(
+                [
+                    sys.executable,
+                    "-m",
+                    "pytest",
+                    str(ROOT / "benchmarks" / "gui"),
+                    "--gui-scale",
+                    "smoke",
+                    "--bench-output",
+                    str(output),
+                    "-p",
+                    "no:cacheprovider",
+                ],
+                cwd=ROOT,
+                env=dict(os.environ, QT_QPA_PLATFORM="offscreen"),
+                capture_output=True,
+                text=True,
+            )
+            self.assertEqual(completed.returncode, 0, completed.stdout + completed.stderr)
+            report = json.loads(output.read_text(encoding="utf-8"))
+            names = {result["name"] for result in report["results"]}
+            self.assertIn("gui.scroll_table", names)
+            self.assertIn("gui.toggle_theme", names)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import io
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import unittest
+import unittest.mock
+from pathlib import Path
+
+from sqliteviewer import __main__ as entry
+from sqliteviewer.cli import main
+
+
+class CliTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.tmpdir.name) / "sample.db"
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("CREATE TABLE people (id INTEGER PRIMARY KEY, name TEXT NOT NULL, note TEXT)")
+        conn.executemany(
+            "INSERT INTO people (name, note) VALUES (?, ?)",
+            [("Alice", None), ("Bob", "line\nbreak"), ("Charlie", "c")],
+        )
+        conn.execute("CREATE VIEW names AS SELECT name FROM people")
+        conn.commit()
+        conn.close()
+
+    def tearDown(self) -> None:
+        self.tmpdir.cleanup()
+
+    def run_cli(self, *args: str) -> tuple[int, str, str]:
+        stdout, stderr = io.StringIO(), io.StringIO()
+        code = main(list(args), stdout=stdout, stderr=stderr)
+        return code, stdout.getvalue(), stderr.getvalue()
+
+    def test_tables_lists_tables_and_views(self) -> None:
+        code, out, _ = self.run_cli("tables", str(self.db_path))
+        self.assertEqual(code, 0)
+        self.assertEqual(out.splitlines(), ["names", "people"])
+
+    def test_schema_prints_create_statements(self) -> None:
+        code, out, _ = self.run_cli("schema", str(self.db_path), "people")
+        self.assertEqual(code, 0)
+        self.assertTrue(out.startswith("CREATE TABLE people"))
+
+        code, _, err = self.run_cli("schema", str(self.db_path), "missing")
+        self.assertEqual(code, 1)
+        self.assertIn("missing", err)
+
+    def test_query_formats(self) -> None:
+        sql = "SELECT id, name, note FROM people ORDER BY id"
+        code, out, _ = self.run_cli("query", str(self.db_path), sql, "--format", "csv")
+        self.assertEqual(code, 0)
+        self.assertEqual(out.splitlines()[:2], ["id,name,note", "1,Alice,"])
+
+        _, out, _ = self.run_cli("query", str(self.db_path), sql, "--format", "jsonl")
+        records = [json.loads(line) for line in out.splitlines()]
+        self.assertEqual(records[0], {"id": 1, "name": "Alice", "note": None})
+
+        _, out, _ = self.run_cli("query", str(self.db_path), sql, "--batch-size", "1")
+        lines = out.splitlines()
+        self.assertEqual(lines[0].split(), ["id", "name", "note"])
+        self.assertEqual(lines[2].split(), ["1", "Alice", "NULL"])
+        self.assertEqual(lines[3].split(), ["2", "Bob", "line", "break"])
+        self.assertEqual(len(lines), 5)
+
+    def test_query_reports_writes_and_errors(self) -> None:
+        code, out, err = self.run_cli("query", str(self.db_path), "DELETE FROM people WHERE id = 1")
+        self.assertEqual(code, 0)
+        self.assertEqual(out, "")
+        self.assertIn("1 row(s) affected", err)
+
+        code, _, err = self.run_cli("query", str(self.db_path), "SELECT * FROM missing")
+        self.assertEqual(code, 1)
+        self.assertIn("no such table", err)
+
+        code, _, err = self.run_cli("query", str(self.db_path), "DELETE FROM people", "--read-only")
+        self.assertEqual(code, 1)
+
+    def test_query_with_empty_returning_result(self) -> None:
+        sql = "DELETE FROM people WHERE id = 99 RETURNING id, name"
+        code, out, err = self.run_cli("query", str(self.db_path), sql)
+        self.assertEqual(code, 0, err)
+        self.assertEqual(out.split(), ["id", "name", "--", "----"])
+
+        code, out, err = self.run_cli("query", str(self.db_path), sql, "--format", "csv")
+        self.assertEqual(code, 0, err)
+        self.assertEqual(out.splitlines(), ["id,name"])
+
+    def test_query_runs_pragma_assignments_on_the_writer(self) -> None:
+        code, _, err = self.run_cli("query", str(self.db_path), "PRAGMA user_version = 5")
+        self.assertEqual(code, 0, err)
+        self.assertIn("Statement executed.", err)
+
+        code, out, err = self.run_cli("query", str(self.db_path), "PRAGMA user_version", "--format", "csv")
+        self.assertEqual(code, 0, err)
+        self.assertEqual(out.splitlines(), ["user_version", "5"])
+
+        sql = "WITH v(n) AS (VALUES ('Dan')) INSERT INTO people (name) SELECT n FROM v RETURNING name"
+        code, out, err = self.run_cli("query", str(self.db_path), sql, "--format", "csv")
+        self.assertEqual(code, 0, err)
+        self.assertEqual(out.splitlines(), ["name", "Dan"])
+
+    def test_export_table_guesses_format(self) -> None:
+        target = Path(self.tmpdir.name) / "people.tsv"
+        code, _, err = self.run_cli("export", str(self.db_path), str(target), "--table", "people")
+        self.assertEqual(code, 0)
+        self.assertIn("Exported 3 row(s)", err)
+        self.assertEqual(target.read_text(encoding="utf-8").splitlines()[0], "id\tname\tnote")
+
+        code, _, err = self.run_cli("export", str(self.db_path), str(target), "--table", "missing")
+        self.assertEqual(code, 1)
+        self.assertIn("No such table: missing", err)
+
+    def test_entry_point_dispatches_subcommands(self) -> None:
+        stdout = io.StringIO()
+        with unittest.mock.patch("sys.stdout", stdout):
+            code = entry.main(["tables", str(self.db_path)])
+        self.assertEqual(code, 0)
+        self.assertIn("people", stdout.getvalue())
+
+    def test_headless_commands_do_not_import_qt(self) -> None:
+        script = (
+            "import sys\n"
+            "from sqliteviewer.__main__ import main\n"
+            f"code = main(['tables', {str(self.db_path)!r}])\n"
+            "sys.exit(3 if any(name.startswith('PyQt6') for name in sys.modules) else code)\n"
+        )
+        env = dict(os.environ, PYTHONPATH=str(Path(__file__).resolve().parents[1] / "src"))
+        completed = subprocess.run([sys.executable, "-c", script], env=env, capture_output=True, text=True)
+        self.assertEqual(completed.returncode, 0, completed.stderr)
+        self.assertIn("people", completed.stdout)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import unittest
+
+from sqliteviewer.compact_rows import CompactRows
+
+
+class CompactRowsTests(unittest.TestCase):
+    def test_rows_round_trip_with_nulls_and_mixed_types(self) -> None:
+        rows = [
+            (1, 1.5, "a", None, b"\x00"),
+            (None, None, "a", 7, b"\x01"),
+            (2**63 - 1, -0.0, None, "text", None),
+        ]
+        compact = CompactRows(5)
+        compact.extend(rows[:2])
+        compact.extend(rows[2:])
+        self.assertEqual(len(compact), 3)
+        self.assertEqual(list(compact), rows)
+        self.assertEqual(compact, rows)
+        self.assertEqual(compact[-1], rows[-1])
+        self.assertEqual(compact[1:], rows[1:])
+        self.assertEqual(compact[::-1], rows[::-1])
+        self.assertEqual(compact.value(1, 3), 7)
+        self.assertIsNone(compact.value(1, 0))
+        self.assertIs(type(compact[0][0]), int)
+        with self.assertRaises(IndexError):
+            compact[3]
+
+    def test_empty_rows_iterate_and_compare(self) -> None:
+        compact = CompactRows(2)
+        self.assertEqual(list(compact), [])
+        self.assertEqual(compact, [])
+        self.assertEqual(compact[:], [])
+        self.assertEqual(compact.nbytes, 0)
+
+    def test_integers_outside_64_bits_are_kept(self) -> None:
+        compact = CompactRows(1)
+        compact.extend([(1,), (2**70,)])
+        compact.extend([(3,)])
+        self.assertEqual(compact, [(1,), (2**70,), (3,)])
+
+    def test_numeric_columns_are_smaller_than_tuples(self) -> None:
+        compact = CompactRows(2)
+        compact.extend([(index, index / 2) for index in range(10000)])
+        self.assertEqual(compact.nbytes, 10000 * 16)
+
+    def test_repeated_strings_are_shared_and_counted_once(self) -> None:
+        words = ["".join(["alpha", str(index % 3)]) for index in range(3000)]
+        compact = CompactRows(1)
+        compact.extend([(word,) for word in words])
+        self.assertIs(compact[0][0], compact[3][0])
+        self.assertLess(compact.nbytes, 3000 * 8 + 3 * 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,10 +2,21 @@ from __future__ import annotations
 
 import sqlite3
 import tempfile
+import threading
 import unittest
 from pathlib import Path
 
-from sqliteviewer.database import DatabaseError, DatabaseService
+from sqliteviewer.database import (
+    PREVIEW_VALUE_LIMIT,
+    DatabaseError,
+    DatabaseService,
+    OpenOptions,
+    PreviewFilter,
+    PreviewSort,
+    QueryCancelledError,
+    TruncatedValue,
+)
+from sqliteviewer.spilled_rows import SpilledRows
 
 
 class DatabaseServiceTests(unittest.TestCase):
@@ -47,6 +58,141 @@ class DatabaseServiceTests(unittest.TestCase):
         self.assertEqual(result.row_count, 3)
         self.assertEqual(result.columns, ["id", "name", "age"])
 
+    def test_table_preview_keyset_pages(self) -> None:
+        first = self.service.get_table_preview("users", limit=2)
+        self.assertEqual(first.row_keys, [(1,), (2,)])
+        self.assertFalse(first.has_previous)
+
+        second = self.service.get_table_preview("users", limit=2, after=first.row_keys[-1])
+        self.assertEqual([row[1] for row in second.rows], ["Carol"])
+        self.assertTrue(second.has_previous)
+        self.assertFalse(second.truncated)
+
+        back = self.service.get_table_preview("users", limit=2, before=second.row_keys[0])
+        self.assertEqual([row[1] for row in back.rows], ["Alice", "Bob"])
+        self.assertFalse(back.has_previous)
+        self.assertTrue(back.truncated)
+
+    def test_table_preview_last_page(self) -> None:
+        last = self.service.get_table_preview("users", limit=2, last=True)
+        self.assertEqual([row[1] for row in last.rows], ["Bob", "Carol"])
+        self.assertTrue(last.has_previous)
+        self.assertFalse(last.truncated)
+
+    def test_table_preview_without_rowid_uses_primary_key(self) -> None:
+        self.service.execute_query(
+            "CREATE TABLE tags (owner TEXT, label TEXT, PRIMARY KEY (owner, label)) WITHOUT ROWID"
+        )
+        for owner, label in [("a", "x"), ("a", "y"), ("b", "x")]:
+            self.service.execute_query(f"INSERT INTO tags VALUES ('{owner}', '{label}')")
+
+        first = self.service.get_table_preview("tags", limit=2)
+        self.assertEqual(first.columns, ["owner", "label"])
+        self.assertEqual(first.row_keys, [("a", "x"), ("a", "y")])
+        second = self.service.get_table_preview("tags", limit=2, after=first.row_keys[-1])
+        self.assertEqual(second.rows, [("b", "x")])
+
+    @unittest.skipIf(sqlite3.sqlite_version_info < (3, 37, 0), "STRICT tables need SQLite 3.37")
+    def test_without_rowid_with_other_table_options(self) -> None:
+        for name, options in (("w1", "WITHOUT ROWID, STRICT"), ("w2", "STRICT, WITHOUT ROWID")):
+            self.service.execute_query(f"CREATE TABLE {name} (k TEXT PRIMARY KEY, v INT) {options}")
+            self.service.execute_query(
+                f"INSERT INTO {name} WITH RECURSIVE n(i) AS (SELECT 0 UNION ALL SELECT i + 1 FROM n WHERE i < 299) "
+                "SELECT printf('k%03d', i), i FROM n"
+            )
+            self.assertTrue(self.service.catalog.get(name).without_rowid)
+            self.assertEqual(self.service.get_page_key_columns(name), ["k"])
+            first = self.service.get_table_preview(name, limit=200)
+            second = self.service.get_table_preview(name, limit=200, after=first.row_keys[-1])
+            self.assertEqual([row[0] for row in second.rows][:2], ["k200", "k201"])
+            last = self.service.get_table_preview(name, limit=200, last=True)
+            self.assertEqual(last.rows[-1][0], "k299")
+        self.service.execute_query(
+            "CREATE TABLE \"without rowid\" (a INTEGER PRIMARY KEY, note TEXT DEFAULT 'WITHOUT ROWID')"
+        )
+        self.assertFalse(self.service.catalog.get("without rowid").without_rowid)
+
+    def test_view_preview_falls_back_to_offset(self) -> None:
+        first = self.service.get_table_preview("adult_users", limit=1)
+        self.assertIsNone(first.row_keys)
+        self.assertEqual(first.offset, 0)
+        second = self.service.get_table_preview("adult_users", limit=1, offset=1)
+        self.assertEqual(second.rows[0][1], "Carol")
+        self.assertTrue(second.has_previous)
+        with self.assertRaises(DatabaseError):
+            self.service.get_table_preview("adult_users", after=(1,))
+
+    def test_cancelled_row_count_is_interrupted(self) -> None:
+        self.service.execute_query(
+            "CREATE VIEW endless AS WITH RECURSIVE n(i) AS "
+            "(SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 1000000000) SELECT i FROM n"
+        )
+        calls = []
+        with self.assertRaises(QueryCancelledError):
+            self.service.count_rows("endless", is_cancelled=lambda: calls.append(1) or len(calls) > 2)
+        self.assertEqual(len(calls), 3)
+        self.assertIsNone(self.service.cached_row_count("endless"))
+
+    def test_row_count_is_cached_until_data_changes(self) -> None:
+        self.assertIsNone(self.service.cached_row_count("users"))
+        self.assertEqual(self.service.count_rows("users"), 3)
+        self.assertEqual(self.service.cached_row_count("users"), 3)
+
+        self.service.execute_query("INSERT INTO users (name, age) VALUES ('Dave', 20)")
+        self.assertIsNone(self.service.cached_row_count("users"))
+        self.assertEqual(self.service.count_rows("users"), 4)
+
+        external = sqlite3.connect(self.db_path)
+        external.execute("DELETE FROM users WHERE name = 'Dave'")
+        external.commit()
+        external.close()
+        self.assertIsNone(self.service.cached_row_count("users"))
+        self.assertEqual(self.service.count_rows("users"), 3)
+
+    def test_estimate_row_count(self) -> None:
+        self.assertEqual(self.service.estimate_row_count("users"), 3)
+        self.assertIsNone(self.service.estimate_row_count("adult_users"))
+
+        self.service.execute_query("ANALYZE")
+        self.service.execute_query("INSERT INTO users (id, name, age) VALUES (100, 'Zed', 40)")
+        # sqlite_stat1 still reflects the analyzed row count.
+        self.assertEqual(self.service.estimate_row_count("users"), 3)
+
+    def test_table_preview_without_exact_count(self) -> None:
+        result = self.service.get_table_preview("users", exact_count=False)
+        self.assertIsNone(result.row_count)
+        self.service.count_rows("users")
+        result = self.service.get_table_preview("users", exact_count=False)
+        self.assertEqual(result.row_count, 3)
+
+    def test_schema_catalog_reloads_only_after_schema_change(self) -> None:
+        statements = []
+        catalog_query = self.service.catalog._query
+        self.service.list_tables()
+        self.service.catalog._query = lambda sql: statements.append(sql) or catalog_query(sql)
+        self.service.list_tables()
+        self.service.get_table_schema("users")
+        self.assertFalse([sql for sql in statements if "sqlite_master" in sql])
+
+        external = sqlite3.connect(self.db_path)
+        external.execute("CREATE TABLE extra (id INTEGER)")
+        external.commit()
+        external.close()
+        self.assertIn("extra", self.service.list_tables())
+        self.assertEqual(len([sql for sql in statements if "sqlite_master" in sql]), 1)
+
+    def test_schema_catalog_columns_and_indexes(self) -> None:
+        self.service.execute_query("CREATE UNIQUE INDEX idx_users_name ON users (name)")
+        columns = self.service.catalog.columns("USERS")
+        self.assertEqual([column.name for column in columns], ["id", "name", "age"])
+        self.assertEqual(columns[0].primary_key, 1)
+        indexes = self.service.catalog.indexes("users")
+        self.assertEqual([(index.name, index.unique, index.columns) for index in indexes], [
+            ("idx_users_name", True, ["name"]),
+        ])
+        self.assertIn("CREATE UNIQUE INDEX", indexes[0].sql)
+        self.assertEqual(self.service.catalog.get("adult_users").type, "view")
+
     def test_execute_query_allows_writes(self) -> None:
         result = self.service.execute_query("UPDATE users SET age = age + 1 WHERE name = 'Alice'")
         self.assertTrue(result.is_write_operation)
@@ -90,6 +236,144 @@ class DatabaseServiceTests(unittest.TestCase):
         count = self.service.execute_query("SELECT COUNT(*) FROM users")
         self.assertEqual(count.rows[0][0], 3)
 
+    def test_execute_query_reports_progress(self) -> None:
+        seen = []
+        result = self.service.execute_query(
+            "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c LIMIT 600) SELECT x FROM c",
+            limit=500,
+            progress=seen.append,
+        )
+        self.assertEqual(len(result.rows), 500)
+        self.assertTrue(result.truncated)
+        self.assertEqual(seen[-1], 500)
+        self.assertEqual(seen, sorted(seen))
+
+    def test_execute_query_stops_at_memory_budget(self) -> None:
+        sql = "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c LIMIT 100000) SELECT x, x * 0.5 FROM c"
+        self.service.result_budget_bytes = 64 * 1024
+        result = self.service.execute_query(sql)
+        self.assertTrue(result.truncated)
+        self.assertLess(len(result.rows), 100000)
+        self.assertGreaterEqual(result.size_bytes, 64 * 1024)
+        self.assertEqual(result.rows[-1], (len(result.rows), len(result.rows) * 0.5))
+
+        self.service.result_budget_bytes = 16 * 1024 * 1024
+        complete = self.service.execute_query(sql)
+        self.assertFalse(complete.truncated)
+        self.assertEqual(len(complete.rows), 100000)
+        self.assertEqual(complete.size_bytes, 100000 * 16)
+
+    def test_execute_query_spills_results_beyond_the_budget(self) -> None:
+        sql = "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c LIMIT 50000) SELECT x, 'v' || x FROM c"
+        self.service.result_budget_bytes = 64 * 1024
+        result = self.service.execute_query(sql, spill=True)
+        self.assertIsInstance(result.rows, SpilledRows)
+        self.addCleanup(result.rows.close)
+        self.assertFalse(result.truncated)
+        self.assertEqual(len(result.rows), 50000)
+        self.assertEqual(result.rows[49999], (50000, "v50000"))
+
+        descending = self.service.sort_spilled_rows(result.rows, 0, descending=True)
+        self.assertEqual(descending[0], (50000, "v50000"))
+        with self.assertRaises(QueryCancelledError):
+            self.service.sort_spilled_rows(result.rows, 1, is_cancelled=lambda: True)
+
+        small = self.service.execute_query("SELECT 1", spill=True)
+        self.assertNotIsInstance(small.rows, SpilledRows)
+
+    def test_interrupt_cancels_running_query(self) -> None:
+        timer = threading.Timer(0.1, self.service.interrupt)
+        timer.start()
+        try:
+            with self.assertRaises(QueryCancelledError):
+                self.service.execute_query(
+                    "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c) SELECT count(*) FROM c"
+                )
+        finally:
+            timer.cancel()
+
+    def test_query_cache_hits_until_data_changes(self) -> None:
+        self.service.enable_query_cache(1024 * 1024)
+        sql = "SELECT name FROM users ORDER BY id"
+        first = self.service.execute_query(sql)
+        self.assertFalse(first.from_cache)
+        second = self.service.execute_query("  SELECT name  FROM users -- same query\n ORDER BY id;")
+        self.assertTrue(second.from_cache)
+        self.assertEqual(second.rows, first.rows)
+
+        self.service.execute_query("UPDATE users SET name = 'Alicia' WHERE id = 1")
+        third = self.service.execute_query(sql)
+        self.assertFalse(third.from_cache)
+        self.assertEqual(third.rows[0][0], "Alicia")
+
+        external = sqlite3.connect(self.db_path)
+        external.execute("UPDATE users SET name = 'Al' WHERE id = 1")
+        external.commit()
+        external.close()
+        fourth = self.service.execute_query(sql)
+        self.assertFalse(fourth.from_cache)
+        self.assertEqual(fourth.rows[0][0], "Al")
+        self.assertEqual(self.service.query_cache.hits, 1)
+
+    def test_query_cache_skips_volatile_and_pragma_queries(self) -> None:
+        self.service.enable_query_cache(1024 * 1024)
+        self.service.execute_query("SELECT random()")
+        self.assertFalse(self.service.execute_query("SELECT random()").from_cache)
+        self.service.execute_query("PRAGMA table_info(users)")
+        self.assertFalse(self.service.execute_query("PRAGMA table_info(users)").from_cache)
+        self.service.execute_query("SELECT 'a  b'")
+        self.assertFalse(self.service.execute_query("SELECT 'a b'").from_cache)
+
+    def test_query_cache_respects_budget(self) -> None:
+        self.service.enable_query_cache(1)
+        self.service.execute_query("SELECT * FROM users")
+        self.assertFalse(self.service.execute_query("SELECT * FROM users").from_cache)
+        self.assertEqual(len(self.service.query_cache), 0)
+
+    def test_reads_use_pooled_connections_concurrently(self) -> None:
+        results = []
+
+        def read() -> None:
+            results.append(self.service.get_table_preview("users").rows[0][1])
+
+        threads = [threading.Thread(target=read) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, ["Alice"] * 4)
+
+        with self.service._pool.reader() as reader:
+            with self.assertRaises(sqlite3.OperationalError):
+                reader.execute("DELETE FROM users")
+
+    def test_reads_see_uncommitted_writes_in_open_transaction(self) -> None:
+        self.service.execute_query("BEGIN")
+        self.service.execute_query("INSERT INTO users (name, age) VALUES ('Eve', 22)")
+        self.assertEqual(self.service.count_rows("users"), 4)
+        preview = self.service.get_table_preview("users")
+        self.assertEqual(preview.rows[-1][1], "Eve")
+        self.service.execute_query("ROLLBACK")
+        self.assertEqual(self.service.count_rows("users"), 3)
+
+    def test_read_queries_fall_back_to_writer(self) -> None:
+        self.service.execute_query("CREATE TEMP TABLE scratch (value INTEGER)")
+        self.service.execute_query("INSERT INTO scratch VALUES (7)")
+        self.assertEqual(self.service.execute_query("SELECT value FROM scratch").rows, [(7,)])
+
+        result = self.service.execute_query(
+            "WITH names(n) AS (VALUES ('Zoe')) INSERT INTO users (name, age) SELECT n, 40 FROM names"
+        )
+        self.assertTrue(result.is_write_operation)
+        self.assertEqual(self.service.count_rows("users"), 4)
+
+    def test_iter_query_only_retries_on_the_writer_when_allowed(self) -> None:
+        self.service.execute_query("CREATE TEMP TABLE scratch (value INTEGER)")
+        with self.assertRaises(DatabaseError):
+            self.service.iter_query("SELECT value FROM scratch")
+        columns, batches = self.service.iter_query("SELECT value FROM scratch", allow_writer=True)
+        self.assertEqual((columns, list(batches)), (["value"], []))
+
     def test_classify_query(self) -> None:
         self.assertEqual(self.service.classify_query("SELECT 1"), "read")
         self.assertEqual(self.service.classify_query("WITH cte AS (SELECT 1) SELECT * FROM cte"), "read")
@@ -107,6 +391,24 @@ class DatabaseServiceTests(unittest.TestCase):
         self.assertEqual(self.service.classify_query("ROLLBACK"), "tcl")
         self.assertEqual(self.service.classify_query("-- comment\nSELECT 1"), "read")
 
+    def test_is_pragma_assignment(self) -> None:
+        self.assertTrue(self.service.is_pragma_assignment("PRAGMA user_version = 5"))
+        self.assertTrue(self.service.is_pragma_assignment("pragma main.cache_size=-2000"))
+        self.assertFalse(self.service.is_pragma_assignment("PRAGMA user_version"))
+        self.assertFalse(self.service.is_pragma_assignment("PRAGMA table_info(users)"))
+        self.assertFalse(self.service.is_pragma_assignment("SELECT 1 = 1"))
+
+    def test_modifies_data(self) -> None:
+        self.assertTrue(self.service.modifies_data("DELETE FROM users"))
+        self.assertTrue(self.service.modifies_data(
+            "WITH v(n) AS (VALUES ('dup')) INSERT INTO users (name) SELECT n FROM v RETURNING id, name"
+        ))
+        self.assertTrue(self.service.modifies_data("WITH x AS (SELECT 1) UPDATE users SET age = 1"))
+        self.assertFalse(self.service.modifies_data("SELECT replace(name, 'a', 'b') FROM users"))
+        self.assertFalse(self.service.modifies_data("SELECT 'DELETE' FROM users -- DELETE"))
+        self.assertFalse(self.service.modifies_data("WITH x AS (SELECT 1) SELECT * FROM x; DELETE FROM users"))
+        self.assertFalse(self.service.modifies_data("EXPLAIN DELETE FROM users"))
+
     def test_is_destructive_query(self) -> None:
         is_d, reason = self.service.is_destructive_query("DROP TABLE users")
         self.assertTrue(is_d)
@@ -149,6 +451,196 @@ class DatabaseServiceTests(unittest.TestCase):
         with self.assertRaises(DatabaseError):
             svc.open("/tmp/nonexistent_db_file_12345.db")
 
+    def test_open_read_only_rejects_writes(self) -> None:
+        self.service.open(self.db_path, OpenOptions(read_only=True))
+        self.assertEqual(self.service.get_table_preview("users").row_count, 3)
+        with self.assertRaises(DatabaseError):
+            self.service.execute_query("DELETE FROM users WHERE id = 1")
+        self.assertTrue(self.service.describe_settings().startswith("read-only"))
+
+    def test_open_immutable_with_tuning_pragmas(self) -> None:
+        options = OpenOptions(immutable=True, mmap_size_mib=16, cache_size_mib=8, temp_store_memory=True)
+        self.service.open(self.db_path, options)
+        self.assertEqual(len(self.service.execute_query("SELECT * FROM users").rows), 3)
+        self.assertEqual(self.service.execute_query("PRAGMA cache_size").rows[0][0], -8 * 1024)
+        self.assertEqual(self.service.execute_query("PRAGMA temp_store").rows[0][0], 2)
+        settings = self.service.describe_settings()
+        self.assertIn("immutable", settings)
+        self.assertIn("cache 8.0 MiB", settings)
+        self.assertIn("temp in memory", settings)
+
+    def test_open_query_only(self) -> None:
+        self.service.open(self.db_path, OpenOptions(query_only=True))
+        with self.assertRaises(DatabaseError):
+            self.service.execute_query("INSERT INTO users (name, age) VALUES ('Q', 1)")
+        self.assertIn("query-only", self.service.describe_settings())
+
+    def test_preview_filter_parse(self) -> None:
+        row_filter = PreviewFilter.parse('smith NAME:"van ""der"" berg" http://x age:', ["name", "age"])
+        self.assertEqual(row_filter.text, "smith http://x")
+        self.assertEqual(row_filter.columns, (("name", 'van "der" berg'),))
+        self.assertFalse(PreviewFilter.parse("  ", ["name"]).active)
+
+    def test_table_preview_filter(self) -> None:
+        result = self.service.get_table_preview("users", limit=1, row_filter=PreviewFilter("A"))
+        self.assertEqual([row[1] for row in result.rows], ["Alice"])
+        self.assertEqual(result.row_count, 2)
+        self.assertTrue(result.truncated)
+        following = self.service.get_table_preview(
+            "users", limit=1, after=result.row_keys[-1], row_filter=PreviewFilter("A")
+        )
+        self.assertEqual([row[1] for row in following.rows], ["Carol"])
+
+        by_column = PreviewFilter(columns=(("age", "2"),))
+        self.assertEqual(self.service.count_rows("users", by_column), 2)
+        self.assertEqual(self.service.count_rows("users"), 3)
+        literal = self.service.get_table_preview("users", row_filter=PreviewFilter("%"))
+        self.assertEqual(literal.rows, [])
+
+        view = self.service.get_table_preview("adult_users", row_filter=PreviewFilter(columns=(("name", "car"),)))
+        self.assertEqual([row[1] for row in view.rows], ["Carol"])
+        with self.assertRaises(DatabaseError):
+            self.service.get_table_preview("users", row_filter=PreviewFilter(columns=(("missing", "x"),)))
+
+    def _sorted_pages(self, table: str, sort: PreviewSort, backwards: bool = False) -> list:
+        if backwards:
+            page = self.service.get_table_preview(table, limit=2, last=True, sort=sort)
+            rows = list(page.rows)
+            while page.has_previous:
+                page = self.service.get_table_preview(table, limit=2, before=page.row_keys[0], sort=sort)
+                rows[:0] = page.rows
+            return rows
+        page = self.service.get_table_preview(table, limit=2, sort=sort)
+        rows = list(page.rows)
+        while page.truncated:
+            page = self.service.get_table_preview(table, limit=2, after=page.row_keys[-1], sort=sort)
+            rows += page.rows
+        return rows
+
+    def test_table_preview_sort_pages_with_ties_and_nulls(self) -> None:
+        self.service.execute_query("INSERT INTO users (name, age) VALUES ('Dave', NULL), ('Erin', 24), ('Finn', NULL)")
+        ascending = ["Dave", "Finn", "Bob", "Erin", "Carol", "Alice"]
+        for sort, expected in [
+            (PreviewSort("age"), ascending),
+            (PreviewSort("age", descending=True), ascending[::-1]),
+        ]:
+            for backwards in (False, True):
+                rows = self._sorted_pages("users", sort, backwards)
+                self.assertEqual([row[1] for row in rows], expected, (sort, backwards))
+
+        first = self.service.get_table_preview("users", limit=2, sort=PreviewSort("age"))
+        self.assertEqual(first.columns, ["id", "name", "age"])
+        self.assertEqual(first.row_keys, [(None, 4), (None, 6)])
+        filtered = self.service.get_table_preview(
+            "users", sort=PreviewSort("name", descending=True), row_filter=PreviewFilter("a")
+        )
+        self.assertEqual([row[1] for row in filtered.rows], ["Dave", "Carol", "Alice"])
+        view = self.service.get_table_preview("adult_users", sort=PreviewSort("age"))
+        self.assertEqual([row[1] for row in view.rows], ["Carol", "Alice"])
+        with self.assertRaises(DatabaseError):
+            self.service.get_table_preview("users", sort=PreviewSort("missing"))
+
+    def test_sort_needs_temp_btree_until_indexed(self) -> None:
+        self.assertTrue(self.service.sort_needs_temp_btree("users", PreviewSort("age")))
+        self.assertFalse(self.service.sort_needs_temp_btree("users", PreviewSort("id", descending=True)))
+        self.service.execute_query("CREATE INDEX users_age ON users (age)")
+        self.assertFalse(self.service.sort_needs_temp_btree("users", PreviewSort("age")))
+        self.assertFalse(self.service.sort_needs_temp_btree("users", PreviewSort("age", descending=True)))
+
+    def test_table_preview_truncates_large_values(self) -> None:
+        payload = bytes(range(256)) * 40
+        note = "x" * (PREVIEW_VALUE_LIMIT + 10)
+        wide_chars = "é" * (PREVIEW_VALUE_LIMIT - 1)
+        self.service.execute_query("CREATE TABLE files (id INTEGER PRIMARY KEY, payload BLOB, note TEXT, size INT)")
+        self.service.execute_query(
+            f"INSERT INTO files (payload, note, size) VALUES "
+            f"(x'{payload.hex()}', '{note}', 1), (x'00ff', '{wide_chars}', 2)"
+        )
+        self.service.execute_query("CREATE VIEW files_view AS SELECT * FROM files")
+
+        result = self.service.get_table_preview("files", sort=PreviewSort("size"))
+        self.assertEqual(result.columns, ["id", "payload", "note", "size"])
+        blob, text = result.rows[0][1:3]
+        self.assertEqual(blob, TruncatedValue(b"", len(payload)))
+        self.assertEqual(text, TruncatedValue("x" * PREVIEW_VALUE_LIMIT, len(note)))
+        # Over the limit in bytes, not in characters: shown in full.
+        self.assertEqual(result.rows[1][1:4], (b"\x00\xff", wide_chars, 2))
+
+        self.assertEqual(self.service.read_value("files", "payload", result.row_keys[0]), payload)
+        self.assertEqual(self.service.read_value("files", "note", result.row_keys[0]), note)
+        view = self.service.get_table_preview("files_view")
+        self.assertEqual(view.rows[0][1], TruncatedValue(b"", len(payload)))
+        with self.assertRaises(DatabaseError):
+            self.service.read_value("files_view", "payload", (1,))
+        with self.assertRaises(DatabaseError):
+            self.service.read_value("files", "missing", (1,))
+
+    def test_execute_script_reports_each_statement(self) -> None:
+        reported = []
+        script = self.service.execute_script(
+            "INSERT INTO users (name, age) VALUES ('Dan', 40);\n"
+            "UPDATE users SET age = age + 1 WHERE age > 26;\n"
+            "-- final check\n"
+            "SELECT name FROM users ORDER BY id;",
+            progress=reported.append,
+        )
+        self.assertTrue(script.transaction)
+        self.assertEqual([item.number for item in reported], [1, 2, 3])
+        self.assertEqual([item.status for item in script.statements], ["ok", "ok", "ok"])
+        self.assertEqual(script.statements[0].affected_rows, 1)
+        self.assertEqual(script.statements[1].affected_rows, 3)
+        self.assertEqual(script.affected_rows, 4)
+        self.assertEqual(script.result_sql, "SELECT name FROM users ORDER BY id")
+        self.assertEqual([row[0] for row in script.result.rows], ["Alice", "Bob", "Carol", "Dan"])
+        self.assertFalse(self.service._connection.in_transaction)
+
+    def test_execute_script_rolls_back_on_error(self) -> None:
+        reported = []
+        with self.assertRaises(DatabaseError) as context:
+            self.service.execute_script(
+                "CREATE TABLE t (x);\n"
+                "INSERT INTO users (name, age) VALUES ('Dan', 40);\n"
+                "INSERT INTO missing VALUES (1);\n"
+                "DELETE FROM users",
+                progress=reported.append,
+            )
+        self.assertIn("Statement 3 failed", str(context.exception))
+        self.assertEqual([item.status for item in reported], ["ok", "ok", "error"])
+        self.assertFalse(self.service._connection.in_transaction)
+        self.assertNotIn("t", self.service.list_tables())
+        self.assertEqual(self.service.count_rows("users"), 3)
+
+    def test_execute_script_inside_open_transaction_keeps_it(self) -> None:
+        self.service.execute_query("BEGIN")
+        self.service.execute_query("INSERT INTO users (name, age) VALUES ('Eve', 22)")
+        with self.assertRaises(DatabaseError):
+            self.service.execute_script("DELETE FROM users WHERE name = 'Eve'; SELECT * FROM missing")
+        self.assertTrue(self.service._connection.in_transaction)
+        self.assertEqual(self.service.count_rows("users"), 4)
+        self.service.execute_query("ROLLBACK")
+
+    def test_execute_script_with_own_transaction_runs_unwrapped(self) -> None:
+        script = self.service.execute_script("BEGIN; DELETE FROM users WHERE id = 1; COMMIT;")
+        self.assertFalse(script.transaction)
+        self.assertEqual(self.service.count_rows("users"), 2)
+
+        with self.assertRaises(DatabaseError) as context:
+            self.service.execute_script("BEGIN; DELETE FROM users; SELECT * FROM missing; COMMIT")
+        self.assertIn("transaction opened by the script was rolled back", str(context.exception))
+        self.assertFalse(self.service._connection.in_transaction)
+        self.assertEqual(self.service.count_rows("users"), 2)
+
+    def test_execute_script_cancelled(self) -> None:
+        reported = []
+        with self.assertRaises(QueryCancelledError):
+            self.service.execute_script(
+                "DELETE FROM users WHERE id = 1; DELETE FROM users WHERE id = 2",
+                progress=reported.append,
+                is_cancelled=lambda: len(reported) >= 1,
+            )
+        self.assertEqual([item.status for item in reported], ["ok", "cancelled"])
+        self.assertEqual(self.service.count_rows("users"), 3)
+
     def test_is_destructive_with_where_in_string_literal(self) -> None:
         sql = "DELETE FROM users WHERE name = 'WHERE'"
         is_d, _ = self.service.is_destructive_query(sql)
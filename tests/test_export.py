@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import csv
+import json
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+from sqliteviewer.database import DatabaseError, DatabaseService, QueryCancelledError
+from sqliteviewer.export import export_query, format_for_path
+
+
+class ExportTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.tmpdir.name) / "sample.db"
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, label TEXT, payload BLOB)")
+        conn.executemany(
+            "INSERT INTO items (label, payload) VALUES (?, ?)",
+            [(f"item-{index}", bytes([index % 256])) for index in range(2500)],
+        )
+        conn.commit()
+        conn.close()
+        self.service = DatabaseService()
+        self.service.open(self.db_path)
+
+    def tearDown(self) -> None:
+        self.service.close()
+        self.tmpdir.cleanup()
+
+    def test_csv_export_streams_all_rows(self) -> None:
+        target = Path(self.tmpdir.name) / "out.csv"
+        seen = []
+        stats = export_query(
+            self.service,
+            "SELECT id, label FROM items ORDER BY id",
+            target,
+            "csv",
+            batch_size=1000,
+            progress=lambda progress: seen.append(progress.rows_written),
+        )
+        self.assertEqual(stats.rows_written, 2500)
+        self.assertEqual(seen, [1000, 2000, 2500])
+
+        with open(target, newline="", encoding="utf-8") as handle:
+            rows = list(csv.reader(handle))
+        self.assertEqual(rows[0], ["id", "label"])
+        self.assertEqual(len(rows), 2501)
+        self.assertEqual(rows[-1], ["2500", "item-2499"])
+
+    def test_tsv_and_jsonl_exports(self) -> None:
+        tsv_target = Path(self.tmpdir.name) / "out.tsv"
+        export_query(self.service, "SELECT id, label FROM items WHERE id <= 2", tsv_target, "tsv")
+        self.assertEqual(tsv_target.read_text(encoding="utf-8").splitlines()[1], "1\titem-0")
+
+        jsonl_target = Path(self.tmpdir.name) / "out.jsonl"
+        export_query(self.service, "SELECT * FROM items WHERE id = 2", jsonl_target, "jsonl")
+        record = json.loads(jsonl_target.read_text(encoding="utf-8"))
+        self.assertEqual(record, {"id": 2, "label": "item-1", "payload": "AQ=="})
+
+    def test_cancelled_export_removes_partial_file(self) -> None:
+        target = Path(self.tmpdir.name) / "out.csv"
+        with self.assertRaises(QueryCancelledError):
+            export_query(self.service, "SELECT * FROM items", target, batch_size=100, is_cancelled=lambda: True)
+        self.assertFalse(target.exists())
+
+    def test_cancel_interrupts_query_before_first_row(self) -> None:
+        target = Path(self.tmpdir.name) / "out.csv"
+        slow = (
+            "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 100000000) "
+            "SELECT i FROM n ORDER BY i DESC"
+        )
+        calls = []
+        with self.assertRaises(QueryCancelledError):
+            export_query(self.service, slow, target, is_cancelled=lambda: calls.append(1) or len(calls) > 3)
+        self.assertFalse(target.exists())
+        # The reader is usable again afterwards.
+        export_query(self.service, "SELECT id FROM items", target)
+
+    def test_write_queries_are_not_exported(self) -> None:
+        target = Path(self.tmpdir.name) / "out.csv"
+        with self.assertRaises(DatabaseError):
+            export_query(self.service, "DELETE FROM items", target)
+        self.assertEqual(self.service.count_rows("items"), 2500)
+
+    def test_writing_cte_is_not_run_again(self) -> None:
+        sql = "WITH v(n) AS (VALUES ('dup')) INSERT INTO items (label) SELECT n FROM v RETURNING id, label"
+        self.assertEqual(len(self.service.execute_query(sql).rows), 1)
+        with self.assertRaises(DatabaseError):
+            export_query(self.service, sql, Path(self.tmpdir.name) / "out.csv")
+        self.assertEqual(self.service.count_rows("items"), 2501)
+
+    def test_format_for_path(self) -> None:
+        self.assertEqual(format_for_path("a.TSV"), "tsv")
+        self.assertEqual(format_for_path("a.ndjson"), "jsonl")
+        self.assertEqual(format_for_path("a.txt", "jsonl"), "jsonl")
+
+
+if __name__ == "__main__":
+    unittest.main()
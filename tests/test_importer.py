@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+from sqliteviewer.database import DatabaseError, DatabaseService, QueryCancelledError
+from sqliteviewer.importer import import_file, infer_column_types
+
+
+class ImporterTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmpdir.name)
+        self.db_path = self.root / "sample.db"
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("CREATE TABLE people (id INTEGER PRIMARY KEY, name TEXT, age INTEGER)")
+        conn.execute("CREATE INDEX idx_people_age ON people (age)")
+        conn.commit()
+        conn.close()
+        self.service = DatabaseService()
+        self.service.open(self.db_path)
+
+    def tearDown(self) -> None:
+        self.service.close()
+        self.tmpdir.cleanup()
+
+    def _write(self, name: str, content: str) -> Path:
+        path = self.root / name
+        path.write_text(content, encoding="utf-8")
+        return path
+
+    def test_csv_import_creates_table_with_inferred_types(self) -> None:
+        lines = ["code,price,label,empty"] + [f"{index},{index}.5,item {index}," for index in range(25)]
+        source = self._write("items.csv", "\n".join(lines) + "\n")
+
+        seen = []
+        stats = import_file(
+            self.service, source, "items", batch_size=10, progress=lambda p: seen.append(p.rows_imported)
+        )
+        self.assertEqual(stats.rows_imported, 25)
+        self.assertEqual(seen, [10, 20, 25])
+
+        info = self.service.execute_query("PRAGMA table_info(items)")
+        self.assertEqual([(row[1], row[2]) for row in info.rows], [
+            ("code", "INTEGER"), ("price", "REAL"), ("label", "TEXT"), ("empty", "TEXT"),
+        ])
+        row = self.service.execute_query("SELECT code, price, label, empty FROM items WHERE code = 3").rows[0]
+        self.assertEqual(row, (3, 3.5, "item 3", None))
+
+    def test_jsonl_import_maps_existing_columns(self) -> None:
+        records = [{"name": "Ann", "age": 31, "extra": {"a": 1}}, {"NAME": "ignored", "name": "Ben"}]
+        source = self._write("people.jsonl", "\n".join(json.dumps(record) for record in records))
+
+        stats = import_file(self.service, source, "people")
+        self.assertEqual(stats.rows_imported, 2)
+        rows = self.service.execute_query("SELECT name, age FROM people ORDER BY id").rows
+        self.assertEqual(rows, [("Ann", 31), ("Ben", None)])
+
+        indexes = self.service.execute_query("PRAGMA index_list(people)").rows
+        self.assertIn("idx_people_age", [row[1] for row in indexes])
+
+    def test_fast_import_restores_pragmas(self) -> None:
+        source = self._write("people.csv", "name,age\nAnn,31\n")
+        before = self.service.execute_query("PRAGMA synchronous").rows[0][0]
+        import_file(self.service, source, "people", fast=True)
+        self.assertEqual(self.service.execute_query("PRAGMA synchronous").rows[0][0], before)
+        self.assertEqual(self.service.execute_query("PRAGMA journal_mode").rows[0][0], "delete")
+
+    def test_cancelled_import_rolls_back(self) -> None:
+        source = self._write("people.csv", "name,age\n" + "x,1\n" * 50)
+        calls = iter([False, False, True])
+        with self.assertRaises(QueryCancelledError):
+            import_file(self.service, source, "people", batch_size=10, is_cancelled=lambda: next(calls))
+        self.assertEqual(self.service.count_rows("people"), 0)
+        self.assertIn("idx_people_age", [row[1] for row in self.service.execute_query("PRAGMA index_list(people)").rows])
+
+    def test_unmatched_columns_raise(self) -> None:
+        source = self._write("other.csv", "foo,bar\n1,2\n")
+        with self.assertRaises(DatabaseError):
+            import_file(self.service, source, "people")
+
+    def test_infer_column_types(self) -> None:
+        types = infer_column_types(["a", "b", "c"], [("1", "1e3", "1_000"), (None, "-2", "x")])
+        self.assertEqual(types, ["INTEGER", "REAL", "TEXT"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+from sqliteviewer.database import DatabaseError, DatabaseService
+from sqliteviewer.instrumentation import PerformanceLog, QueryStats
+
+
+class QueryInstrumentationTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.tmpdir.name) / "sample.db"
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("CREATE TABLE numbers (n INTEGER)")
+        conn.execute(
+            "INSERT INTO numbers WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < 5000) "
+            "SELECT x FROM c"
+        )
+        conn.commit()
+        conn.close()
+        self.service = DatabaseService()
+        self.service.open(self.db_path)
+        self.log = PerformanceLog(Path(self.tmpdir.name) / "logs" / "performance.jsonl")
+        self.service.performance_log = self.log
+
+    def tearDown(self) -> None:
+        self.service.close()
+        self.tmpdir.cleanup()
+
+    def test_execute_query_attaches_stats(self) -> None:
+        result = self.service.execute_query("SELECT n FROM numbers ORDER BY n DESC")
+        stats = result.stats
+        self.assertIsNotNone(stats)
+        self.assertEqual(stats.rows, len(result.rows))
+        self.assertEqual(stats.status, "ok")
+        self.assertGreater(stats.vm_steps, 0)
+        self.assertGreaterEqual(stats.total_ms, stats.execute_ms)
+        self.assertEqual(stats.trace, [])
+        self.assertEqual(stats.prepare_ms, 0)
+        self.assertIs(self.service.query_stats[-1], stats)
+        self.assertEqual([entry.sql for entry in self.log.entries()], [stats.sql])
+
+    def test_write_stats_count_affected_rows(self) -> None:
+        result = self.service.execute_query("UPDATE numbers SET n = n + 1 WHERE n <= 10")
+        self.assertEqual(result.stats.rows, 10)
+
+    def test_trace_statements_records_statement_text(self) -> None:
+        self.service.trace_statements = True
+        result = self.service.execute_query("SELECT count(*) FROM numbers")
+        self.assertEqual(result.stats.trace, ["SELECT count(*) FROM numbers"])
+
+    def test_failed_query_is_recorded(self) -> None:
+        with self.assertRaises(DatabaseError):
+            self.service.execute_query("SELECT * FROM missing")
+        stats = self.service.query_stats[-1]
+        self.assertEqual(stats.status, "error")
+        self.assertIn("missing", stats.error)
+        self.assertEqual(next(self.log.entries()).status, "error")
+
+    def test_cache_hit_is_recorded(self) -> None:
+        self.service.enable_query_cache(1024 * 1024)
+        self.service.execute_query("SELECT n FROM numbers WHERE n < 5")
+        cached = self.service.execute_query("SELECT n FROM numbers WHERE n < 5")
+        self.assertTrue(cached.from_cache)
+        self.assertTrue(cached.stats.from_cache)
+        self.assertEqual(cached.stats.rows, 4)
+        self.assertEqual(len(self.service.query_stats), 2)
+
+
+class PerformanceLogTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmpdir.name) / "performance.jsonl"
+
+    def tearDown(self) -> None:
+        self.tmpdir.cleanup()
+
+    def test_round_trip_and_slowest(self) -> None:
+        log = PerformanceLog(self.path)
+        for index, duration in enumerate((5.0, 50.0, 0.5)):
+            log.append(QueryStats(sql=f"SELECT {index}", execute_ms=duration, rows=index))
+        with open(self.path, "a", encoding="utf-8") as handle:
+            handle.write("not json\n")
+        entries = list(log.entries())
+        self.assertEqual([entry.sql for entry in entries], ["SELECT 0", "SELECT 1", "SELECT 2"])
+        self.assertEqual([entry.sql for entry in log.slowest(2)], ["SELECT 1", "SELECT 0"])
+
+    def test_rotates_when_full(self) -> None:
+        line_length = len(QueryStats(sql="SELECT 1", started_at=1.0).to_json()) + 1
+        log = PerformanceLog(self.path, max_bytes=line_length * 2)
+        for _ in range(3):
+            log.append(QueryStats(sql="SELECT 1", started_at=1.0))
+        self.assertTrue(self.path.with_name("performance.jsonl.1").exists())
+        self.assertEqual(len(list(log.entries())), 3)
+        self.assertLessEqual(self.path.stat().st_size, line_length * 2)
+
+    def test_rotation_counts_encoded_bytes(self) -> None:
+        stats = QueryStats(sql="SELECT '" + "\u00e9" * 100 + "'", started_at=1.0)
+        line_bytes = len(stats.to_json().encode("utf-8")) + 1
+        log = PerformanceLog(self.path, max_bytes=line_bytes * 2 - 50)
+        for _ in range(2):
+            log.append(stats)
+        self.assertTrue(self.path.with_name("performance.jsonl.1").exists())
+        self.assertLessEqual(self.path.stat().st_size, log.max_bytes)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+from sqliteviewer.database import DatabaseError, DatabaseService
+from sqliteviewer.query_plan import (
+    AUTOMATIC_INDEX,
+    INDEX_SCAN,
+    SCAN,
+    SEARCH,
+    TEMP_BTREE,
+    build_plan,
+    parse_detail,
+    table_aliases,
+)
+
+
+class PlanParsingTests(unittest.TestCase):
+    def test_parse_detail_formats(self) -> None:
+        self.assertEqual(parse_detail("SCAN o"), ("SCAN", "o", None))
+        self.assertEqual(parse_detail("SCAN TABLE users AS u"), ("SCAN", "u", None))
+        self.assertEqual(
+            parse_detail("SEARCH users USING COVERING INDEX idx_age (age=?)"), ("SEARCH", "users", "idx_age")
+        )
+        self.assertEqual(parse_detail('SEARCH "my t" USING INDEX "my idx" (a>?)'), ("SEARCH", "my t", "my idx"))
+        self.assertEqual(parse_detail("SEARCH r2 USING AUTOMATIC COVERING INDEX (age=?)"), ("SEARCH", "r2", None))
+        self.assertEqual(parse_detail("USE TEMP B-TREE FOR ORDER BY"), (None, None, None))
+
+    def test_build_plan_nests_children_and_classifies(self) -> None:
+        roots = build_plan(
+            [
+                (3, 0, 0, "MATERIALIZE r"),
+                (6, 3, 0, "SCAN users"),
+                (20, 0, 0, "SCAN users USING COVERING INDEX idx_age"),
+                (34, 0, 0, "SEARCH r2 USING AUTOMATIC COVERING INDEX (age=?)"),
+                (40, 0, 0, "USE TEMP B-TREE FOR GROUP BY"),
+            ]
+        )
+        self.assertEqual([root.id for root in roots], [3, 20, 34, 40])
+        self.assertEqual([child.detail for child in roots[0].children], ["SCAN users"])
+        self.assertEqual(
+            [node.kind for root in roots for node in root.walk()],
+            ["other", SCAN, INDEX_SCAN, AUTOMATIC_INDEX, TEMP_BTREE],
+        )
+
+    def test_table_aliases(self) -> None:
+        aliases = table_aliases(
+            "SELECT o.total, u.name FROM orders AS o, main.users u -- FROM comments c\n"
+            "LEFT JOIN [line items] li ON li.order_id = o.id WHERE u.name <> 'from x y'"
+        )
+        self.assertEqual(aliases["o"], "orders")
+        self.assertEqual(aliases["u"], "users")
+        self.assertEqual(aliases["li"], "line items")
+        self.assertNotIn("c", aliases)
+        self.assertNotIn("y", aliases)
+
+
+class ExplainQueryPlanTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        path = Path(self.tmpdir.name) / "plan.db"
+        conn = sqlite3.connect(path)
+        conn.executescript(
+            """
+            CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT, age INTEGER);
+            CREATE INDEX idx_users_age ON users (age);
+            CREATE TABLE orders (id INTEGER PRIMARY KEY, user_id INTEGER, total REAL);
+            """
+        )
+        conn.close()
+        self.service = DatabaseService()
+        self.service.open(path)
+
+    def tearDown(self) -> None:
+        self.service.close()
+        self.tmpdir.cleanup()
+
+    def test_flags_scans_and_temp_btrees_and_lists_indexes(self) -> None:
+        roots = self.service.explain_query_plan(
+            "SELECT * FROM users u JOIN orders o ON o.user_id = u.id ORDER BY o.total"
+        )
+        nodes = [node for root in roots for node in root.walk()]
+        by_table = {node.table: node for node in nodes if node.table}
+        self.assertEqual(by_table["orders"].kind, SCAN)
+        self.assertIsNotNone(by_table["orders"].warning)
+        self.assertEqual(by_table["users"].kind, SEARCH)
+        self.assertIsNone(by_table["users"].warning)
+        self.assertEqual([index.name for index in by_table["users"].indexes], ["idx_users_age"])
+        self.assertTrue(any(node.kind == TEMP_BTREE and node.warning for node in nodes))
+
+    def test_reports_index_used_and_ignores_explain_prefix(self) -> None:
+        roots = self.service.explain_query_plan("EXPLAIN QUERY PLAN SELECT age FROM users WHERE age = 3")
+        self.assertEqual(roots[0].index, "idx_users_age")
+        self.assertEqual(roots[0].table, "users")
+
+    def test_temp_tables_use_the_writer(self) -> None:
+        self.service.execute_query("CREATE TEMP TABLE scratch (value INTEGER)")
+        roots = self.service.explain_query_plan("SELECT * FROM scratch")
+        self.assertEqual(roots[0].kind, SCAN)
+
+    def test_invalid_sql_raises(self) -> None:
+        with self.assertRaises(DatabaseError):
+            self.service.explain_query_plan("SELECT * FROM missing")
+        with self.assertRaises(DatabaseError):
+            self.service.explain_query_plan("EXPLAIN QUERY PLAN")
+
+
+if __name__ == "__main__":
+    unittest.main()
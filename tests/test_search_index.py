@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+from sqliteviewer.database import DatabaseService, PreviewFilter, QueryCancelledError
+from sqliteviewer.search_index import MISSING, READY, STALE, SearchIndex
+
+
+@unittest.skipUnless(SearchIndex.available(), "SQLite lacks FTS5 trigram support")
+class SearchIndexTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.tmpdir.name) / "notes.db"
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("CREATE TABLE notes (id INTEGER PRIMARY KEY, title TEXT, body TEXT)")
+        conn.executemany(
+            "INSERT INTO notes (title, body) VALUES (?, ?)",
+            [(f"note {n}", "the quick brown fox" if n % 10 == 0 else "lorem ipsum") for n in range(1, 501)],
+        )
+        conn.execute("CREATE TABLE pairs (a TEXT, b TEXT, PRIMARY KEY (a, b)) WITHOUT ROWID")
+        conn.commit()
+        conn.close()
+        self.service = DatabaseService()
+        self.service.open(self.db_path)
+        self.index = SearchIndex(self.service, Path(self.tmpdir.name) / "search")
+        self.service.search_index = self.index
+
+    def tearDown(self) -> None:
+        self.service.close()
+        self.tmpdir.cleanup()
+
+    def test_build_and_page_through_matches(self) -> None:
+        self.assertEqual(self.index.state("notes"), MISSING)
+        self.assertEqual(self.index.build("notes"), 500)
+        self.assertEqual(self.index.state("notes"), READY)
+
+        row_filter = PreviewFilter("Quick Brown")
+        self.assertIsNotNone(self.index.match_query("notes", row_filter))
+        first = self.service.get_table_preview("notes", limit=20, row_filter=row_filter)
+        self.assertEqual(first.row_count, 50)
+        self.assertEqual([row[0] for row in first.rows][:3], [10, 20, 30])
+        self.assertTrue(first.truncated)
+
+        second = self.service.get_table_preview("notes", limit=20, after=first.row_keys[-1], row_filter=row_filter)
+        self.assertEqual(second.rows[0][0], 210)
+        self.assertTrue(second.has_previous)
+        last = self.service.get_table_preview("notes", limit=20, last=True, row_filter=row_filter)
+        self.assertEqual([row[0] for row in last.rows][-1], 500)
+        self.assertEqual(len(last.rows), 20)
+
+    def test_column_filter_and_short_terms(self) -> None:
+        self.index.build("notes")
+        row_filter = PreviewFilter(columns=(("title", "note 5"),))
+        match = self.index.match_query("notes", row_filter)
+        self.assertEqual(match, 'c1 : "note 5"')
+        self.assertEqual(self.service.count_rows("notes", row_filter), 12)
+        # Too short for trigrams: answered by LIKE instead, with the same result.
+        self.assertIsNone(self.index.match_query("notes", PreviewFilter("ox")))
+        self.assertEqual(self.service.count_rows("notes", PreviewFilter("ox")), 50)
+
+    def test_lookups_share_one_sidecar_connection(self) -> None:
+        self.index.build("notes")
+        connects = []
+        connect = self.index._connect
+        self.index._connect = lambda: connects.append(1) or connect()
+        match = self.index.match_query("notes", PreviewFilter("quick"))
+        for _ in range(3):
+            self.index.keys("notes", match, limit=5)
+            self.index.count("notes", match)
+        self.assertEqual(len(connects), 1)
+        self.service.close()
+        self.assertIsNone(self.index._reader)
+
+    def test_index_goes_stale_after_a_write(self) -> None:
+        self.index.build("notes")
+        self.service.execute_query("DELETE FROM notes WHERE id = 10")
+        # Make sure the file times differ even on coarse-grained filesystems.
+        stat = os.stat(self.db_path)
+        os.utime(self.db_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        self.assertEqual(self.index.state("notes"), STALE)
+        self.assertIsNone(self.index.match_query("notes", PreviewFilter("quick")))
+        self.assertEqual(self.service.count_rows("notes", PreviewFilter("quick")), 49)
+
+        self.index.build("notes")
+        self.assertEqual(self.index.state("notes"), READY)
+
+    def test_index_is_reused_across_sessions(self) -> None:
+        self.index.build("notes")
+        self.service.close()
+        self.service.open(self.db_path)
+        self.assertEqual(SearchIndex(self.service, self.index.directory).state("notes"), READY)
+
+    def test_unsupported_table_and_cancel(self) -> None:
+        self.assertFalse(self.index.supports("pairs"))
+        with self.assertRaises(QueryCancelledError):
+            self.index.build("notes", is_cancelled=lambda: True)
+        self.assertEqual(self.index.state("notes"), MISSING)
+
+    def test_drop(self) -> None:
+        self.index.build("notes")
+        self.index.drop("notes")
+        self.assertEqual(self.index.state("notes"), MISSING)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import gc
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from sqliteviewer.spilled_rows import BLOCK_ROWS, SpilledRows
+
+
+class SpilledRowsTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def _rows(self, count: int) -> SpilledRows:
+        rows = SpilledRows(3, self.directory.name)
+        self.addCleanup(rows.close)
+        rows.extend([(index, f"name-{index % 7}", None if index % 5 == 0 else index / 4) for index in range(count)])
+        return rows
+
+    def test_rows_are_read_back_by_position(self) -> None:
+        count = BLOCK_ROWS * 3 + 17
+        rows = self._rows(count)
+        self.assertEqual(len(rows), count)
+        self.assertEqual(rows[0], (0, "name-0", None))
+        self.assertEqual(rows[-1], (count - 1, f"name-{(count - 1) % 7}", (count - 1) / 4))
+        self.assertEqual(rows.value(BLOCK_ROWS + 1, 0), BLOCK_ROWS + 1)
+        self.assertEqual([row[0] for row in rows], list(range(count)))
+        around = range(BLOCK_ROWS - 2, BLOCK_ROWS + 2)
+        self.assertEqual(rows[around.start:around.stop], [rows[index] for index in around])
+        with self.assertRaises(IndexError):
+            rows[count]
+
+        # A block read while it was incomplete is re-read after more rows arrive.
+        rows.extend([(count, "late", 1.0)])
+        self.assertEqual(rows[count], (count, "late", 1.0))
+
+    def test_sorted_views_share_the_file(self) -> None:
+        rows = self._rows(1000)
+        by_value = rows.sorted(2)
+        self.assertEqual(len(by_value), 1000)
+        values = [row[2] for row in by_value]
+        self.assertEqual(values[:200], [None] * 200)
+        self.assertEqual(values[200:], sorted(values[200:]))
+        descending = rows.sorted(1, descending=True)
+        self.assertEqual(descending[0], (6, "name-6", 1.5))
+        self.assertEqual(rows[1], (1, "name-1", 0.25))
+        with self.assertRaises(TypeError):
+            by_value.extend([(1, "x", 1.0)])
+
+    def test_sort_can_be_cancelled(self) -> None:
+        rows = self._rows(5000)
+        with self.assertRaises(sqlite3.OperationalError):
+            rows.sorted(1, is_cancelled=lambda: True)
+        self.assertEqual(rows.sorted(0)[0][0], 0)
+
+    def test_file_is_removed_when_closed_or_collected(self) -> None:
+        rows = SpilledRows(1, self.directory.name)
+        rows.extend([(1,)])
+        path = rows.path
+        self.assertTrue(os.path.exists(path))
+        rows.close()
+        self.assertFalse(os.path.exists(path))
+
+        rows = SpilledRows(1, self.directory.name)
+        path = rows.path
+        del rows
+        gc.collect()
+        self.assertFalse(os.path.exists(path))
+
+
+if __name__ == "__main__":
+    unittest.main()
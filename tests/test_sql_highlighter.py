@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import os
+import unittest
+from unittest import mock
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtGui import QFont  # noqa: E402
+from PyQt6.QtWidgets import QApplication, QPlainTextEdit  # noqa: E402
+
+from sqliteviewer import sql_highlighter  # noqa: E402
+from sqliteviewer.sql_highlighter import IN_COMMENT, IN_STRING, NORMAL, PENDING, SqlHighlighter  # noqa: E402
+
+
+class SqlHighlighterTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self) -> None:
+        self.editor = QPlainTextEdit()
+        self.document = self.editor.document()
+        self.highlighter = SqlHighlighter(self.document)
+
+    def _bold_words(self, number: int) -> list:
+        block = self.document.findBlockByNumber(number)
+        text = block.text()
+        return [
+            text[fmt.start : fmt.start + fmt.length]
+            for fmt in block.layout().formats()
+            if fmt.format.fontWeight() == QFont.Weight.Bold
+        ]
+
+    def test_keywords_inside_strings_and_comments_are_not_highlighted(self) -> None:
+        self.document.setPlainText("SELECT 'from x' AS a1, \"order\" FROM t -- where")
+        self.assertEqual(self._bold_words(0), ["SELECT", "AS", "FROM"])
+
+    def test_block_comments_and_strings_span_lines(self) -> None:
+        self.document.setPlainText("SELECT /* from\nwhere */ 1 FROM t WHERE a = 'x\nselect' AND b")
+        states = [self.document.findBlockByNumber(number).userState() for number in range(3)]
+        self.assertEqual(states, [IN_COMMENT, IN_STRING, NORMAL])
+        self.assertEqual(self._bold_words(1), ["FROM", "WHERE"])
+        self.assertEqual(self._bold_words(2), ["AND"])
+
+    def test_edits_update_following_blocks_state(self) -> None:
+        self.document.setPlainText("SELECT 1\nFROM t\nWHERE a")
+        cursor = self.document.find("SELECT")
+        cursor.clearSelection()
+        cursor.insertText("/* ")
+        self.assertEqual(self._bold_words(2), [])
+        self.assertEqual(self.document.lastBlock().userState(), IN_COMMENT)
+
+    def test_large_documents_are_deferred_to_idle_time(self) -> None:
+        with mock.patch.object(sql_highlighter, "HIGHLIGHT_BUDGET_MS", 0):
+            self.document.setPlainText("SELECT 1 FROM t;\n" * 50)
+        self.assertTrue(self.highlighter.has_pending)
+        self.assertEqual(self.document.lastBlock().userState(), PENDING)
+
+        self.highlighter.highlight_pending()
+        self.assertFalse(self.highlighter.has_pending)
+        self.assertEqual(self.document.lastBlock().previous().userState(), NORMAL)
+        self.assertEqual(self._bold_words(49), ["SELECT", "FROM"])
+
+
+if __name__ == "__main__":
+    unittest.main()
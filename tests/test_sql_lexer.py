@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import unittest
+
+from sqliteviewer import sql_lexer
+from sqliteviewer.sql_lexer import (
+    BLOB,
+    NUMBER,
+    OPERATOR,
+    PARAMETER,
+    QUOTED,
+    STRING,
+    WORD,
+    first_keyword,
+    split_statements,
+    strip_noise,
+    tokenize,
+    top_level_keywords,
+)
+
+
+class SqlLexerTests(unittest.TestCase):
+    def test_tokenize_kinds(self) -> None:
+        sql = "SELECT \"a\"\"b\", x'0F', 'it''s', 1.5e3, :name, ? -- trailing\nFROM t /* note */ WHERE a >= 2"
+        tokens = [(token.kind, token.text) for token in tokenize(sql)]
+        self.assertEqual(
+            tokens,
+            [
+                (WORD, "SELECT"),
+                (QUOTED, '"a""b"'),
+                (OPERATOR, ","),
+                (BLOB, "x'0F'"),
+                (OPERATOR, ","),
+                (STRING, "'it''s'"),
+                (OPERATOR, ","),
+                (NUMBER, "1.5e3"),
+                (OPERATOR, ","),
+                (PARAMETER, ":name"),
+                (OPERATOR, ","),
+                (PARAMETER, "?"),
+                (WORD, "FROM"),
+                (WORD, "t"),
+                (WORD, "WHERE"),
+                (WORD, "a"),
+                (OPERATOR, ">="),
+                (NUMBER, "2"),
+            ],
+        )
+
+    def test_tokenize_unterminated_input(self) -> None:
+        tokens = list(tokenize("SELECT 'open /* not a comment"))
+        self.assertEqual([token.kind for token in tokens], [WORD, STRING])
+        self.assertEqual(tokens[1].start, 7)
+        self.assertEqual([token.text for token in tokenize("SELECT 1 /* open")], ["SELECT", "1"])
+
+    def test_first_keyword(self) -> None:
+        self.assertEqual(first_keyword("  -- note\n/* x */ ((select 1))"), "SELECT")
+        self.assertEqual(first_keyword("with cte AS (SELECT 1) SELECT * FROM cte"), "WITH")
+        self.assertIsNone(first_keyword("'SELECT'"))
+        self.assertIsNone(first_keyword("-- only a comment"))
+        self.assertIsNone(first_keyword(""))
+
+    def test_top_level_keywords_stop_at_first_statement(self) -> None:
+        self.assertNotIn("WHERE", top_level_keywords("DELETE FROM t; DELETE FROM t WHERE id = 1"))
+        self.assertNotIn("WHERE", top_level_keywords("DELETE FROM t RETURNING (SELECT 1 FROM u WHERE u.id = 1)"))
+        self.assertNotIn("WHERE", top_level_keywords("DELETE FROM t -- WHERE\n"))
+        self.assertIn("WHERE", top_level_keywords("DELETE FROM t WHERE 'a;b' = ';'"))
+
+    def test_large_sql_is_not_cached(self) -> None:
+        script = "DELETE FROM t WHERE id IN (" + ", ".join(map(str, range(20000))) + ")"
+        caches = (sql_lexer._cached_first_keyword, sql_lexer._cached_top_level_keywords)
+        before = [cache.cache_info().misses for cache in caches]
+        self.assertEqual(first_keyword(script), "DELETE")
+        self.assertIn("WHERE", top_level_keywords(script))
+        self.assertEqual([cache.cache_info().misses for cache in caches], before)
+
+    def test_strip_noise(self) -> None:
+        stripped = strip_noise("SELECT 'WHERE' -- WHERE\nFROM \"WHERE\" /* WHERE */ x")
+        self.assertNotIn("WHERE", stripped)
+        self.assertEqual(stripped.split(), ["SELECT", "FROM", "x"])
+
+    def test_split_statements(self) -> None:
+        script = (
+            "-- seed\nINSERT INTO t VALUES ('a;b');;\n"
+            "CREATE TRIGGER tr AFTER INSERT ON t BEGIN\n"
+            "  UPDATE t SET x = CASE WHEN 1 THEN 2 END;\n"
+            "  DELETE FROM u;\n"
+            "END;\n"
+            "SELECT 1 /* ; */ -- trailing ;\n"
+        )
+        self.assertEqual(
+            split_statements(script),
+            [
+                "INSERT INTO t VALUES ('a;b')",
+                "CREATE TRIGGER tr AFTER INSERT ON t BEGIN\n"
+                "  UPDATE t SET x = CASE WHEN 1 THEN 2 END;\n"
+                "  DELETE FROM u;\n"
+                "END",
+                "SELECT 1",
+            ],
+        )
+        self.assertEqual(split_statements("BEGIN; COMMIT"), ["BEGIN", "COMMIT"])
+        self.assertEqual(split_statements(" -- nothing\n;"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import unittest
+
+from sqliteviewer.startup import StartupProfile
+
+
+class StartupProfileTests(unittest.TestCase):
+    def test_steps_measure_time_between_marks(self) -> None:
+        ticks = iter([10.0, 10.25, 10.5, 11.0])
+        profile = StartupProfile(clock=lambda: next(ticks))
+        profile.mark("import")
+        profile.mark("window")
+        profile.mark("paint")
+
+        self.assertEqual(profile.steps(), [("import", 0.25), ("window", 0.25), ("paint", 0.5)])
+        self.assertEqual(profile.elapsed, 1.0)
+
+    def test_report_flags_regressions(self) -> None:
+        ticks = iter([0.0, 0.2])
+        profile = StartupProfile(clock=lambda: next(ticks))
+        profile.mark("window")
+
+        self.assertIn("200.0 ms (target 500 ms, OK)", profile.report(target=0.5))
+        self.assertIn("over target", profile.report(target=0.1))
+
+
+if __name__ == "__main__":
+    unittest.main()
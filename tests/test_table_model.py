@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import unittest
+
+from PyQt6.QtCore import Qt
+
+from sqliteviewer.database import QueryResult, TruncatedValue
+from sqliteviewer.table_model import QueryResultModel, format_cell, format_size
+
+
+class QueryResultModelTests(unittest.TestCase):
+    def _make_result(self, row_count: int) -> QueryResult:
+        rows = [(index, f"name-{index}", None) for index in range(row_count)]
+        return QueryResult(columns=["id", "name", "note"], rows=rows)
+
+    def test_rows_are_fetched_in_batches(self) -> None:
+        model = QueryResultModel(self._make_result(10), batch_size=4)
+        self.assertEqual(model.rowCount(), 4)
+        self.assertTrue(model.canFetchMore())
+
+        model.fetchMore()
+        model.fetchMore()
+        self.assertEqual(model.rowCount(), 10)
+        self.assertFalse(model.canFetchMore())
+
+    def test_cells_are_formatted_on_demand(self) -> None:
+        model = QueryResultModel(self._make_result(2))
+        self.assertEqual(model.columnCount(), 3)
+        self.assertEqual(model.data(model.index(1, 1)), "name-1")
+        self.assertEqual(model.data(model.index(0, 2)), "NULL")
+
+    def test_truncated_values_show_their_size(self) -> None:
+        self.assertEqual(format_cell(TruncatedValue(b"", 3 * 1024 * 1024)), "BLOB (3.0 MiB)")
+        self.assertEqual(format_cell(TruncatedValue("abc", 2048)), "abc… (2.0 KiB)")
+        self.assertEqual(format_size(512), "512 B")
+        self.assertEqual(format_size(5 * 1024 ** 3), "5.0 GiB")
+
+    def test_header_uses_column_names(self) -> None:
+        model = QueryResultModel(self._make_result(1))
+        self.assertEqual(model.headerData(0, Qt.Orientation.Horizontal), "id")
+        self.assertEqual(model.headerData(2, Qt.Orientation.Horizontal), "note")
+
+
+if __name__ == "__main__":
+    unittest.main()